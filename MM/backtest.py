@@ -0,0 +1,47 @@
+"""
+This script replays recorded fair prices and trades through the order chain and the reconciler
+defined by cfg, against a simulated venue, and reports the PnL, inventory, fills, transactions
+and fees of the strategy. Nothing is sent to any platform.
+
+    python backtest.py --cfg cfg/example_cfg.toml --data prices.csv --base 1000 --quote 100
+
+See `backtesting.load_recording` for the format of the recording.
+"""
+
+import logging
+from argparse import ArgumentParser
+from decimal import Decimal
+
+from backtesting import BacktestEngine, load_recording
+from cfg import load_config
+from monitoring import tracing
+from state.account_state import PositionInfo
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Backtests a marketmaking strategy defined by cfg")
+    parser.add_argument("--cfg", type=str, required=True, help="Path to TOML config")
+    parser.add_argument("--data", type=str, required=True, help="Path to CSV or Parquet recording")
+    parser.add_argument("--base", type=Decimal, default=Decimal(0), help="Initial base balance")
+    parser.add_argument("--quote", type=Decimal, default=Decimal(0), help="Initial quote balance")
+    parser.add_argument("--maker-fee", type=Decimal, default=Decimal(0), help="Relative fee of fills")
+    parser.add_argument("--tx-fee", type=Decimal, default=Decimal(0), help="Fee of a transaction in quote")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    tracing.set_enabled(False)
+
+    position = PositionInfo.empty()
+    position.balance_base = args.base
+    position.balance_quote = args.quote
+
+    engine = BacktestEngine.from_config(
+        load_config(args.cfg), position=position, maker_fee=args.maker_fee, transaction_fee=args.tx_fee
+    )
+    report = engine.run(load_recording(args.data))
+
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
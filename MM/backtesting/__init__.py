@@ -0,0 +1,5 @@
+from .engine import BacktestEngine, BacktestReport
+from .recording import Recording, load_recording
+from .simulated_venue import Fill, SimulatedVenue
+
+__all__ = ["BacktestEngine", "BacktestReport", "Fill", "Recording", "SimulatedVenue", "load_recording"]
@@ -0,0 +1,90 @@
+import csv
+import importlib
+import importlib.util
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+REQUIRED_COLUMNS = ("timestamp", "fair_price")
+TRADE_SIDES = {"": 0, "buy": 1, "sell": -1}
+
+
+@dataclass(frozen=True)
+class Recording:
+    '''
+    Recorded fair prices and trades of a market, kept in columns, one row per pulse.
+
+    `trade_sides` is 1 if a taker bought and -1 if a taker sold at `trade_prices` right before
+    the pulse, 0 if there was no trade (the trade price and amount of such rows are None).
+    Values are converted to Decimal once, when loading, so that replays don't convert them again.
+    '''
+    timestamps: list[float]
+    fair_prices: list[Decimal]
+    trade_sides: list[int]
+    trade_prices: list[Decimal | None]
+    trade_amounts: list[Decimal | None]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+def load_recording(path: str) -> Recording:
+    '''
+    Loads a recording from a CSV or a Parquet file with columns `timestamp`, `fair_price` and
+    optionally `trade_side` ("buy" or "sell", empty without a trade), `trade_price` and `trade_amount`.
+    Reading Parquet requires the `pyarrow` package.
+    '''
+    if path.endswith(".parquet"):
+        if importlib.util.find_spec("pyarrow") is None:
+            raise ImportError("Reading Parquet recordings requires the `pyarrow` package")
+        table = importlib.import_module("pyarrow.parquet").read_table(path)
+        return _from_columns(table.to_pydict())
+
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    columns: dict[str, list[Any]] = {}
+    for name in rows[0] if rows else REQUIRED_COLUMNS:
+        columns[name] = [row[name] for row in rows]
+    return _from_columns(columns)
+
+
+def _from_columns(columns: dict[str, list[Any]]) -> Recording:
+    missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+    if missing:
+        raise ValueError(f"Recording is missing columns: {missing}")
+
+    rows = len(columns["timestamp"])
+    empty: list[Any] = [None] * rows
+
+    trade_sides: list[int] = []
+    trade_prices: list[Decimal | None] = []
+    trade_amounts: list[Decimal | None] = []
+    for side, price, amount in zip(
+        columns.get("trade_side", empty), columns.get("trade_price", empty), columns.get("trade_amount", empty)
+    ):
+        trade_side = TRADE_SIDES.get((side or "").lower())
+        if trade_side is None:
+            raise ValueError(f"Unknown trade side `{side}`")
+
+        if trade_side == 0:
+            trade_sides.append(0)
+            trade_prices.append(None)
+            trade_amounts.append(None)
+        else:
+            trade_sides.append(trade_side)
+            trade_prices.append(_to_decimal(price))
+            trade_amounts.append(_to_decimal(amount))
+
+    return Recording(
+        timestamps=[float(t) for t in columns["timestamp"]],
+        fair_prices=[_to_decimal(p) for p in columns["fair_price"]],
+        trade_sides=trade_sides,
+        trade_prices=trade_prices,
+        trade_amounts=trade_amounts,
+    )
+
+
+def _to_decimal(value: Any) -> Decimal:
+    # Floats (from Parquet) are converted through their shortest repr, not their binary value.
+    return Decimal(str(value))
@@ -0,0 +1,182 @@
+import itertools
+from dataclasses import dataclass, replace
+from decimal import Decimal
+from operator import attrgetter
+
+from marketmaking.order import AllOrders, BasicOrder, FutureOrder, OpenOrders, TerminalOrders
+from state.account_state import PositionInfo
+
+NO_TERMINAL_ORDERS = TerminalOrders(bids=[], asks=[])
+ZERO = Decimal(0)
+
+_price = attrgetter("price")
+
+
+@dataclass(frozen=True)
+class Fill:
+    order: BasicOrder
+    amount: Decimal
+    fee: Decimal
+
+
+class SimulatedVenue:
+    '''
+    Matching engine of a single market, holding the resting orders of the strategy and its position.
+
+    Orders rest as soon as they are placed and lock their funds, like on Remus. Orders that the free
+    balance doesn't cover are rejected. Recorded trades fill the resting orders they cross, best
+    price first, at the price of the order, as the strategy is always the maker.
+
+    `orders` and `position` are the same objects for the whole replay, updated in place (so that
+    the replay doesn't rebuild them on every pulse), `version` tells when they change.
+    '''
+    def __init__(
+        self,
+        position: PositionInfo,
+        market_id: int = 0,
+        maker_fee: Decimal = Decimal(0),
+        venue: str = "Backtest",
+    ) -> None:
+        self.market_id = market_id
+        self.maker_fee = maker_fee
+        self.venue = venue
+
+        self._position = PositionInfo(
+            balance_base=position.balance_base + position.withdrawable_base + position.in_orders_base,
+            balance_quote=position.balance_quote + position.withdrawable_quote + position.in_orders_quote,
+            withdrawable_base=Decimal(0),
+            withdrawable_quote=Decimal(0),
+            in_orders_base=Decimal(0),
+            in_orders_quote=Decimal(0),
+        )
+
+        # Resting orders by id, per side, in the order of their ids.
+        self._bids: dict[int, BasicOrder] = {}
+        self._asks: dict[int, BasicOrder] = {}
+        self._order_ids = itertools.count(1)
+
+        # Sorted like `OpenOrders.from_list` sorts them.
+        self._orders = AllOrders(active=OpenOrders(bids=[], asks=[]), terminal=NO_TERMINAL_ORDERS)
+
+        self.version = 0
+
+    @property
+    def orders(self) -> AllOrders:
+        return self._orders
+
+    @property
+    def position(self) -> PositionInfo:
+        return self._position
+
+    def place(self, order: FutureOrder, entry_time: int) -> BasicOrder | None:
+        '''
+        Places the order, returns None if the free balance doesn't cover it.
+        '''
+        position = self._position
+        bid = order.is_bid()
+        if bid:
+            locked = order.price * order.amount
+            if locked > position.balance_quote:
+                return None
+            position.balance_quote -= locked
+            position.in_orders_quote += locked
+        else:
+            if order.amount > position.balance_base:
+                return None
+            position.balance_base -= order.amount
+            position.in_orders_base += order.amount
+
+        placed = BasicOrder(
+            price=order.price,
+            amount=order.amount,
+            amount_remaining=order.amount,
+            order_id=next(self._order_ids),
+            market_id=self.market_id,
+            order_side=order.order_side,
+            entry_time=entry_time,
+            venue=self.venue,
+            price_ticks=order.price_ticks,
+            amount_lots=order.amount_lots,
+        )
+        (self._bids if bid else self._asks)[placed.order_id] = placed
+        self._changed(bid)
+        return placed
+
+    def cancel(self, order: BasicOrder) -> bool:
+        '''
+        Cancels the order, returns False if it is not resting (anymore).
+        '''
+        bid = order.is_bid()
+        resting = (self._bids if bid else self._asks).pop(order.order_id, None)
+        if resting is None:
+            return False
+
+        position = self._position
+        if bid:
+            released = resting.price * resting.amount_remaining
+            position.in_orders_quote -= released
+            position.balance_quote += released
+        else:
+            position.in_orders_base -= resting.amount_remaining
+            position.balance_base += resting.amount_remaining
+
+        self._changed(bid)
+        return True
+
+    def charge(self, amount: Decimal) -> None:
+        '''
+        Pays `amount` of the quote asset, eg. fees of transactions.
+        '''
+        self._position.balance_quote -= amount
+        self.version += 1
+
+    def match(self, taker_side: int, price: Decimal, amount: Decimal) -> list[Fill]:
+        '''
+        Fills the resting orders crossed by a trade of a taker, who bought (`taker_side` 1)
+        or sold (-1) `amount` at `price`.
+        '''
+        bid = taker_side < 0
+        orders = self._bids if bid else self._asks
+        # The sorts are stable, so orders of the same price fill in the order of their ids.
+        if bid:
+            crossed = sorted((o for o in orders.values() if o.price >= price), key=_price, reverse=True)
+        else:
+            crossed = sorted((o for o in orders.values() if o.price <= price), key=_price)
+
+        position = self._position
+        fills: list[Fill] = []
+        for order in crossed:
+            if amount <= 0:
+                break
+
+            filled = min(amount, order.amount_remaining)
+            amount -= filled
+            value = order.price * filled
+            fee = value * self.maker_fee if self.maker_fee else ZERO
+
+            if bid:
+                position.in_orders_quote -= value
+                position.balance_base += filled
+                position.balance_quote -= fee
+            else:
+                position.in_orders_base -= filled
+                position.balance_quote += value - fee
+
+            remaining = order.amount_remaining - filled
+            if remaining > 0:
+                orders[order.order_id] = replace(order, amount_remaining=remaining)
+            else:
+                del orders[order.order_id]
+
+            fills.append(Fill(order=order, amount=filled, fee=fee))
+
+        if fills:
+            self._changed(bid)
+        return fills
+
+    def _changed(self, bid: bool) -> None:
+        self.version += 1
+        if bid:
+            self._orders.active.bids[:] = sorted(self._bids.values(), key=_price, reverse=True)
+        else:
+            self._orders.active.asks[:] = sorted(self._asks.values(), key=_price, reverse=True)
@@ -0,0 +1,78 @@
+'''
+Benchmark of the backtest replay of a synthetic recording (a random walk of the fair price,
+with a trade on some of the pulses) through the order chain and reconciler of a config.
+The price moves on two thirds of the pulses, so most of them are evaluated; compare
+the evaluated pulses per second, the skipped ones cost next to nothing.
+
+    python -m benchmarks.backtest [--cfg cfg/example_cfg.toml] [--n 200000]
+'''
+
+import argparse
+import logging
+import random
+from decimal import Decimal
+
+from backtesting import BacktestEngine, Recording
+from cfg import load_config
+from monitoring import tracing
+from state.account_state import PositionInfo
+
+
+def synthetic_recording(
+    n: int, start_price: str = "0.5", tick: str = "0.0001", trade_probability: float = 0.05, seed: int = 1
+) -> Recording:
+    '''
+    Fair price moving a tick up or down with probability 1/3 each pulse, and random trades around it.
+    '''
+    rng = random.Random(seed)
+    tick_size = Decimal(tick)
+    price = Decimal(start_price)
+
+    fair_prices: list[Decimal] = []
+    trade_sides: list[int] = []
+    trade_prices: list[Decimal | None] = []
+    trade_amounts: list[Decimal | None] = []
+    for _ in range(n):
+        price += tick_size * rng.choice((-1, 0, 1))
+        fair_prices.append(price)
+
+        if rng.random() < trade_probability:
+            side = rng.choice((-1, 1))
+            trade_sides.append(side)
+            trade_prices.append(price * (1 + side * Decimal(rng.randint(0, 100)) / 10_000))
+            trade_amounts.append(Decimal(rng.randint(1, 20)))
+        else:
+            trade_sides.append(0)
+            trade_prices.append(None)
+            trade_amounts.append(None)
+
+    return Recording(
+        timestamps=[float(i) for i in range(n)],
+        fair_prices=fair_prices,
+        trade_sides=trade_sides,
+        trade_prices=trade_prices,
+        trade_amounts=trade_amounts,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cfg", type=str, default="cfg/example_cfg.toml")
+    parser.add_argument("--n", type=int, default=200_000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    tracing.set_enabled(False)
+
+    recording = synthetic_recording(args.n)
+
+    position = PositionInfo.empty()
+    position.balance_base = Decimal(1000)
+    position.balance_quote = Decimal(500)
+    engine = BacktestEngine.from_config(load_config(args.cfg), position=position, transaction_fee=Decimal("0.01"))
+
+    print(engine.run(recording).summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+'''
+Micro-benchmark of building Remus `submit_maker_order` calls, by starknet_py's
+`prepare_invoke_v3` (full ABI serialization) and by `CalldataTemplate`.
+
+Runs offline against an excerpt of the Remus ABI:
+
+    python -m benchmarks.calldata_templates [--n 20000]
+'''
+
+import argparse
+import timeit
+from typing import Callable
+
+from starknet_py.contract import Contract
+from starknet_py.net.account.account import Account
+from starknet_py.net.client_models import Call
+from starknet_py.net.full_node_client import FullNodeClient
+from starknet_py.net.models.chains import StarknetChainId
+from starknet_py.net.signer.key_pair import KeyPair
+
+from platforms.starknet.calldata import CalldataTemplate
+
+REMUS_ABI_EXCERPT = [
+    {
+        "type": "struct",
+        "name": "core::integer::u256",
+        "members": [
+            {"name": "low", "type": "core::integer::u128"},
+            {"name": "high", "type": "core::integer::u128"},
+        ],
+    },
+    {
+        "type": "enum",
+        "name": "remus::types::OrderSide",
+        "variants": [{"name": "Bid", "type": "()"}, {"name": "Ask", "type": "()"}],
+    },
+    {
+        "type": "enum",
+        "name": "remus::types::OrderType",
+        "variants": [{"name": "Basic", "type": "()"}, {"name": "ImmediateOrCancel", "type": "()"}],
+    },
+    {
+        "type": "enum",
+        "name": "remus::types::TimeLimit",
+        "variants": [{"name": "GTC", "type": "()"}, {"name": "IOC", "type": "()"}],
+    },
+    {
+        "type": "interface",
+        "name": "remus::IRemusDex",
+        "items": [
+            {
+                "type": "function",
+                "name": "submit_maker_order",
+                "inputs": [
+                    {"name": "market_id", "type": "core::felt252"},
+                    {"name": "target_token_address", "type": "core::starknet::contract_address::ContractAddress"},
+                    {"name": "order_price", "type": "core::integer::u256"},
+                    {"name": "order_size", "type": "core::integer::u256"},
+                    {"name": "order_side", "type": "remus::types::OrderSide"},
+                    {"name": "order_type", "type": "remus::types::OrderType"},
+                    {"name": "time_limit", "type": "remus::types::TimeLimit"},
+                ],
+                "outputs": [],
+                "state_mutability": "external",
+            },
+        ],
+    },
+    {"type": "impl", "name": "RemusDexImpl", "interface_name": "remus::IRemusDex"},
+]
+
+TOKEN_ADDRESS = 0x04718F5A0FC34CC1AF16A1CDEE98FFB20C31F5CD61D6AB07201858F4287C938D
+
+
+def _get_contract() -> Contract:
+    # The account is needed only to prepare invokes, nothing is sent.
+    account = Account(
+        address=0x1,
+        client=FullNodeClient(node_url="http://127.0.0.1:1"),
+        key_pair=KeyPair.from_private_key(0x1),
+        chain=StarknetChainId.MAINNET,
+    )
+    return Contract(address=0x1234, abi=REMUS_ABI_EXCERPT, provider=account, cairo_version=1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=20_000, help="Number of calls built per variant")
+    args = parser.parse_args()
+
+    function = _get_contract().functions["submit_maker_order"]
+    template = CalldataTemplate(
+        function, order_side=("Ask", None), order_type=("Basic", None), time_limit=("GTC", None)
+    )
+
+    def prepare_invoke(i: int) -> Call:
+        return function.prepare_invoke_v3(
+            market_id=2,
+            target_token_address=TOKEN_ADDRESS,
+            order_price=10**18 + i,
+            order_size=10**17 + i,
+            order_side=("Ask", None),
+            order_type=("Basic", None),
+            time_limit=("GTC", None),
+        )
+
+    def build_from_template(i: int) -> Call:
+        return template.build(
+            market_id=2,
+            target_token_address=TOKEN_ADDRESS,
+            order_price=10**18 + i,
+            order_size=10**17 + i,
+        )
+
+    for i in (0, 2**130):
+        assert prepare_invoke(i).calldata == build_from_template(i).calldata
+
+    results: dict[str, float] = {}
+    for name, build in (("prepare_invoke_v3", prepare_invoke), ("CalldataTemplate", build_from_template)):
+        results[name] = _per_call(build, args.n)
+        print(f"{name:>20}: {results[name] * 1e6:8.2f} us/call")
+
+    print(f"{'speedup':>20}: {results['prepare_invoke_v3'] / results['CalldataTemplate']:8.1f}x")
+
+
+def _per_call(build: Callable[[int], Call], n: int) -> float:
+    counter = iter(range(10**12))
+    # Best of a few repeats, so that a noisy neighbour doesn't skew the result.
+    return min(timeit.repeat(lambda: build(next(counter)), number=n, repeat=3)) / n
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+from .contracts import ContractError, MockContract, MockEkuboPositions, MockErc20, MockRemus
+from .deployment import deploy_venues
+from .node import MockStarknetNode, RpcError, RpcStats
+
+__all__ = [
+    "ContractError",
+    "MockContract",
+    "MockEkuboPositions",
+    "MockErc20",
+    "MockRemus",
+    "MockStarknetNode",
+    "RpcError",
+    "RpcStats",
+    "deploy_venues",
+]
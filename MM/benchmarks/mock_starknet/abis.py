@@ -0,0 +1,278 @@
+'''
+ABIs of the mocked contracts. They contain only the entry points, events (and the types) the bot uses,
+in the layout the bot expects, not the full ABIs of the deployed contracts.
+'''
+
+from typing import Any
+
+U256 = {
+    "type": "struct",
+    "name": "core::integer::u256",
+    "members": [
+        {"name": "low", "type": "core::integer::u128"},
+        {"name": "high", "type": "core::integer::u128"},
+    ],
+}
+
+BOOL = {
+    "type": "enum",
+    "name": "core::bool",
+    "variants": [{"name": "False", "type": "()"}, {"name": "True", "type": "()"}],
+}
+
+I129 = {
+    "type": "struct",
+    "name": "ekubo::types::i129::i129",
+    "members": [
+        {"name": "mag", "type": "core::integer::u128"},
+        {"name": "sign", "type": "core::bool"},
+    ],
+}
+
+ADDRESS = "core::starknet::contract_address::ContractAddress"
+
+
+def _function(
+    name: str, inputs: list[tuple[str, str]], outputs: list[str], mutability: str = "view"
+) -> dict[str, Any]:
+    return {
+        "type": "function",
+        "name": name,
+        "inputs": [{"name": n, "type": t} for n, t in inputs],
+        "outputs": [{"type": t} for t in outputs],
+        "state_mutability": mutability,
+    }
+
+
+def _event(name: str, members: list[tuple[str, str]]) -> dict[str, Any]:
+    return {
+        "type": "event",
+        "name": name,
+        "kind": "struct",
+        "members": [{"name": n, "type": t, "kind": "data"} for n, t in members],
+    }
+
+
+def _events(contract: str, events: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    # Event structs and the `Event` enum of the contract nesting them, keyed by the struct name.
+    return [
+        *events,
+        {
+            "type": "event",
+            "name": f"{contract}::Event",
+            "kind": "enum",
+            "variants": [
+                {"name": e["name"].rsplit("::", 1)[-1], "type": e["name"], "kind": "nested"} for e in events
+            ],
+        },
+    ]
+
+
+def _interface(name: str, functions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [
+        {"type": "interface", "name": name, "items": functions},
+        {"type": "impl", "name": f"{name.rsplit('::', 1)[-1]}Impl", "interface_name": name},
+    ]
+
+
+ERC20_ABI: list[dict[str, Any]] = [
+    U256,
+    BOOL,
+    *_interface("openzeppelin::token::erc20::interface::IERC20", [
+        _function("balanceOf", [("account", ADDRESS)], ["core::integer::u256"]),
+        _function("allowance", [("owner", ADDRESS), ("spender", ADDRESS)], ["core::integer::u256"]),
+        _function(
+            "approve", [("spender", ADDRESS), ("amount", "core::integer::u256")], ["core::bool"], "external"
+        ),
+        _function(
+            "transfer", [("recipient", ADDRESS), ("amount", "core::integer::u256")], ["core::bool"], "external"
+        ),
+    ]),
+]
+
+REMUS_ABI: list[dict[str, Any]] = [
+    U256,
+    {
+        "type": "enum",
+        "name": "remus::types::OrderSide",
+        "variants": [{"name": "Bid", "type": "()"}, {"name": "Ask", "type": "()"}],
+    },
+    {
+        "type": "enum",
+        "name": "remus::types::OrderType",
+        "variants": [{"name": "Basic", "type": "()"}, {"name": "ImmediateOrCancel", "type": "()"}],
+    },
+    {
+        "type": "enum",
+        "name": "remus::types::TimeLimit",
+        "variants": [{"name": "GTC", "type": "()"}, {"name": "IOC", "type": "()"}],
+    },
+    {
+        "type": "struct",
+        "name": "remus::types::MakerOrder",
+        "members": [
+            {"name": "maker_order_id", "type": "core::felt252"},
+            {"name": "market_id", "type": "core::felt252"},
+            {"name": "owner", "type": ADDRESS},
+            {"name": "order_side", "type": "remus::types::OrderSide"},
+            {"name": "price", "type": "core::integer::u256"},
+            {"name": "amount", "type": "core::integer::u256"},
+            {"name": "amount_remaining", "type": "core::integer::u256"},
+            {"name": "entry_time", "type": "core::integer::u64"},
+        ],
+    },
+    *_interface("remus::IRemusDex", [
+        _function(
+            "get_all_user_orders",
+            [("user", ADDRESS)],
+            ["core::array::Array::<remus::types::MakerOrder>"],
+        ),
+        _function(
+            "get_claimable",
+            [("token_address", ADDRESS), ("user_address", ADDRESS)],
+            ["core::integer::u256"],
+        ),
+        _function(
+            "submit_maker_order",
+            [
+                ("market_id", "core::felt252"),
+                ("target_token_address", ADDRESS),
+                ("order_price", "core::integer::u256"),
+                ("order_size", "core::integer::u256"),
+                ("order_side", "remus::types::OrderSide"),
+                ("order_type", "remus::types::OrderType"),
+                ("time_limit", "remus::types::TimeLimit"),
+            ],
+            [],
+            "external",
+        ),
+        _function("delete_maker_order", [("maker_order_id", "core::felt252")], [], "external"),
+        _function(
+            "claim", [("token_address", ADDRESS), ("amount", "core::integer::u256")], [], "external"
+        ),
+    ]),
+    *_events("remus::remus::RemusDex", [
+        _event("remus::remus::RemusDex::OrderPlaced", [
+            ("maker_order_id", "core::felt252"),
+            ("market_id", "core::felt252"),
+            ("owner", ADDRESS),
+            ("order_side", "remus::types::OrderSide"),
+            ("price", "core::integer::u256"),
+            ("amount", "core::integer::u256"),
+            ("entry_time", "core::integer::u64"),
+        ]),
+        _event("remus::remus::RemusDex::OrderFilled", [
+            ("maker_order_id", "core::felt252"),
+            ("market_id", "core::felt252"),
+            ("owner", ADDRESS),
+            ("amount", "core::integer::u256"),
+        ]),
+        _event("remus::remus::RemusDex::OrderDeleted", [
+            ("maker_order_id", "core::felt252"),
+            ("market_id", "core::felt252"),
+            ("owner", ADDRESS),
+        ]),
+    ]),
+]
+
+EKUBO_POSITIONS_ABI: list[dict[str, Any]] = [
+    U256,
+    BOOL,
+    I129,
+    {
+        "type": "struct",
+        "name": "ekubo::extensions::limit_orders::OrderKey",
+        "members": [
+            {"name": "token0", "type": ADDRESS},
+            {"name": "token1", "type": ADDRESS},
+            {"name": "tick", "type": "ekubo::types::i129::i129"},
+        ],
+    },
+    {
+        "type": "struct",
+        "name": "ekubo::extensions::limit_orders::GetOrderInfoResult",
+        "members": [
+            {"name": "executed", "type": "core::bool"},
+            {"name": "amount0", "type": "core::integer::u128"},
+            {"name": "amount1", "type": "core::integer::u128"},
+        ],
+    },
+    {
+        "type": "struct",
+        "name": "ekubo::types::keys::PoolKey",
+        "members": [
+            {"name": "token0", "type": ADDRESS},
+            {"name": "token1", "type": ADDRESS},
+            {"name": "fee", "type": "core::integer::u128"},
+            {"name": "tick_spacing", "type": "core::integer::u128"},
+            {"name": "extension", "type": ADDRESS},
+        ],
+    },
+    {
+        "type": "struct",
+        "name": "ekubo::types::bounds::Bounds",
+        "members": [
+            {"name": "lower", "type": "ekubo::types::i129::i129"},
+            {"name": "upper", "type": "ekubo::types::i129::i129"},
+        ],
+    },
+    {
+        "type": "struct",
+        "name": "ekubo::types::pool_price::PoolPrice",
+        "members": [
+            {"name": "sqrt_ratio", "type": "core::integer::u256"},
+            {"name": "tick", "type": "ekubo::types::i129::i129"},
+        ],
+    },
+    {
+        "type": "struct",
+        "name": "ekubo::interfaces::positions::GetTokenInfoResult",
+        "members": [
+            {"name": "pool_price", "type": "ekubo::types::pool_price::PoolPrice"},
+            {"name": "liquidity", "type": "core::integer::u128"},
+            {"name": "amount0", "type": "core::integer::u128"},
+            {"name": "amount1", "type": "core::integer::u128"},
+            {"name": "fees0", "type": "core::integer::u128"},
+            {"name": "fees1", "type": "core::integer::u128"},
+        ],
+    },
+    *_interface("ekubo::interfaces::positions::IPositions", [
+        _function(
+            "get_limit_orders_info",
+            [(
+                "params",
+                "core::array::Span::<(core::integer::u64, ekubo::extensions::limit_orders::OrderKey)>",
+            )],
+            ["core::array::Span::<ekubo::extensions::limit_orders::GetOrderInfoResult>"],
+        ),
+        _function(
+            "get_token_info",
+            [
+                ("id", "core::integer::u64"),
+                ("pool_key", "ekubo::types::keys::PoolKey"),
+                ("bounds", "ekubo::types::bounds::Bounds"),
+            ],
+            ["ekubo::interfaces::positions::GetTokenInfoResult"],
+        ),
+    ]),
+]
+
+ACCOUNT_ABI: list[dict[str, Any]] = [
+    {
+        "type": "struct",
+        "name": "core::starknet::account::Call",
+        "members": [
+            {"name": "to", "type": ADDRESS},
+            {"name": "selector", "type": "core::felt252"},
+            {"name": "calldata", "type": "core::array::Span::<core::felt252>"},
+        ],
+    },
+    *_interface("openzeppelin::account::interface::ISRC6", [
+        _function(
+            "__execute__",
+            [("calls", "core::array::Array::<core::starknet::account::Call>")],
+            ["core::array::Array::<core::array::Span::<core::felt252>>"],
+            "external",
+        ),
+    ]),
+]
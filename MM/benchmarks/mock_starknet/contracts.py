@@ -0,0 +1,367 @@
+'''
+Contracts of the mock node, implemented in Python. Calldata is decoded and results encoded
+by starknet_py's serializers from the ABI of the contract, so the bot talks to them exactly
+like it talks to the deployed contracts.
+'''
+
+import copy
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from starknet_py.abi.v2.model import Abi
+from starknet_py.abi.v2.parser import AbiParser
+from starknet_py.hash.selector import get_selector_from_name
+from starknet_py.serialization.data_serializers.cairo_data_serializer import CairoDataSerializer
+from starknet_py.serialization.data_serializers.payload_serializer import PayloadSerializer
+from starknet_py.serialization.factory import serializer_for_payload, serializer_for_type
+
+from venues.remus.remus_market_configs import RemusMarketConfig
+
+from .abis import ERC20_ABI, EKUBO_POSITIONS_ABI, REMUS_ABI
+
+MAX_UINT = 2**256 - 1
+
+
+class ContractError(Exception):
+    '''
+    Raised by entry points to revert the call (or the transaction), like a failed assert.
+    '''
+
+
+@dataclass(frozen=True)
+class Entrypoint:
+    name: str
+    inputs: CairoDataSerializer[dict[str, Any], Any]
+    outputs: list[CairoDataSerializer[Any, Any]]
+
+
+@dataclass(frozen=True)
+class Event:
+    selector: int
+    keys: PayloadSerializer
+    data: PayloadSerializer
+
+
+class MockContract:
+    '''
+    Contract deployed at `address`, whose ABI entry points are methods of the same name, called
+    with the caller's address and the deserialized arguments and returning a tuple of the outputs.
+
+    Events of the ABI are emitted by their name (without the path) and members, serialized
+    like Cairo does: `#[key]` members follow the selector in the keys, the others are the data.
+    Events emitted during a call are collected in `emitted` until the node takes them.
+    '''
+    abi: list[dict[str, Any]] = []
+
+    def __init__(self, address: int) -> None:
+        self.address = address
+        self.emitted: list[tuple[list[int], list[int]]] = []
+        interface = _INTERFACES.get(type(self))
+        if interface is None:
+            interface = _INTERFACES[type(self)] = _parse_interface(self.abi)
+        self.entrypoints, self.events = interface
+
+    def execute(self, caller: int, selector: int, calldata: list[int]) -> tuple[Entrypoint, list[int]]:
+        entrypoint = self.entrypoints.get(selector)
+        if entrypoint is None:
+            raise ContractError(f"Entry point {hex(selector)} not found in contract {hex(self.address)}")
+
+        try:
+            arguments = entrypoint.inputs.deserialize(calldata)
+        except Exception as e:
+            raise ContractError(f"Failed to deserialize the calldata of `{entrypoint.name}`: {e}") from e
+
+        method: Callable[..., tuple[Any, ...]] = getattr(self, entrypoint.name)
+        results = method(caller, **arguments.as_dict())
+
+        encoded: list[int] = []
+        for serializer, result in zip(entrypoint.outputs, results):
+            encoded.extend(serializer.serialize(result))
+        return entrypoint, encoded
+
+    def emit(self, name: str, **members: Any) -> None:
+        event = self.events[name]
+        keys = event.keys.serialize({n: members.pop(n) for n in list(members) if n in event.keys.serializers})
+        self.emitted.append(([event.selector, *keys], event.data.serialize(members)))
+
+    def snapshot(self) -> dict[str, Any]:
+        '''
+        Copy of the storage of the contract, to `restore` it when a transaction reverts.
+        '''
+        return {name: copy.deepcopy(value) for name, value in vars(self).items() if name not in _NOT_STORAGE}
+
+    def restore(self, snapshot: dict[str, Any]) -> None:
+        vars(self).update(snapshot)
+
+
+# Attributes of the contracts which are not their storage.
+_NOT_STORAGE = frozenset(("address", "entrypoints", "events", "emitted", "markets", "_tokens"))
+
+
+# Entry points and events of the contract classes. Parsing the ABI is slow, so it is parsed
+# once per class, the serializers are stateless.
+_INTERFACES: dict[type[MockContract], tuple[dict[int, Entrypoint], dict[str, Event]]] = {}
+
+
+def _parse_interface(abi: list[dict[str, Any]]) -> tuple[dict[int, Entrypoint], dict[str, Event]]:
+    '''
+    Entry points by selector and events by name (without the path) of the ABI.
+    '''
+    parsed = AbiParser(abi).parse()
+    entrypoints = {
+        get_selector_from_name(function.name): Entrypoint(
+            name=function.name,
+            inputs=serializer_for_payload(function.inputs),
+            outputs=[serializer_for_type(output) for output in function.outputs],
+        )
+        for function in _functions(parsed)
+    }
+    events = {
+        name.rsplit("::", 1)[-1]: Event(
+            selector=get_selector_from_name(name.rsplit("::", 1)[-1]),
+            keys=serializer_for_payload(OrderedDict((n, t) for n, t in event.types.items() if n in event.keys)),
+            data=serializer_for_payload(OrderedDict((n, t) for n, t in event.types.items() if n not in event.keys)),
+        )
+        for name, event in parsed.events.items()
+    }
+    return entrypoints, events
+
+
+def _functions(abi: Abi) -> list[Abi.Function]:
+    functions = list(abi.functions.values())
+    for interface in abi.interfaces.values():
+        functions.extend(interface.items.values())
+    return functions
+
+
+class MockErc20(MockContract):
+    abi = ERC20_ABI
+
+    def __init__(self, address: int) -> None:
+        super().__init__(address)
+        self.balances: dict[int, int] = {}
+        self.allowances: dict[tuple[int, int], int] = {}
+
+    def mint(self, account: int, amount: int) -> None:
+        self.balances[account] = self.balances.get(account, 0) + amount
+
+    def burn(self, account: int, amount: int) -> None:
+        self.balances[account] = self.balances.get(account, 0) - amount
+
+    def move(self, sender: int, recipient: int, amount: int) -> None:
+        balance = self.balances.get(sender, 0)
+        if balance < amount:
+            raise ContractError("ERC20: insufficient balance")
+        self.balances[sender] = balance - amount
+        self.mint(recipient, amount)
+
+    def spend(self, owner: int, spender: int, recipient: int, amount: int) -> None:
+        '''
+        Moves the tokens of `owner` on behalf of `spender`, like `transferFrom`.
+        '''
+        allowance = self.allowances.get((owner, spender), 0)
+        if allowance < amount:
+            raise ContractError("ERC20: insufficient allowance")
+        if allowance != MAX_UINT:
+            self.allowances[(owner, spender)] = allowance - amount
+        self.move(owner, recipient, amount)
+
+    def balanceOf(self, caller: int, account: int) -> tuple[int]:
+        return (self.balances.get(account, 0),)
+
+    def allowance(self, caller: int, owner: int, spender: int) -> tuple[int]:
+        return (self.allowances.get((owner, spender), 0),)
+
+    def approve(self, caller: int, spender: int, amount: int) -> tuple[bool]:
+        self.allowances[(caller, spender)] = amount
+        return (True,)
+
+    def transfer(self, caller: int, recipient: int, amount: int) -> tuple[bool]:
+        self.move(caller, recipient, amount)
+        return (True,)
+
+
+class MockRemus(MockContract):
+    '''
+    Remus with resting maker orders only. Submitted orders lock their funds in the contract,
+    deleted orders return what is left of them to the owner. Filled amounts (see `fill`)
+    become claimable by the owner.
+    '''
+    abi = REMUS_ABI
+
+    def __init__(
+        self, address: int, tokens: dict[int, MockErc20], market_configs: list[RemusMarketConfig]
+    ) -> None:
+        super().__init__(address)
+        self._tokens = tokens
+        self.markets = {cfg.market_id: cfg for cfg in market_configs}
+
+        self.orders: dict[int, dict[str, Any]] = {}
+        self.claimable: dict[tuple[int, int], int] = {}
+        self._last_order_id = 0
+
+    def get_all_user_orders(self, caller: int, user: int) -> tuple[list[dict[str, Any]]]:
+        return ([o for o in self.orders.values() if o["owner"] == user],)
+
+    def get_claimable(self, caller: int, token_address: int, user_address: int) -> tuple[int]:
+        return (self.claimable.get((token_address, user_address), 0),)
+
+    def submit_maker_order(
+        self,
+        caller: int,
+        market_id: int,
+        target_token_address: int,
+        order_price: int,
+        order_size: int,
+        order_side: Any,
+        order_type: Any,
+        time_limit: Any,
+    ) -> tuple[()]:
+        cfg = self.markets.get(market_id)
+        if cfg is None or not cfg.trading_enabled:
+            raise ContractError("Market not found or disabled")
+        if order_price <= 0 or order_price % cfg.tick_size:
+            raise ContractError("Price is not a multiple of the tick size")
+        if order_size <= 0 or order_size % cfg.lot_size:
+            raise ContractError("Size is not a multiple of the lot size")
+
+        side = order_side.variant
+        locked = self._locked(side, cfg, order_price, order_size)
+        self._token(side, cfg).spend(caller, self.address, self.address, locked)
+
+        self._last_order_id += 1
+        order_id = self._last_order_id
+        self.orders[order_id] = {
+            "maker_order_id": order_id,
+            "market_id": market_id,
+            "owner": caller,
+            "order_side": (side, None),
+            "price": order_price,
+            "amount": order_size,
+            "amount_remaining": order_size,
+            "entry_time": int(time.time()),
+        }
+        self.emit(
+            "OrderPlaced",
+            maker_order_id=order_id,
+            market_id=market_id,
+            owner=caller,
+            order_side=(side, None),
+            price=order_price,
+            amount=order_size,
+            entry_time=self.orders[order_id]["entry_time"],
+        )
+        return ()
+
+    def delete_maker_order(self, caller: int, maker_order_id: int) -> tuple[()]:
+        order = self.orders.get(maker_order_id)
+        if order is None or order["owner"] != caller:
+            raise ContractError("Order not found")
+
+        del self.orders[maker_order_id]
+        side = order["order_side"][0]
+        cfg = self.markets[order["market_id"]]
+        self._token(side, cfg).move(
+            self.address, caller, self._locked(side, cfg, order["price"], order["amount_remaining"])
+        )
+        self.emit("OrderDeleted", maker_order_id=maker_order_id, market_id=order["market_id"], owner=caller)
+        return ()
+
+    def claim(self, caller: int, token_address: int, amount: int) -> tuple[()]:
+        claimable = self.claimable.get((token_address, caller), 0)
+        if amount > claimable:
+            raise ContractError("Amount exceeds the claimable amount")
+
+        self.claimable[(token_address, caller)] = claimable - amount
+        self._tokens[token_address].move(self.address, caller, amount)
+        return ()
+
+    def fill(self, order_id: int, amount: int) -> None:
+        '''
+        Fills `amount` of the order by an (unseen) taker, the proceeds become claimable by the maker.
+        '''
+        order = self.orders[order_id]
+        amount = min(amount, order["amount_remaining"])
+        side = order["order_side"][0]
+        cfg = self.markets[order["market_id"]]
+
+        # A filled bid bought base for the locked quote, a filled ask sold the locked base for quote.
+        if side == "Bid":
+            paid, token, proceeds = cfg.quote_token.address, cfg.base_token.address, amount
+            self._tokens[paid].burn(self.address, self._locked(side, cfg, order["price"], amount))
+        else:
+            paid, token = cfg.base_token.address, cfg.quote_token.address
+            proceeds = self._locked("Bid", cfg, order["price"], amount)
+            self._tokens[paid].burn(self.address, amount)
+
+        key = (token, order["owner"])
+        self.claimable[key] = self.claimable.get(key, 0) + proceeds
+        self._tokens[token].mint(self.address, proceeds)
+
+        order["amount_remaining"] -= amount
+        if not order["amount_remaining"]:
+            del self.orders[order_id]
+        self.emit(
+            "OrderFilled", maker_order_id=order_id, market_id=order["market_id"], owner=order["owner"], amount=amount
+        )
+
+    def _token(self, side: str, cfg: RemusMarketConfig) -> MockErc20:
+        return self._tokens[(cfg.quote_token if side == "Bid" else cfg.base_token).address]
+
+    @staticmethod
+    def _locked(side: str, cfg: RemusMarketConfig, price: int, size: int) -> int:
+        '''
+        Raw amount an order locks: the size (in base) of asks, the size times the price of bids.
+        Prices are quote per base with 18 decimals.
+        '''
+        if side == "Ask":
+            return size
+        return int(price * size * 10**cfg.quote_token.decimals // (10**18 * 10**cfg.base_token.decimals))
+
+
+class MockEkuboPositions(MockContract):
+    '''
+    View entry points of the Ekubo Positions contract, serving limit orders and positions set
+    by `set_limit_order` and `set_position`. Unknown orders and positions read as empty.
+    '''
+    abi = EKUBO_POSITIONS_ABI
+
+    def __init__(self, address: int) -> None:
+        super().__init__(address)
+        self.limit_orders: dict[tuple[int, int, int, int, bool], dict[str, Any]] = {}
+        self.positions: dict[int, dict[str, Any]] = {}
+
+    def set_limit_order(
+        self, order_id: int, token0: int, token1: int, tick: int, executed: bool, amount0: int, amount1: int
+    ) -> None:
+        key = (order_id, token0, token1, abs(tick), tick < 0)
+        self.limit_orders[key] = {"executed": executed, "amount0": amount0, "amount1": amount1}
+
+    def set_position(self, position_id: int, info: dict[str, Any]) -> None:
+        self.positions[position_id] = info
+
+    def get_limit_orders_info(
+        self, caller: int, params: list[tuple[int, dict[str, Any]]]
+    ) -> tuple[list[dict[str, Any]]]:
+        empty = {"executed": False, "amount0": 0, "amount1": 0}
+        return ([
+            self.limit_orders.get(
+                (order_id, key["token0"], key["token1"], key["tick"]["mag"], key["tick"]["sign"]), empty
+            )
+            for order_id, key in params
+        ],)
+
+    def get_token_info(
+        self, caller: int, id: int, pool_key: dict[str, Any], bounds: dict[str, Any]
+    ) -> tuple[dict[str, Any]]:
+        empty = {
+            "pool_price": {"sqrt_ratio": 0, "tick": {"mag": 0, "sign": False}},
+            "liquidity": 0,
+            "amount0": 0,
+            "amount1": 0,
+            "fees0": 0,
+            "fees1": 0,
+        }
+        return (self.positions.get(id, empty),)
@@ -0,0 +1,27 @@
+from instruments.starknet import SN_ADDRESS_TO_TOKEN
+from venues.ekubo.ekubo import EKUBO_POSITIONS_ADDRESS
+from venues.remus.remus import REMUS_ADDRESS
+from venues.remus.remus_market_configs import MARKET_ID_TO_CONFIG
+
+from .contracts import MockEkuboPositions, MockErc20, MockRemus
+from .node import MockStarknetNode
+
+
+def deploy_venues(
+    node: MockStarknetNode, account: int, balances: dict[int, int] | None = None
+) -> tuple[MockRemus, MockEkuboPositions]:
+    '''
+    Deploys the known tokens, Remus (with the preloaded market configs) and Ekubo Positions
+    at their mainnet addresses, and an account holding `balances` (raw amounts by token address).
+    '''
+    tokens = {address: MockErc20(address) for address in SN_ADDRESS_TO_TOKEN}
+    for address, amount in (balances or {}).items():
+        tokens[address].mint(account, amount)
+
+    remus = MockRemus(int(REMUS_ADDRESS, 16), tokens, list(MARKET_ID_TO_CONFIG.values()))
+    ekubo = MockEkuboPositions(EKUBO_POSITIONS_ADDRESS)
+
+    for contract in (*tokens.values(), remus, ekubo):
+        node.deploy(contract)
+    node.deploy_account(account)
+    return remus, ekubo
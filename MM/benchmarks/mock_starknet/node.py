@@ -0,0 +1,525 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from aiohttp import web
+from starknet_py.constants import EXPECTED_RPC_VERSION
+from starknet_py.hash.selector import get_selector_from_name
+from starknet_py.net.models.chains import StarknetChainId
+
+from .abis import ACCOUNT_ABI
+from .contracts import ContractError, MockContract
+
+# Gas prices of all the blocks, in FRI (and WEI).
+L1_GAS_PRICE = 30_000_000_000_000
+L1_DATA_GAS_PRICE = 1_000
+L2_GAS_PRICE = 12_000_000_000
+# Gas consumed by a transaction and by each of its calls.
+L2_GAS_PER_TX = 400_000
+L2_GAS_PER_CALL = 1_200_000
+L1_DATA_GAS_PER_CALL = 128
+
+# Future nonces accepted ahead of the account's nonce, as transactions may arrive out of order.
+MAX_NONCE_GAP = 64
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str, data: Any = None) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+@dataclass
+class RpcStats:
+    '''
+    Counts of the requests served by the node. `calls` counts view calls by entry point,
+    `invokes` the calls of the transactions (sent, not necessarily included).
+    '''
+    http_requests: int = 0
+    batches: int = 0
+    methods: Counter[str] = field(default_factory=Counter)
+    calls: Counter[str] = field(default_factory=Counter)
+    invokes: Counter[str] = field(default_factory=Counter)
+
+    def reset(self) -> None:
+        self.http_requests = 0
+        self.batches = 0
+        self.methods.clear()
+        self.calls.clear()
+        self.invokes.clear()
+
+
+@dataclass
+class _Transaction:
+    hash: int
+    sender: int
+    nonce: int
+    calls: list[tuple[int, int, list[int]]]
+    max_l2_gas: int
+    block_number: int | None = None
+    reverted: str | None = None
+    l2_gas: int = 0
+    events: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class _Block:
+    number: int
+    hash: int
+    parent_hash: int
+    timestamp: int
+    transactions: list[int]
+
+
+class MockStarknetNode:
+    '''
+    Starknet JSON-RPC node serving MockContracts from memory, for benchmarks and local runs
+    of the bot without a network.
+
+    Each HTTP request (a single request or a batch) is answered after `latency` seconds.
+    A block is produced every `block_time` seconds with the pending transactions, which are
+    executed only then, so their effects (and receipts) appear with the block, like on the chain.
+    Reverting transactions leave no effects but a receipt with the revert reason.
+    Events of changes made directly on the contracts (eg. `MockRemus.fill` by an unseen taker)
+    are recorded with the next block, before its transactions.
+
+    All the calls are served from the latest state, whatever block they ask for. Signatures
+    are not verified and fees are not charged, the accounts only need the right nonces.
+    '''
+    def __init__(
+        self,
+        latency: float = 0.0,
+        block_time: float = 1.0,
+        chain_id: StarknetChainId = StarknetChainId.MAINNET,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        self.latency = latency
+        self.block_time = block_time
+        self.chain_id = chain_id
+        self._host = host
+        self._port = port
+
+        self.stats = RpcStats()
+
+        self.contracts: dict[int, MockContract] = {}
+        # Nonces of the accounts, which are all of the ACCOUNT_ABI class.
+        self.nonces: dict[int, int] = {}
+        self._classes: dict[int, list[dict[str, Any]]] = {}
+        self._class_hashes: dict[int, int] = {}
+
+        self.blocks: list[_Block] = []
+        self._transactions: dict[int, _Transaction] = {}
+        self._pending: dict[tuple[int, int], _Transaction] = {}
+        self._events: list[dict[str, Any]] = []
+
+        self._methods: dict[str, Callable[[dict[str, Any]], Any]] = {
+            "starknet_specVersion": lambda _: EXPECTED_RPC_VERSION,
+            "starknet_chainId": lambda _: hex(self.chain_id),
+            "starknet_blockNumber": lambda _: self.blocks[-1].number,
+            "starknet_blockHashAndNumber": self._block_hash_and_number,
+            "starknet_getBlockWithTxHashes": self._get_block_with_tx_hashes,
+            "starknet_getNonce": self._get_nonce,
+            "starknet_getClassHashAt": self._get_class_hash_at,
+            "starknet_getClass": self._get_class,
+            "starknet_getClassAt": self._get_class_at,
+            "starknet_call": self._call,
+            "starknet_estimateFee": self._estimate_fee,
+            "starknet_addInvokeTransaction": self._add_invoke_transaction,
+            "starknet_getTransactionStatus": self._get_transaction_status,
+            "starknet_getTransactionReceipt": self._get_transaction_receipt,
+            "starknet_getEvents": self._get_events,
+        }
+
+        self._runner: web.AppRunner | None = None
+        self._block_task: asyncio.Task[None] | None = None
+        self.url = ""
+
+        self._new_block()
+
+    def deploy(self, contract: MockContract) -> None:
+        self._register_class(contract.address, contract.abi)
+        self.contracts[contract.address] = contract
+
+    def deploy_account(self, address: int, nonce: int = 0) -> None:
+        self._register_class(address, ACCOUNT_ABI)
+        self.nonces[address] = nonce
+
+    async def start(self) -> None:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._host, self._port)
+        await site.start()
+
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        self._block_task = asyncio.create_task(self._produce_blocks())
+        self._logger.info("Mock node listening on %s.", self.url)
+
+    async def stop(self) -> None:
+        if self._block_task is not None:
+            self._block_task.cancel()
+            try:
+                await self._block_task
+            except asyncio.CancelledError:
+                pass
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.stats.http_requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if isinstance(body, list):
+            self.stats.batches += 1
+            return web.json_response([self._dispatch(r) for r in body])
+        return web.json_response(self._dispatch(body))
+
+    def _dispatch(self, request: dict[str, Any]) -> dict[str, Any]:
+        method_name = request.get("method", "")
+        self.stats.methods[method_name] += 1
+        response: dict[str, Any] = {"jsonrpc": "2.0", "id": request.get("id")}
+
+        method = self._methods.get(method_name)
+        if method is None:
+            response["error"] = {"code": -32601, "message": f"Method `{method_name}` not found"}
+            return response
+
+        params = request.get("params") or {}
+        try:
+            response["result"] = method(params)
+        except RpcError as e:
+            response["error"] = {"code": e.code, "message": e.message}
+            if e.data is not None:
+                response["error"]["data"] = e.data
+        except (KeyError, TypeError, ValueError) as e:
+            response["error"] = {"code": -32602, "message": f"Invalid params: {e}"}
+        return response
+
+    def _register_class(self, address: int, abi: list[dict[str, Any]]) -> None:
+        class_hash = _hash(json.dumps(abi, sort_keys=True))
+        self._classes[class_hash] = abi
+        self._class_hashes[address] = class_hash
+
+    # Blocks
+
+    async def _produce_blocks(self) -> None:
+        while True:
+            await asyncio.sleep(self.block_time)
+            self._new_block()
+
+    def _new_block(self) -> None:
+        number = len(self.blocks)
+        parent_hash = self.blocks[-1].hash if self.blocks else 0
+        block = _Block(
+            number=number,
+            hash=_hash(f"block {number}"),
+            parent_hash=parent_hash,
+            timestamp=int(time.time()),
+            transactions=[],
+        )
+
+        for address, contract in self.contracts.items():
+            for keys, data in contract.emitted:
+                self._events.append({
+                    "from_address": hex(address),
+                    "keys": _hexes(keys),
+                    "data": _hexes(data),
+                    "block_hash": hex(block.hash),
+                    "block_number": block.number,
+                    "transaction_hash": hex(_hash(f"external {number}")),
+                })
+            contract.emitted.clear()
+
+        # Transactions of an account are included in the order of their nonces, without gaps.
+        for sender in {sender for sender, _ in self._pending}:
+            while (tx := self._pending.pop((sender, self.nonces[sender]), None)) is not None:
+                self.nonces[sender] += 1
+                self._execute(tx, block)
+                block.transactions.append(tx.hash)
+
+        self.blocks.append(block)
+
+    def _execute(self, tx: _Transaction, block: _Block) -> None:
+        tx.block_number = block.number
+        tx.l2_gas = L2_GAS_PER_TX + L2_GAS_PER_CALL * len(tx.calls)
+
+        if tx.l2_gas > tx.max_l2_gas:
+            tx.reverted = f"Insufficient max L2Gas: max amount {tx.max_l2_gas}, actual used {tx.l2_gas}"
+            return
+
+        snapshots = {address: c.snapshot() for address, c in self.contracts.items()}
+        try:
+            for to, selector, calldata in tx.calls:
+                contract = self._contract(to)
+                contract.execute(tx.sender, selector, calldata)
+                for keys, data in contract.emitted:
+                    tx.events.append({"from_address": hex(to), "keys": _hexes(keys), "data": _hexes(data)})
+                contract.emitted.clear()
+        except (ContractError, RpcError) as e:
+            for address, snapshot in snapshots.items():
+                self.contracts[address].restore(snapshot)
+                self.contracts[address].emitted.clear()
+            tx.reverted = str(e)
+            tx.events.clear()
+            return
+
+        for event in tx.events:
+            self._events.append({
+                **event,
+                "block_hash": hex(block.hash),
+                "block_number": block.number,
+                "transaction_hash": hex(tx.hash),
+            })
+
+    def _block(self, block_id: Any) -> _Block:
+        if block_id in (None, "latest", "pending", "pre_confirmed", "l1_accepted"):
+            return self.blocks[-1]
+        if "block_number" in block_id:
+            number = int(block_id["block_number"])
+            if 0 <= number < len(self.blocks):
+                return self.blocks[number]
+        elif "block_hash" in block_id:
+            block_hash = int(block_id["block_hash"], 16)
+            for block in self.blocks:
+                if block.hash == block_hash:
+                    return block
+        raise RpcError(24, "Block not found")
+
+    def _block_hash_and_number(self, params: dict[str, Any]) -> dict[str, Any]:
+        block = self.blocks[-1]
+        return {"block_hash": hex(block.hash), "block_number": block.number}
+
+    def _get_block_with_tx_hashes(self, params: dict[str, Any]) -> dict[str, Any]:
+        block = self._block(params.get("block_id"))
+        return {
+            "status": "ACCEPTED_ON_L2",
+            "block_hash": hex(block.hash),
+            "parent_hash": hex(block.parent_hash),
+            "block_number": block.number,
+            "new_root": hex(block.hash),
+            "timestamp": block.timestamp,
+            "sequencer_address": "0x1",
+            "l1_gas_price": _resource_price(L1_GAS_PRICE),
+            "l2_gas_price": _resource_price(L2_GAS_PRICE),
+            "l1_data_gas_price": _resource_price(L1_DATA_GAS_PRICE),
+            "l1_da_mode": "BLOB",
+            "starknet_version": "0.13.5",
+            "transactions": _hexes(block.transactions),
+        }
+
+    # Contracts
+
+    def _contract(self, address: int) -> MockContract:
+        contract = self.contracts.get(address)
+        if contract is None:
+            raise RpcError(20, "Contract not found")
+        return contract
+
+    def _get_nonce(self, params: dict[str, Any]) -> str:
+        address = int(params["contract_address"], 16)
+        nonce = self.nonces.get(address)
+        if nonce is None:
+            raise RpcError(20, "Contract not found")
+
+        if params.get("block_id") in ("pending", "pre_confirmed"):
+            while (address, nonce) in self._pending:
+                nonce += 1
+        return hex(nonce)
+
+    def _get_class_hash_at(self, params: dict[str, Any]) -> str:
+        class_hash = self._class_hashes.get(int(params["contract_address"], 16))
+        if class_hash is None:
+            raise RpcError(20, "Contract not found")
+        return hex(class_hash)
+
+    def _get_class(self, params: dict[str, Any]) -> dict[str, Any]:
+        abi = self._classes.get(int(params["class_hash"], 16))
+        if abi is None:
+            raise RpcError(28, "Class hash not found")
+
+        selectors = sorted(
+            get_selector_from_name(item["name"])
+            for entry in abi if entry["type"] == "interface"
+            for item in entry["items"]
+        )
+        return {
+            "sierra_program": ["0x1"],
+            "contract_class_version": "0.1.0",
+            "entry_points_by_type": {
+                "CONSTRUCTOR": [],
+                "EXTERNAL": [{"selector": hex(s), "function_idx": i} for i, s in enumerate(selectors)],
+                "L1_HANDLER": [],
+            },
+            "abi": json.dumps(abi),
+        }
+
+    def _get_class_at(self, params: dict[str, Any]) -> dict[str, Any]:
+        return self._get_class({"class_hash": self._get_class_hash_at(params)})
+
+    def _call(self, params: dict[str, Any]) -> list[str]:
+        request = params["request"]
+        contract = self._contract(int(request["contract_address"], 16))
+        emitted = len(contract.emitted)
+        try:
+            entrypoint, result = contract.execute(
+                0, int(request["entry_point_selector"], 16), [int(c, 16) for c in request["calldata"]]
+            )
+        except ContractError as e:
+            raise RpcError(40, "Contract error", {"revert_error": str(e)}) from e
+        finally:
+            # Calls don't change anything, events they would emit are dropped.
+            del contract.emitted[emitted:]
+
+        self.stats.calls[entrypoint.name] += 1
+        return _hexes(result)
+
+    # Transactions
+
+    def _parse_invoke(self, tx: dict[str, Any]) -> _Transaction:
+        sender = int(tx["sender_address"], 16)
+        if sender not in self.nonces:
+            raise RpcError(20, "Contract not found")
+
+        calldata = [int(c, 16) for c in tx["calldata"]]
+        calls: list[tuple[int, int, list[int]]] = []
+        # Calldata of `__execute__` of Cairo 1 accounts: count, then (to, selector, length, *data) per call.
+        i = 1
+        for _ in range(calldata[0]):
+            to, selector, length = calldata[i:i + 3]
+            calls.append((to, selector, calldata[i + 3:i + 3 + length]))
+            i += 3 + length
+
+        return _Transaction(
+            hash=_hash(json.dumps(tx, sort_keys=True)),
+            sender=sender,
+            nonce=int(tx["nonce"], 16),
+            calls=calls,
+            max_l2_gas=int(tx["resource_bounds"]["l2_gas"]["max_amount"], 16),
+        )
+
+    def _estimate_fee(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        estimates = []
+        for tx in params["request"]:
+            parsed = self._parse_invoke(tx)
+            l2_gas = L2_GAS_PER_TX + L2_GAS_PER_CALL * len(parsed.calls)
+            l1_data_gas = L1_DATA_GAS_PER_CALL * len(parsed.calls)
+            estimates.append({
+                "l1_gas_consumed": "0x0",
+                "l1_gas_price": hex(L1_GAS_PRICE),
+                "l2_gas_consumed": hex(l2_gas),
+                "l2_gas_price": hex(L2_GAS_PRICE),
+                "l1_data_gas_consumed": hex(l1_data_gas),
+                "l1_data_gas_price": hex(L1_DATA_GAS_PRICE),
+                "overall_fee": hex(l2_gas * L2_GAS_PRICE + l1_data_gas * L1_DATA_GAS_PRICE),
+                "unit": "FRI",
+            })
+        return estimates
+
+    def _add_invoke_transaction(self, params: dict[str, Any]) -> dict[str, str]:
+        tx = self._parse_invoke(params["invoke_transaction"])
+
+        nonce = self.nonces[tx.sender]
+        if not nonce <= tx.nonce < nonce + MAX_NONCE_GAP or (tx.sender, tx.nonce) in self._pending:
+            raise RpcError(
+                52,
+                "Invalid transaction nonce",
+                f"Invalid transaction nonce of contract at address {hex(tx.sender)}. "
+                f"Account nonce: {hex(nonce)}; got: {hex(tx.nonce)}.",
+            )
+        if tx.hash in self._transactions:
+            raise RpcError(59, "A transaction with the same hash already exists in the mempool")
+
+        for to, selector, _ in tx.calls:
+            contract = self.contracts.get(to)
+            entrypoint = contract.entrypoints.get(selector) if contract is not None else None
+            self.stats.invokes[entrypoint.name if entrypoint is not None else hex(selector)] += 1
+
+        self._transactions[tx.hash] = tx
+        self._pending[(tx.sender, tx.nonce)] = tx
+        return {"transaction_hash": hex(tx.hash)}
+
+    def _transaction(self, params: dict[str, Any]) -> _Transaction:
+        tx = self._transactions.get(int(params["transaction_hash"], 16))
+        if tx is None:
+            raise RpcError(29, "Transaction hash not found")
+        return tx
+
+    def _get_transaction_status(self, params: dict[str, Any]) -> dict[str, str]:
+        tx = self._transaction(params)
+        if tx.block_number is None:
+            return {"finality_status": "RECEIVED"}
+        return {
+            "finality_status": "ACCEPTED_ON_L2",
+            "execution_status": "REVERTED" if tx.reverted is not None else "SUCCEEDED",
+        }
+
+    def _get_transaction_receipt(self, params: dict[str, Any]) -> dict[str, Any]:
+        tx = self._transaction(params)
+        if tx.block_number is None:
+            # Pending receipts are not served, like by nodes without a pending block.
+            raise RpcError(29, "Transaction hash not found")
+
+        l1_data_gas = L1_DATA_GAS_PER_CALL * len(tx.calls)
+        receipt: dict[str, Any] = {
+            "type": "INVOKE",
+            "transaction_hash": hex(tx.hash),
+            "actual_fee": {"amount": hex(tx.l2_gas * L2_GAS_PRICE + l1_data_gas * L1_DATA_GAS_PRICE), "unit": "FRI"},
+            "execution_status": "REVERTED" if tx.reverted is not None else "SUCCEEDED",
+            "finality_status": "ACCEPTED_ON_L2",
+            "block_hash": hex(self.blocks[tx.block_number].hash),
+            "block_number": tx.block_number,
+            "messages_sent": [],
+            "events": [{k: v for k, v in e.items() if k in ("from_address", "keys", "data")} for e in tx.events],
+            "execution_resources": {"l1_gas": 0, "l1_data_gas": l1_data_gas, "l2_gas": tx.l2_gas},
+        }
+        if tx.reverted is not None:
+            receipt["revert_reason"] = tx.reverted
+        return receipt
+
+    def _get_events(self, params: dict[str, Any]) -> dict[str, Any]:
+        flt = params["filter"]
+        from_block = self._block(flt.get("from_block")).number if flt.get("from_block") is not None else 0
+        to_block = self._block(flt.get("to_block")).number
+        address = int(flt["address"], 16) if flt.get("address") is not None else None
+        keys = [{int(k, 16) for k in position} for position in flt.get("keys") or []]
+
+        matching = [
+            e for e in self._events
+            if from_block <= e["block_number"] <= to_block
+            and (address is None or int(e["from_address"], 16) == address)
+            and all(not k or int(key, 16) in k for k, key in zip(keys, e["keys"]))
+        ]
+
+        start = int(flt.get("continuation_token") or 0)
+        end = start + int(flt["chunk_size"])
+        response: dict[str, Any] = {"events": matching[start:end]}
+        if end < len(matching):
+            response["continuation_token"] = str(end)
+        return response
+
+
+def _hash(value: str) -> int:
+    # Any felt will do, it only needs to be unique.
+    return int.from_bytes(hashlib.sha256(value.encode()).digest(), "big") >> 6
+
+
+def _hexes(values: list[int]) -> list[str]:
+    return [hex(v) for v in values]
+
+
+def _resource_price(price: int) -> dict[str, str]:
+    return {"price_in_fri": hex(price), "price_in_wei": hex(price)}
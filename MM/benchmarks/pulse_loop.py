@@ -0,0 +1,221 @@
+'''
+End-to-end benchmark of the pulse loop: StarknetPlatform and SimpleMarketMaker, configured by
+a config, trading Remus on a local mock Starknet node (see `benchmarks.mock_starknet`), with
+a random walk of the fair price and random fills of the resting orders.
+
+Reports the latency of the pulse stages (spans) and the RPC requests the bot makes:
+
+    python -m benchmarks.pulse_loop [--cfg cfg/example_cfg.toml] [--pulses 2000] [--latency 0.005] [--block-time 1]
+'''
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict
+from decimal import Decimal
+
+from starknet_py.net.account.account import Account
+from starknet_py.net.full_node_client import FullNodeClient
+from starknet_py.net.models.chains import StarknetChainId
+from starknet_py.net.signer.key_pair import KeyPair
+
+from markets import get_starknet_market
+from cfg import load_config
+from marketmaking.marketmakers.simple_marketmaker import SimpleMarketMaker
+from marketmaking.orderchain.order_chain import OrderChain
+from marketmaking.reconciling import get_reconciler
+from monitoring import tracing
+from networking.http_session import close_http_sessions, configure_http_sessions, get_rpc_session
+from oracles.data_sources.data_source import DataSource
+from platforms.starknet.fee_model import FeeModel
+from platforms.starknet.nonce_manager import NonceManager
+from platforms.starknet.starknet_account import WAccount
+from platforms.starknet.starknet_platform import StarknetPlatform
+from signing import close_signing_service, configure_signing
+from state.state_fetcher import PollingStateFetcher
+from tx_builders import get_tx_builder
+from venues.remus.remus_market_configs import get_preloaded_remus_market_config
+
+from .mock_starknet import MockRemus, MockStarknetNode, RpcStats, deploy_venues
+
+ACCOUNT_ADDRESS = 0xB0B
+PRIVATE_KEY = 0xB0B5EC12E7
+
+
+class RandomWalkDataSource(DataSource):
+    '''
+    Fair price moving by `step` (relative) up or down with probability `volatility` on every `move`.
+    '''
+    def __init__(self, price: Decimal, step: Decimal, volatility: float, seed: int = 1) -> None:
+        self.price = price
+        self._step = step
+        self._volatility = volatility
+        self._rng = random.Random(seed)
+
+    def move(self) -> None:
+        if self._rng.random() < self._volatility:
+            self.price *= 1 + self._step * self._rng.choice((-1, 1))
+
+    async def get_price(self) -> Decimal:
+        return self.price
+
+
+def fill_random_order(remus: MockRemus, rng: random.Random) -> None:
+    if remus.orders:
+        order_id = rng.choice(list(remus.orders))
+        remus.fill(order_id, remus.orders[order_id]["amount_remaining"] // 2 or 1)
+
+
+def percentile(values: list[float], q: float) -> float:
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def print_report(pulses: int, errors: int, elapsed: float, stages: dict[str, list[float]], stats: RpcStats) -> None:
+    print(f"Pulses: {pulses} in {elapsed:.2f} s ({pulses / elapsed:.1f}/s), {errors} failed")
+
+    print("\nStage latency (ms)")
+    print(f"{'stage':<48}{'count':>8}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for stage, durations in sorted(stages.items(), key=lambda s: -sum(s[1])):
+        durations.sort()
+        print(
+            f"{stage:<48}{len(durations):>8}{1000 * sum(durations) / len(durations):>10.2f}"
+            f"{1000 * percentile(durations, 0.5):>10.2f}{1000 * percentile(durations, 0.95):>10.2f}"
+            f"{1000 * percentile(durations, 0.99):>10.2f}{1000 * durations[-1]:>10.2f}"
+        )
+
+    print(f"\nRPC: {stats.http_requests} HTTP requests ({stats.http_requests / pulses:.2f}/pulse), {stats.batches} batches")
+    for title, counter in (("methods", stats.methods), ("view calls", stats.calls), ("invoked calls", stats.invokes)):
+        print(f"\n{title:<40}{'total':>8}{'/pulse':>10}")
+        for name, count in counter.most_common():
+            print(f"{name:<40}{count:>8}{count / pulses:>10.2f}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    cfg = load_config(args.cfg)
+    platform_cfg = cfg.platform.config
+
+    market_cfg = get_preloaded_remus_market_config(cfg.market.market_id)
+    if cfg.market.venue != "remus" or market_cfg is None:
+        raise ValueError("The benchmark trades only preloaded Remus markets")
+
+    node = MockStarknetNode(latency=args.latency, block_time=args.block_time)
+    remus, _ = deploy_venues(node, ACCOUNT_ADDRESS, balances={
+        market_cfg.base_token.address: int(Decimal(args.base) * 10**market_cfg.base_token.decimals),
+        market_cfg.quote_token.address: int(Decimal(args.quote) * 10**market_cfg.quote_token.decimals),
+    })
+    await node.start()
+
+    configure_http_sessions(cfg.http)
+    configure_signing(cfg.signing)
+
+    stages: dict[str, list[float]] = defaultdict(list)
+    errors = 0
+    try:
+        client = FullNodeClient(node_url=node.url, session=get_rpc_session(node.url))
+        account = Account(
+            client=client,
+            address=ACCOUNT_ADDRESS,
+            key_pair=KeyPair.from_private_key(PRIVATE_KEY),
+            chain=StarknetChainId.MAINNET,
+        )
+        w_account = WAccount(
+            account=account,
+            fee_model=FeeModel(account=account),
+            nonce_manager=NonceManager(
+                account=account,
+                max_in_flight=platform_cfg.max_in_flight_transactions,
+                check_interval=args.block_time / 4,
+            ),
+        )
+
+        market = await get_starknet_market(
+            cfg.market.venue,
+            account=w_account,
+            market_id=cfg.market.market_id,
+            order_tracking=args.order_tracking or cfg.market.order_tracking,
+        )
+        if args.tx_builder is not None:
+            tx_builder = get_tx_builder(args.tx_builder, market)
+        else:
+            tx_builder = get_tx_builder(platform_cfg.tx_builder.name, market, platform_cfg.tx_builder.args)
+        platform = StarknetPlatform(w_account=w_account, market=market, tx_builder=tx_builder)
+        await platform.initialize_trading()
+
+        data_source = RandomWalkDataSource(
+            price=Decimal(args.price), step=Decimal(args.step), volatility=args.volatility
+        )
+        state_fetcher = PollingStateFetcher(
+            market=platform.market,  # type: ignore
+            fair_price_fetcher=data_source,
+            inflight=platform.inflight_tracker,
+            reader=platform.reader,
+            pin_block=platform_cfg.pin_state_to_block,
+            fee_model=platform.account.fee_model,
+        )
+        market_maker = SimpleMarketMaker(
+            order_reconciler=get_reconciler(cfg.reconciler),
+            order_chain=OrderChain.from_config(cfg.order_chain),
+        )
+
+        # Only the pulses are measured, not the setup.
+        node.stats.reset()
+        tracing.add_span_listener(lambda stage, duration: stages[stage].append(duration))
+        rng = random.Random(2)
+
+        start = time.perf_counter()
+        for _ in range(args.pulses):
+            data_source.move()
+            if rng.random() < args.fill_probability:
+                fill_random_order(remus, rng)
+
+            tracing.start_pulse()
+            try:
+                with tracing.span("pulse"):
+                    with tracing.span("state_fetch"):
+                        state = await state_fetcher.get_state()
+                    with tracing.span("strategy"):
+                        prologue, reconciled_orders = await market_maker.pulse(state=state)
+                    with tracing.span("execute"):
+                        await platform.execute_operations(state=state, prologue=prologue, ops=reconciled_orders)
+            except Exception as e:
+                errors += 1
+                if not await platform.error_handled(e):
+                    print(f"Pulse failed: {e}")
+        elapsed = time.perf_counter() - start
+
+        # Transactions still in flight (eg. of the pipelined tx builder) settle before the node stops.
+        await w_account.nonces.wait_all()
+        if platform.inflight_tracker is not None:
+            await platform.inflight_tracker.wait_all()
+
+        print_report(args.pulses, errors, elapsed, stages, node.stats)
+    finally:
+        await close_http_sessions()
+        close_signing_service()
+        await node.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cfg", type=str, default="cfg/example_cfg.toml")
+    parser.add_argument("--pulses", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.005, help="Seconds before the node answers a request.")
+    parser.add_argument("--block-time", type=float, default=1.0)
+    parser.add_argument("--tx-builder", type=str, default=None, help="Overrides the tx builder of the config.")
+    parser.add_argument("--order-tracking", type=str, default=None, help="Overrides the order tracking of the config.")
+    parser.add_argument("--base", type=str, default="10000", help="Initial balance of the base token.")
+    parser.add_argument("--quote", type=str, default="5000", help="Initial balance of the quote token.")
+    parser.add_argument("--price", type=str, default="0.5")
+    parser.add_argument("--step", type=str, default="0.001", help="Relative move of the fair price.")
+    parser.add_argument("--volatility", type=float, default=0.1, help="Probability the fair price moves in a pulse.")
+    parser.add_argument("--fill-probability", type=float, default=0.02)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
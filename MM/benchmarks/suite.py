@@ -0,0 +1,381 @@
+'''
+Micro-benchmark suite of the CPU hot path of a pulse: the order chain elements, the reconcilers,
+sorting of open orders, normalization of Ekubo orders and building of Remus calldata, on synthetic
+states with ladders of 1 to 1000 orders per side. Runs offline.
+
+Results are written as JSON, so that they can be kept as a baseline and compared on another commit
+(on the same machine). Cases slower than the baseline by more than the threshold are reported
+as regressions and the command exits with status 1:
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --baseline baseline.json [--threshold 0.15] [--filter reconcile]
+'''
+
+import argparse
+import json
+import logging
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import partial
+from typing import Any, Callable
+
+from starknet_py.contract import Contract
+from starknet_py.net.account.account import Account
+from starknet_py.net.client_models import Call
+from starknet_py.net.full_node_client import FullNodeClient
+from starknet_py.net.models.chains import StarknetChainId
+from starknet_py.net.signer.key_pair import KeyPair
+
+# Imported before the venues, which can't be imported first because of an import cycle.
+import markets  # noqa: F401
+from marketmaking.order import AllOrders, BasicOrder, DesiredOrders, FutureOrder, OpenOrders, OrderGrid, TerminalOrders
+from marketmaking.orderchain.elements.element import OrderChainElement
+from marketmaking.orderchain.elements.fixed_params_element import FixedParamsElement
+from marketmaking.orderchain.elements.min_max_relative_distance_element import MinMaxRelativeDistanceElement
+from marketmaking.orderchain.elements.remove_orders_on_low_inventory_element import RemoveOrdersOnLowInventoryElement
+from marketmaking.orderchain.elements.skew_fair_price_on_position_element import SkewFairPriceOnPositionElement
+from marketmaking.orderchain.order_chain import OrderChain
+from marketmaking.reconciling.always_replace_reconciler import AlwaysReplaceOrderReconciler
+from marketmaking.reconciling.matching_reconciler import MatchingOrderReconciler
+from marketmaking.reconciling.tolerance_reconciler import ToleranceOrderReconciler
+from state.account_state import AccountState, PositionInfo
+from state.state import State
+from venues.ekubo.ekubo_market_configs import STRK_USDC_LIMIT_MC, EkuboMarketConfig
+from venues.ekubo.ekubo_math import price_to_tick, tick_to_price
+from venues.ekubo.ekubo_utils import _get_basic_orders
+from venues.remus.remus import REMUS_ADDRESS, RemusDexClient
+from venues.remus.remus_market_configs import STRK_USDC_MC, RemusMarketConfig
+
+from .mock_starknet.abis import REMUS_ABI
+
+FORMAT_VERSION = 1
+SIZES = (1, 10, 100, 1000)
+
+FAIR_PRICE = Decimal("0.5")
+# Distance of the best order from the fair price and between the orders of a ladder.
+FIRST_LEVEL = Decimal("0.005")
+LEVEL_STEP = Decimal("0.0005")
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    # Orders per side, or items processed per run.
+    size: int
+    run: Callable[[], object]
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]"
+
+
+def ladder(size: int, side: str) -> list[FutureOrder]:
+    sign = -1 if side.lower() == "bid" else 1
+    return [
+        FutureOrder(
+            order_side=side,
+            amount=Decimal(2 + i % 3),
+            price=FAIR_PRICE * (1 + sign * (FIRST_LEVEL + LEVEL_STEP * i)),
+            platform="Starknet",
+            venue="Remus",
+        )
+        for i in range(size)
+    ]
+
+
+def desired_orders(size: int) -> DesiredOrders:
+    # Sides as the order chain names them, the venue names them "Bid" and "Ask".
+    return DesiredOrders(bids=ladder(size, "bid"), asks=ladder(size, "ask"))
+
+
+def open_orders(size: int) -> list[BasicOrder]:
+    '''
+    Ladders of resting orders, every other of them off the desired one by a fifth of a level,
+    so that reconcilers keep some and replace the others.
+    '''
+    orders: list[BasicOrder] = []
+    for side in ("Bid", "Ask"):
+        for i, desired in enumerate(ladder(size, side)):
+            price = desired.price if i % 2 else desired.price * (1 + LEVEL_STEP / 5)
+            orders.append(BasicOrder(
+                price=price,
+                amount=desired.amount,
+                amount_remaining=desired.amount,
+                order_id=len(orders) + 1,
+                market_id=STRK_USDC_MC.market_id,
+                order_side=side,
+                entry_time=0,
+                venue="Remus",
+            ))
+    return orders
+
+
+def state(size: int) -> State:
+    position = PositionInfo.empty()
+    # Enough for about half of the ladder, so that inventory checks remove some orders.
+    position.balance_base = Decimal(size * 3) / 2
+    position.balance_quote = FAIR_PRICE * size * 3 / 2
+    return State(
+        account=AccountState(
+            position=position,
+            orders=AllOrders(active=OpenOrders.from_list(open_orders(size)), terminal=TerminalOrders([], [])),
+        ),
+        _fair_price=FAIR_PRICE,
+    )
+
+
+def ekubo_orders(size: int) -> tuple[list[dict[str, Any]], list[OrderedDict[str, Any]]]:
+    '''
+    Orders as returned by the Ekubo API and the matching on-chain infos of the Positions contract.
+    Asks sit on ticks divisible by double the tick spacing, bids between them.
+    '''
+    cfg = STRK_USDC_LIMIT_MC
+    spacing = cfg.tick_spacing
+    first_tick = price_to_tick(FAIR_PRICE, cfg.base_token.decimals, cfg.quote_token.decimals)
+    first_tick -= first_tick % (2 * spacing)
+
+    api_orders: list[dict[str, Any]] = []
+    onchain_orders: list[OrderedDict[str, Any]] = []
+    for i in range(size):
+        for tick in (first_tick + 2 * spacing * (i + 1), first_tick - 2 * spacing * i - spacing):
+            amount = 10**18 if tick % (2 * spacing) == 0 else 10**6
+            api_orders.append({
+                "token_id": len(api_orders) + 1,
+                "orders": [{"key": {"tick": tick}, "amount": str(amount)}],
+            })
+            onchain_orders.append(OrderedDict(executed=False, amount0=amount // 2, amount1=amount // 2))
+    return api_orders, onchain_orders
+
+
+def remus_client() -> RemusDexClient:
+    # The account is needed only to prepare invokes, nothing is sent.
+    account = Account(
+        address=0x1,
+        client=FullNodeClient(node_url="http://127.0.0.1:1"),
+        key_pair=KeyPair.from_private_key(0x1),
+        chain=StarknetChainId.MAINNET,
+    )
+    contract = Contract(address=REMUS_ADDRESS, abi=REMUS_ABI, provider=account, cairo_version=1)
+    return RemusDexClient(contract=contract)
+
+
+def ticks_to_prices(ticks: list[Decimal], cfg: EkuboMarketConfig) -> list[Decimal]:
+    return [tick_to_price(tick, cfg.base_token.decimals, cfg.quote_token.decimals) for tick in ticks]
+
+
+def snap_copy(orders: DesiredOrders, grid: OrderGrid) -> DesiredOrders:
+    # Snapping is in place, the copies of the lists keep the original orders for the next run.
+    copy = DesiredOrders(bids=list(orders.bids), asks=list(orders.asks))
+    copy.snap(grid)
+    return copy
+
+
+def submit_order_calls(client: RemusDexClient, orders: list[FutureOrder], cfg: RemusMarketConfig) -> list[Call]:
+    return [client.prep_submit_maker_order_call(order, cfg) for order in orders]
+
+
+def element_case(element: OrderChainElement, size: int) -> Case:
+    s = state(size)
+    # Elements rebuild the desired orders, except for sorting them in place, so the input is reused.
+    orders = desired_orders(size)
+
+    def run() -> object:
+        # The skew element moves the fair price of the state.
+        s._fair_price = FAIR_PRICE
+        return element.process(state=s, orders=orders)
+
+    return Case(f"orderchain.{element.__class__.__name__}", size, run)
+
+
+def build_cases(sizes: tuple[int, ...]) -> list[Case]:
+    cases: list[Case] = []
+
+    elements: list[OrderChainElement] = [
+        SkewFairPriceOnPositionElement(bias=Decimal("0.005"), max_skew=Decimal("0.002")),
+        FixedParamsElement(target_relative_distance_from_fp=FIRST_LEVEL, order_size_quote=Decimal(1)),
+        MinMaxRelativeDistanceElement(
+            max_relative_distance_from_fp=Decimal("0.075"), min_relative_distance_from_fp=Decimal("0.0005")
+        ),
+        RemoveOrdersOnLowInventoryElement(),
+    ]
+    chain = OrderChain(elements)
+    tolerance = ToleranceOrderReconciler(
+        relative_price_tolerance=Decimal("0.0002"), relative_quantity_tolerance=Decimal("0.01")
+    )
+    matching = MatchingOrderReconciler(
+        relative_price_tolerance=Decimal("0.0002"), relative_quantity_tolerance=Decimal("0.01")
+    )
+    always_replace = AlwaysReplaceOrderReconciler()
+    client = remus_client()
+    cfg = STRK_USDC_MC
+    ekubo_cfg = STRK_USDC_LIMIT_MC
+
+    for size in sizes:
+        cases.extend(element_case(element, size) for element in elements)
+
+        chain_state = state(size)
+
+        def process(s: State = chain_state) -> object:
+            s._fair_price = FAIR_PRICE
+            return chain.process(s)
+
+        # The chain generates its own orders, `size` orders per side rest on the venue.
+        cases.append(Case("OrderChain.process", size, process))
+
+        s = state(size)
+        desired = desired_orders(size)
+        cases.append(Case(
+            "ToleranceOrderReconciler.reconcile",
+            size,
+            partial(tolerance.reconcile, s, s.account.orders.active, desired),
+        ))
+        cases.append(Case(
+            "MatchingOrderReconciler.reconcile",
+            size,
+            partial(matching.reconcile, s, s.account.orders.active, desired),
+        ))
+        cases.append(Case(
+            "AlwaysReplaceOrderReconciler.reconcile",
+            size,
+            partial(always_replace.reconcile, s, s.account.orders.active, desired),
+        ))
+
+        orders = open_orders(size)
+        random.Random(size).shuffle(orders)
+        cases.append(Case("OpenOrders.from_list", size, partial(OpenOrders.from_list, orders)))
+
+        api_orders, onchain_orders = ekubo_orders(size)
+        cases.append(Case(
+            "ekubo_utils._get_basic_orders", size, partial(_get_basic_orders, api_orders, onchain_orders, ekubo_cfg)
+        ))
+
+        ticks = [Decimal(api_order["orders"][0]["key"]["tick"]) for api_order in api_orders[:size]]
+        cases.append(Case("ekubo_math.tick_to_price", size, partial(ticks_to_prices, ticks, ekubo_cfg)))
+
+        # Bids and asks alternate, like in the ladders the tx builders build.
+        future_orders = [o for pair in zip(ladder(size, "Bid"), ladder(size, "Ask")) for o in pair][:size]
+        cases.append(Case("DesiredOrders.snap", size, partial(snap_copy, desired, cfg.grid)))
+
+        # The order chain snaps the orders to the grid of the market before they are submitted.
+        snapped_orders = [cfg.grid.snap(o) for o in future_orders]
+        cases.append(Case(
+            "RemusDexClient.prep_submit_maker_order_call",
+            size,
+            partial(submit_order_calls, client, snapped_orders, cfg),
+        ))
+
+    return cases
+
+
+def measure(run: Callable[[], object], min_time: float, repeat: int) -> tuple[float, int]:
+    '''
+    Returns the best time of a run out of `repeat` repeats, each of them running long enough
+    (at least `min_time` seconds) to be measured reliably, and the number of runs of a repeat.
+    '''
+    timer = timeit.Timer(run)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            break
+        number *= 2
+    return min(timer.repeat(repeat=repeat, number=number)) / number, number
+
+
+def environment() -> dict[str, str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(
+    baseline: dict[str, Any], results: dict[str, dict[str, float]], threshold: float
+) -> list[str]:
+    '''
+    Prints the changes against the baseline, returns keys of the cases slower by more than `threshold`.
+    '''
+    baseline_results: dict[str, dict[str, float]] = baseline["results"]
+    regressions = []
+
+    print(f"\nCompared to {baseline['environment']['commit']} (threshold {threshold:.0%}):")
+    print(f"{'case':<56}{'baseline us':>14}{'current us':>14}{'change':>10}")
+    for key, result in results.items():
+        if key not in baseline_results:
+            print(f"{key:<56}{'-':>14}{result['seconds'] * 1e6:>14.2f}{'new':>10}")
+            continue
+
+        before = baseline_results[key]["seconds"]
+        change = result["seconds"] / before - 1
+        regressed = change > threshold
+        if regressed:
+            regressions.append(key)
+        print(
+            f"{key:<56}{before * 1e6:>14.2f}{result['seconds'] * 1e6:>14.2f}{change:>+10.1%}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="Orders per side")
+    parser.add_argument("--filter", type=str, default=None, help="Runs only the cases containing this")
+    parser.add_argument("--min-time", type=float, default=0.1, help="Minimal seconds of a repeat")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=str, default=None, help="Writes the results as JSON to this file")
+    parser.add_argument("--baseline", type=str, default=None, help="Compares the results to this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("version") != FORMAT_VERSION:
+            sys.exit(f"Unsupported baseline version {baseline.get('version')}")
+
+    cases = [c for c in build_cases(tuple(args.sizes)) if args.filter is None or args.filter in c.key]
+
+    results: dict[str, dict[str, float]] = {}
+    print(f"{'case':<56}{'us/run':>14}{'us/order':>12}{'runs':>10}")
+    for case in cases:
+        seconds, number = measure(case.run, args.min_time, args.repeat)
+        results[case.key] = {"seconds": seconds, "size": case.size}
+        print(f"{case.key:<56}{seconds * 1e6:>14.2f}{seconds * 1e6 / case.size:>12.3f}{number:>10}")
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump({"version": FORMAT_VERSION, "environment": environment(), "results": results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(baseline, results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
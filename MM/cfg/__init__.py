@@ -1,3 +1,6 @@
+import copy
+from typing import Any
+
 import tomli
 from .cfg_classes import (
     PriceSourceConfig,
@@ -5,7 +8,11 @@ from .cfg_classes import (
     OrderChainElementConfig,
     ReconcilerConfig,
     StrategyConfig,
-    PlatformConfig
+    PlatformConfig,
+    SchedulerConfig,
+    HttpConfig,
+    SigningConfig,
+    OrchestratorConfig,
 )
 
 from .starknet_platform_cfg import StarknetPlatformConfig
@@ -22,6 +29,52 @@ def load_config(path: str) -> StrategyConfig:
     with open(path, "rb") as f:
         raw = tomli.load(f)
 
+    return _parse_strategy_config(raw)
+
+
+def load_orchestrator_config(path: str) -> OrchestratorConfig:
+    '''
+    Loads the configuration of multiple strategy instances from a TOML file.
+
+    Each instance is configured by its own `[instances.<name>]` section, which holds the same
+    sections as the config of a single strategy (`market`, `price_source`, `orderchain`...).
+    Strategy sections at the top level are defaults shared by all instances, which override
+    them key by key (eg. the `platform` with the account is usually configured only once).
+    `[orchestrator]`, `[http]` and `[signing]` sections configure the process itself.
+    '''
+    with open(path, "rb") as f:
+        raw = tomli.load(f)
+
+    raw_instances = raw.pop("instances", None)
+    if not raw_instances:
+        raise ConfigError("No `instances` config found")
+
+    orchestrator = raw.pop("orchestrator", {})
+    http = HttpConfig(**raw.get("http", {}))
+    signing = SigningConfig(**raw.get("signing", {}))
+
+    instances: dict[str, StrategyConfig] = {}
+    for name, raw_instance in raw_instances.items():
+        try:
+            instances[name] = _parse_strategy_config(_merge(raw, raw_instance))
+        except ConfigError as e:
+            raise ConfigError(f"Instance `{name}`: {e}") from e
+
+    return OrchestratorConfig(instances=instances, http=http, signing=signing, **orchestrator)
+
+
+def _merge(defaults: dict[str, Any], overrides: dict[str, Any]) -> dict[str, Any]:
+    # Tables are merged recursively, any other value (including arrays) is replaced.
+    merged = copy.deepcopy(defaults)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def _parse_strategy_config(raw: dict[str, Any]) -> StrategyConfig:
     if "platform" not in raw: 
         raise ConfigError("No `platform` config found")
 
@@ -46,12 +99,24 @@ def load_config(path: str) -> StrategyConfig:
         raise ConfigError("No `reconciler` config found")
     reconciler = ReconcilerConfig.from_dict(raw["reconciler"])
 
+    # Without explicit scheduler config pulse every 10 seconds
+    if "scheduler" in raw:
+        scheduler = SchedulerConfig.from_dict(raw["scheduler"])
+    else:
+        scheduler = SchedulerConfig(name="fixed_interval", args={})
+
+    http = HttpConfig(**raw.get("http", {}))
+    signing = SigningConfig(**raw.get("signing", {}))
+
     cfg = StrategyConfig(
         platform=platform,
         price_source=price, 
         market = venue,
         order_chain=orderchain, 
         reconciler=reconciler,
+        scheduler=scheduler,
+        http=http,
+        signing=signing,
     )
 
     return cfg
@@ -1,4 +1,5 @@
 from decimal import Decimal
+from typing import Literal
 
 from pydantic import BaseModel
 
@@ -10,14 +11,20 @@ class VenueConfig(BaseModel):
     '''
     venue: str
     market_id: int
+    # How the orders are kept up to date: "polling" reads all of them on every pulse,
+    # "events" reads them only when on-chain events reveal a change (Remus only).
+    order_tracking: str = "polling"
 
 class PriceSourceConfig(BaseModel):
     '''
     Holds the configuration for the price source.
+    `sources` and `args` are used only by the `aggregated` price source.
     '''
     base_asset: str
     quote_asset: str
     price_source: str
+    sources: list[str] = []
+    args: dict[str, Decimal | int | str] = {}
 
 
 class OrderChainElementConfig(BaseModel):
@@ -48,10 +55,49 @@ class ReconcilerConfig(BaseModel):
         return ReconcilerConfig(name=str(name), args=d)
 
 
+class SchedulerConfig(BaseModel):
+    '''
+    Holds the configuration for the pulse scheduler.
+    '''
+    name: str
+    args: dict[str, Decimal | int | bool]
+
+    @staticmethod
+    def from_dict(d: dict[str, int | Decimal | bool]) -> "SchedulerConfig":
+        name = d["name"]
+        del d["name"]
+        return SchedulerConfig(name=str(name), args=d)
+
+
 class PlatformConfig(BaseModel):
     name: str
     config: StarknetPlatformConfig
 
+
+class HttpConfig(BaseModel):
+    '''
+    Holds the configuration for the shared HTTP sessions (timeouts are in seconds).
+    '''
+    timeout: Decimal = Decimal(5)
+    connect_timeout: Decimal = Decimal(3)
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: Decimal = Decimal(60)
+    max_connections_per_host: int = 10
+    retries: int = 2
+    retry_backoff: Decimal = Decimal("0.2")
+    http2: bool = True
+
+
+class SigningConfig(BaseModel):
+    '''
+    Holds the configuration for the pool signing transactions and orders off the event loop.
+    '''
+    # "thread" or "process", the functions signed in a process pool have to be picklable.
+    executor: Literal["thread", "process"] = "thread"
+    max_workers: int = 4
+
+
 class StrategyConfig(BaseModel):
     '''
     Holds the configuration for the trading strategy.
@@ -61,3 +107,25 @@ class StrategyConfig(BaseModel):
     price_source: PriceSourceConfig
     order_chain: list[OrderChainElementConfig]
     reconciler: ReconcilerConfig
+    scheduler: SchedulerConfig
+    http: HttpConfig = HttpConfig()
+    signing: SigningConfig = SigningConfig()
+
+
+class OrchestratorConfig(BaseModel):
+    '''
+    Holds the configuration for running multiple strategy instances in a single process.
+    '''
+    instances: dict[str, StrategyConfig]
+    http: HttpConfig = HttpConfig()
+    signing: SigningConfig = SigningConfig()
+    metrics_port: int = 8000
+    # Seconds to wait before a failed instance is started again.
+    restart_delay: Decimal = Decimal(10)
+    # Number of worker processes the instances are spread across, 1 runs them all in this process
+    # and 0 uses as many as there are CPUs. Instances of one account always share a process.
+    shards: int = 1
+    # With multiple shards, fair prices are fetched once and published to the shards this often.
+    price_publish_interval: Decimal = Decimal("0.25")
+    # Shards treat published prices older than this (in seconds) as unavailable.
+    max_price_age: Decimal = Decimal(10)
@@ -1,4 +1,5 @@
 import os
+from decimal import Decimal
 from pydantic import BaseModel
 
 
@@ -40,7 +41,28 @@ class StarknetTxBuilderConfig(BaseModel):
     Holds the configuration for the tx builder.
     '''
     name: str
+    args: dict[str, int | bool] = {}
+
+class StarknetFeeConfig(BaseModel):
+    '''
+    Holds the configuration of the transaction fees (see `FeeModel`).
+    '''
+    # Multipliers of the estimated gas amounts and of the gas prices.
+    amount_margin: Decimal = Decimal("1.5")
+    price_margin: Decimal = Decimal("1.5")
+    # Seconds after which the cached estimate of a call shape is refreshed.
+    estimate_ttl: float = 300
+    # Gas prices are sampled every `price_refresh_interval` seconds, max of last `price_window` is used.
+    price_refresh_interval: float = 10
+    price_window: int = 10
 
 class StarknetPlatformConfig(BaseModel):
     account: StarknetAccountConfig
-    tx_builder: StarknetTxBuilderConfig
\ No newline at end of file
+    tx_builder: StarknetTxBuilderConfig
+    fee: StarknetFeeConfig = StarknetFeeConfig()
+    # Max number of transactions of the account that are sent and not confirmed at the same time.
+    max_in_flight_transactions: int = 8
+    # Directory where contract ABIs are cached by class hash, None to keep them only in memory.
+    abi_cache_dir: str | None = ".abi_cache"
+    # Pin all the reads of a state fetch to the latest block instead of the pending one.
+    pin_state_to_block: bool = False
\ No newline at end of file
@@ -1,55 +1,21 @@
 """
-This script is able to manage single Remus market and single account, even thought the MarketMaker
-is build for multiple markets and multiple accounts.
+This script runs a single strategy, ie. a single market traded by a single account, defined by cfg.
 
-Other "deploy scripts" that are yet to be created will be able to manage multiple markets and
-multiple accounts.
+To run multiple markets and multiple accounts in one process, use `orchestrate.py`.
 """
 
-import time
 import asyncio
 import logging
-import sys
 import pprint
 
 
-from state.state_fetcher import PollingStateFetcher
-from platforms.starknet.starknet_platform import StarknetPlatform
-from marketmaking.orderchain.order_chain import OrderChain
-from marketmaking.reconciling import get_reconciler
-from oracles.data_sources import get_data_source
-from marketmaking.order import BasicOrder
-from marketmaking.marketmakers.simple_marketmaker import SimpleMarketMaker
+from orchestration import SharedResources, StrategyInstance
 from cfg import load_config
 from args import parse_args
 from monitoring import metrics
-
-
-def setup_logging(log_level: str) -> None:
-    """Configures logging for the application."""
-    log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    logging.basicConfig(
-        filename="marketmaker.log", filemode="a", level=logging.INFO, format=log_format
-    )
-    logging.getLogger("httpx").setLevel(logging.ERROR)
-    console = logging.StreamHandler(sys.stdout)
-    console.setLevel(logging.INFO)
-    console.setFormatter(logging.Formatter(log_format))
-
-    # Attach to root logger
-    logging.getLogger().addHandler(console)
-    logging.getLogger().addHandler(metrics.PrometheusMetricsErrorHandler())
-
-
-
-
-def pretty_print_orders(asks: list[BasicOrder], bids: list[BasicOrder]) -> None:
-    logging.info("PRETTY PRINTED CURRENT ORDERS.")
-    for ask in sorted(asks, key=lambda x: -x.price):
-        logging.info("\t\t%s; %s", ask.price, ask.amount_remaining)
-    logging.info("XXX")
-    for bid in sorted(bids, key=lambda x: -x.price):
-        logging.info("\t\t%s; %s", bid.price, bid.amount_remaining)
+from monitoring.logs import setup_logging
+from networking.http_session import configure_http_sessions, close_http_sessions
+from signing import configure_signing, close_signing_service
 
 
 async def main() -> None:
@@ -64,60 +30,22 @@ async def main() -> None:
 
     logging.info(f"Loaded config:\n {pprint.pformat(dict(cfg))}")
 
-    order_chain = OrderChain.from_config(cfg.order_chain)
-
-    reconciler = get_reconciler(cfg.reconciler)
-
-    platform = await StarknetPlatform.from_config(cfg = cfg)
-
-    data_source = get_data_source(
-        cfg.price_source.price_source, cfg.price_source.base_asset, cfg.price_source.quote_asset
-    )   
-    # TODO: Remove type ignore
-    state_fetcher = PollingStateFetcher(
-        market=platform._market, # type: ignore 
-        fair_price_fetcher=data_source
-    )
-    
-    market_maker = SimpleMarketMaker(
-        order_reconciler=reconciler,
-        order_chain=order_chain,
-    )
-
-    await platform.initialize_trading()
-
-    while True:
-        loop_start_time = time.time()
-        try:
-
-            state = await state_fetcher.get_state()
-
-            metrics.track_state_update_time(time.time() - loop_start_time)
-
-            logging.info("My current orders: %s", state.account.orders)
-            logging.info("Fair price queried: %s.", state.fair_price)
-            logging.info("Current position: %s", state.account.position)
-
-            metrics.track_position(state.account.position)
-
-            pretty_print_orders(
-                state.account.orders.active.asks, state.account.orders.active.bids
-            )
-
-            prologue, reconciled_orders = await market_maker.pulse(state=state)
-            
-            await platform.execute_operations(state = state, prologue=prologue, ops = reconciled_orders)
+    configure_http_sessions(cfg.http)
+    configure_signing(cfg.signing)
 
-        except Exception as e:
+    resources = SharedResources()
+    instance = StrategyInstance(name=metrics.DEFAULT_INSTANCE, cfg=cfg, resources=resources)
 
-            if not await platform.error_handled(e):
-                logging.error("Unhandled error occurred: %s", str(e), exc_info=True)
+    try:
+        await instance.build()
 
-            await asyncio.sleep(5)
+        await instance.platform.initialize_trading()
 
-        metrics.track_loop_time(time.time() - loop_start_time)
-        logging.info("Sleeping for 10 seconds before next pulse...")
-        await asyncio.sleep(10)
+        await instance.run()
+    finally:
+        await resources.close()
+        await close_http_sessions()
+        close_signing_service()
 
 
 # Run the main function
@@ -1,7 +1,7 @@
 from decimal import Decimal
 import logging
 
-from monitoring import metrics
+from monitoring import metrics, tracing
 from markets.market import PrologueOps, PrologueOp_SeekLiquidity
 from marketmaking.orderchain.order_chain import OrderChain
 from marketmaking.reconciling.order_reconciler import OrderReconciler, ReconciledOrders
@@ -35,11 +35,12 @@ class SimpleMarketMaker:
         
         desired_orders = self.order_chain.process(state)
 
-        reconciled = self.order_reconciler.reconcile(
-            existing_orders=state.account.orders.active, 
-            state=state, 
-            desired_orders=desired_orders
-        )
+        with tracing.span("reconciler"):
+            reconciled = self.order_reconciler.reconcile(
+                existing_orders=state.account.orders.active, 
+                state=state, 
+                desired_orders=desired_orders
+            )
 
         metrics.track_quoted_info(
             orders = reconciled,
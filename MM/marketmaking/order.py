@@ -1,12 +1,18 @@
-from dataclasses import dataclass
-from decimal import Decimal
+import math
+from dataclasses import dataclass, field
+from decimal import ROUND_CEILING, Decimal
 
 
-@dataclass(frozen=True)
+# Not frozen, as frozen dataclasses are several times slower to construct and orders are
+# constructed on every pulse, which adds up in backtests. Don't modify them, use `replace`.
+@dataclass(slots=True)
 class BasicOrder:
     """
     Simple class representing on-chain order.
     All values are expected to be in "human-readable" form.
+
+    On venues with an `OrderGrid`, `price_ticks` and `amount_lots` hold the exact price and amount
+    of the order in the venue's units, `price` and `amount` are their human-readable views.
     """
 
     price: Decimal
@@ -21,16 +27,22 @@ class BasicOrder:
 
     venue: str
 
+    price_ticks: int | None = None
+    amount_lots: int | None = None
+
     # TODO: Add info regarding instruments here too, or use InstrumentAmount
 
     def is_bid(self) -> bool:
         return self.order_side.lower() == "bid"
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True)
 class FutureOrder:
     """
     Class representing an order that will be sent to the chain. Should always be in human-readable form
+
+    Once snapped to an `OrderGrid`, `price_ticks` and `amount_lots` hold the exact price and amount
+    in the venue's units, `price` and `amount` are their human-readable views.
     """
 
     order_side: str 
@@ -38,12 +50,15 @@ class FutureOrder:
     price: Decimal
     platform: str
     venue: str
+
+    price_ticks: int | None = None
+    amount_lots: int | None = None
     
     def is_bid(self) -> bool:
         return self.order_side.lower() == "bid"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OpenOrders:
     """
     Class that holds lists of bids and asks.
@@ -81,7 +96,7 @@ class OpenOrders:
 
         return OpenOrders(bids=bids, asks=asks)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TerminalOrders:
     '''
     Class that  holds lists of bids and asks.
@@ -120,6 +135,92 @@ class TerminalOrders:
 
         return TerminalOrders(bids=bids, asks=asks)
 
+@dataclass(frozen=True, slots=True)
+class OrderGrid:
+    """
+    Price and amount units of a venue: prices are multiples of `tick_size` and amounts multiples
+    of `lot_size`, both raw integers with `price_decimals` and `amount_decimals` decimals.
+
+    Converts human-readable prices and amounts to whole ticks and lots (rounding once, away from
+    the fair price for prices and down for amounts) and back, exactly.
+    """
+    price_decimals: int
+    tick_size: int
+    amount_decimals: int
+    lot_size: int
+
+    # Scales of human-readable prices and amounts to whole ticks and lots, if the tick and the lot
+    # are powers of ten (as usual), which saves the divisions. Prices and amounts of one tick and lot.
+    _ticks_scale: int | None = field(init=False, repr=False, compare=False)
+    _lots_scale: int | None = field(init=False, repr=False, compare=False)
+    _tick: Decimal = field(init=False, repr=False, compare=False)
+    _lot: Decimal = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        tick_decimals = _power_of_ten(self.tick_size)
+        lot_decimals = _power_of_ten(self.lot_size)
+        object.__setattr__(
+            self, "_ticks_scale", None if tick_decimals is None else self.price_decimals - tick_decimals
+        )
+        object.__setattr__(
+            self, "_lots_scale", None if lot_decimals is None else self.amount_decimals - lot_decimals
+        )
+        object.__setattr__(self, "_tick", Decimal(self.tick_size).scaleb(-self.price_decimals))
+        object.__setattr__(self, "_lot", Decimal(self.lot_size).scaleb(-self.amount_decimals))
+
+    def price_to_ticks(self, price: Decimal, round_up: bool) -> int:
+        if self._ticks_scale is not None:
+            ticks = price.scaleb(self._ticks_scale)
+            return math.ceil(ticks) if round_up else int(ticks)
+
+        raw = price.scaleb(self.price_decimals)
+        if round_up:
+            return -(-int(raw.to_integral_value(ROUND_CEILING)) // self.tick_size)
+        return int(raw) // self.tick_size
+
+    def amount_to_lots(self, amount: Decimal) -> int:
+        if self._lots_scale is not None:
+            return int(amount.scaleb(self._lots_scale))
+        return int(amount.scaleb(self.amount_decimals)) // self.lot_size
+
+    def ticks_to_price(self, ticks: int) -> Decimal:
+        # Exact, the same as scaling `raw_price(ticks)` by the decimals.
+        return ticks * self._tick
+
+    def lots_to_amount(self, lots: int) -> Decimal:
+        return lots * self._lot
+
+    def raw_price(self, ticks: int) -> int:
+        return ticks * self.tick_size
+
+    def raw_amount(self, lots: int) -> int:
+        return lots * self.lot_size
+
+    def snap(self, order: FutureOrder) -> FutureOrder:
+        """
+        Rounds the order to whole ticks (bids down, asks up) and lots (down).
+        """
+        if order.price_ticks is not None and order.amount_lots is not None:
+            return order
+
+        ticks = self.price_to_ticks(order.price, round_up=not order.is_bid())
+        lots = self.amount_to_lots(order.amount)
+        return FutureOrder(
+            order.order_side,
+            self.lots_to_amount(lots),
+            self.ticks_to_price(ticks),
+            order.platform,
+            order.venue,
+            ticks,
+            lots,
+        )
+
+
+def _power_of_ten(value: int) -> int | None:
+    decimals = len(str(value)) - 1
+    return decimals if value == 10**decimals else None
+
+
 @dataclass
 class AllOrders:
     '''
@@ -142,3 +243,16 @@ class DesiredOrders:
     @property
     def all_orders(self) -> list[FutureOrder]:
         return self.bids + self.asks
+
+    def snap(self, grid: OrderGrid) -> None:
+        """
+        Rounds the orders to the grid in place, dropping those smaller than one lot.
+        """
+        for orders in (self.bids, self.asks):
+            kept = 0
+            for order in orders:
+                order = grid.snap(order)
+                if order.amount_lots:
+                    orders[kept] = order
+                    kept += 1
+            del orders[kept:]
@@ -20,10 +20,15 @@ class FixedParamsElement(OrderChainElement):
         self._target_relative_distance = target_relative_distance_from_fp
         self._order_size = order_size_quote
 
+        self._bid_factor = 1 - target_relative_distance_from_fp
+        self._ask_factor = 1 + target_relative_distance_from_fp
+
     def process(self, state: State, orders: DesiredOrders) -> DesiredOrders:
         new_orders = DesiredOrders(bids=[], asks=[])
 
-        optimal_bid_price = state.fair_price * (1 - self._target_relative_distance)
+        fair_price = state.fair_price
+
+        optimal_bid_price = fair_price * self._bid_factor
         optimal_bid_size = self._order_size / optimal_bid_price
 
         new_orders.bids.append(
@@ -36,7 +41,7 @@ class FixedParamsElement(OrderChainElement):
             )
         )
 
-        optimal_ask_price = state.fair_price * (1 + self._target_relative_distance)
+        optimal_ask_price = fair_price * self._ask_factor
         optimal_ask_size = self._order_size / optimal_ask_price
 
         # TODO: Remove hardcoded "Remus" venue and starknet platform
@@ -29,6 +29,12 @@ class MinMaxRelativeDistanceElement(OrderChainElement):
                 f"Invalid params: {min_relative_distance_from_fp=} {max_relative_distance_from_fp=}"
             )
 
+        # Multiples of the fair price bounding the bids and asks, the same on every pulse.
+        self._min_bid_factor = 1 - min_relative_distance_from_fp
+        self._max_bid_factor = 1 - max_relative_distance_from_fp
+        self._min_ask_factor = 1 + min_relative_distance_from_fp
+        self._max_ask_factor = 1 + max_relative_distance_from_fp
+
     def process(self, state: State, orders: DesiredOrders) -> DesiredOrders:
         
         new_orders = DesiredOrders(
@@ -36,8 +42,9 @@ class MinMaxRelativeDistanceElement(OrderChainElement):
             asks = []
         )
 
-        min_bid_threshold = (1 - self._min_relative_distance) * state.fair_price
-        max_bid_threshold = (1 - self._max_relative_distance) * state.fair_price
+        fair_price = state.fair_price
+        min_bid_threshold = self._min_bid_factor * fair_price
+        max_bid_threshold = self._max_bid_factor * fair_price
         for bid in orders.bids:
             if min_bid_threshold < bid.price:
                 new_orders.bids.append(
@@ -59,8 +66,8 @@ class MinMaxRelativeDistanceElement(OrderChainElement):
             
             new_orders.bids.append(bid)
             
-        min_ask_threshold = (1 + self._min_relative_distance) * state.fair_price
-        max_ask_threshold = (1 + self._max_relative_distance) * state.fair_price
+        min_ask_threshold = self._min_ask_factor * fair_price
+        max_ask_threshold = self._max_ask_factor * fair_price
         for ask in orders.asks:
             if min_ask_threshold > ask.price:
                 new_orders.asks.append(
@@ -34,19 +34,21 @@ class RemoveOrdersOnLowInventoryElement(OrderChainElement):
         portfolio = state.account.position
         removed_orders = []
 
+        total_quote = portfolio.total_quote
         total_quote_needed = Decimal(0)
         for bid_order in orders.bids:
             order_quote_amount = bid_order.price * bid_order.amount
-            if total_quote_needed + order_quote_amount <= portfolio.total_quote:
+            if total_quote_needed + order_quote_amount <= total_quote:
                 new_desired.bids.append(bid_order)
                 total_quote_needed += order_quote_amount
             else: 
                 removed_orders.append(bid_order)
         
+        total_base = portfolio.total_base
         total_base_needed = Decimal(0)
         for ask_order in orders.asks:
             order_base_amount = ask_order.amount
-            if total_base_needed + order_base_amount <= portfolio.total_base:
+            if total_base_needed + order_base_amount <= total_base:
                 new_desired.asks.append(ask_order)    
                 total_base_needed += order_base_amount
             else:
@@ -56,7 +58,7 @@ class RemoveOrdersOnLowInventoryElement(OrderChainElement):
         # decides not to remove orders that we need to be removed in order to have enough 
         # liquidity. For now it's fine and new reconciler will be written soon
 
-        self._logger.info(f"Removing future orders due to low inventory: {removed_orders}")
+        self._logger.info("Removing future orders due to low inventory: %s", removed_orders)
 
         return new_desired
 
@@ -25,6 +25,8 @@ class SkewFairPriceOnPositionElement(OrderChainElement):
     """
 
     def __init__(self, bias: Decimal, max_skew: Decimal) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
         # What percentage to move the FP per percentage of imbalance
         self.bias = bias
         self.max_skew = max_skew
@@ -33,8 +35,9 @@ class SkewFairPriceOnPositionElement(OrderChainElement):
         fair_price = state.fair_price
 
         # Base is in base units, quote in quote units
-        base = state.account.position.total_base
-        quote = state.account.position.total_quote
+        position = state.account.position
+        base = position.total_base
+        quote = position.total_quote
 
         base_value = base * fair_price
         quote_value = quote
@@ -44,14 +47,14 @@ class SkewFairPriceOnPositionElement(OrderChainElement):
 
         # If base value is higher we want to sell more so
         # we need to shift the price lower to make asks more aggressive
-        imbalance = (quote_value - base_value) / (base_value + quote_value)
-
-        logging.info(f"Current imbalance: {imbalance}")
+        imbalance = (quote_value - base_value) / total_value
 
         price_shift_perc = imbalance * self.bias
         price_shift_perc = max(-self.max_skew, min(price_shift_perc, self.max_skew))
 
-        logging.info(f"Current price shift: {price_shift_perc}")
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info("Current imbalance: %s", imbalance)
+            self._logger.info("Current price shift: %s", price_shift_perc)
 
         new_fair_price = fair_price * (1 + price_shift_perc)
 
@@ -3,6 +3,7 @@ from marketmaking.orderchain.elements.element import OrderChainElement
 from cfg.cfg_classes import OrderChainElementConfig
 from marketmaking.order import DesiredOrders
 from state.state import State
+from monitoring import tracing
 
 
 class OrderChain:
@@ -14,16 +15,29 @@ class OrderChain:
     '''
     def __init__(self, elements: list[OrderChainElement]) -> None:
         self.elements = elements
+        self._stages = [f"orderchain.{element.__class__.__name__}" for element in elements]
 
     def process(self, state: State) -> DesiredOrders:
         '''
         Processes the given state through all elements in the order chain,
         generating a final set of desired orders.
+
+        If the state has the grid of the market, the final orders are snapped to it, so that
+        they are rounded only once and compare exactly with the resting orders.
         '''
         orders: DesiredOrders = DesiredOrders(bids=[], asks=[])
 
-        for element in self.elements:
-            orders = element.process(state=state, orders=orders)
+        if not tracing.is_enabled():
+            # Skips the spans altogether, eg. in backtests which run the chain on every pulse.
+            for element in self.elements:
+                orders = element.process(state=state, orders=orders)
+        else:
+            for element, stage in zip(self.elements, self._stages):
+                with tracing.span(stage):
+                    orders = element.process(state=state, orders=orders)
+
+        if state.grid is not None:
+            orders.snap(state.grid)
 
         return orders
 
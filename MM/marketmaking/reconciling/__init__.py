@@ -2,6 +2,8 @@ from decimal import Decimal
 from .order_reconciler import OrderReconciler
 from .always_replace_reconciler import AlwaysReplaceOrderReconciler
 from .tolerance_reconciler import ToleranceOrderReconciler
+from .matching_reconciler import MatchingOrderReconciler
+from .cost_aware_reconciler import CostAwareOrderReconciler
 
 from cfg.cfg_classes import ReconcilerConfig
 
@@ -16,4 +18,19 @@ def get_reconciler(cfg: ReconcilerConfig) -> OrderReconciler:
             relative_quantity_tolerance=Decimal(cfg.args["relative_quantity_tolerance"]),
         )
 
+    if cfg.name == "matching_reconciler":
+        return MatchingOrderReconciler(
+            relative_price_tolerance=Decimal(cfg.args["relative_price_tolerance"]),
+            relative_quantity_tolerance=Decimal(cfg.args["relative_quantity_tolerance"]),
+        )
+
+    if cfg.name == "cost_aware_reconciler":
+        return CostAwareOrderReconciler(
+            relative_price_tolerance=Decimal(cfg.args["relative_price_tolerance"]),
+            relative_quantity_tolerance=Decimal(cfg.args["relative_quantity_tolerance"]),
+            call_fee=Decimal(cfg.args["call_fee"]),
+            accuracy_value=Decimal(cfg.args.get("accuracy_value", 1)),
+            hysteresis=Decimal(cfg.args.get("hysteresis", 0)),
+        )
+
     raise ValueError(f"Unknown OrderReconciler name: {cfg.name}")
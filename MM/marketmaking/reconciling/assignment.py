@@ -0,0 +1,65 @@
+import math
+
+
+def min_cost_assignment(cost: list[list[float]]) -> list[int]:
+    '''
+    Hungarian algorithm (shortest augmenting paths with potentials) for the rectangular
+    assignment problem: assigns each row of `cost` to a distinct column so that the sum
+    of the costs is minimal. Requires at least as many columns as rows.
+
+    Returns the assigned column of every row. Runs in O(rows^2 * columns).
+    '''
+    rows = len(cost)
+    if rows == 0:
+        return []
+    columns = len(cost[0])
+    if columns < rows:
+        raise ValueError(f"Assignment needs at least as many columns as rows, got {rows=}, {columns=}")
+
+    # 1-indexed, row 0 and column 0 are the sentinel of the augmenting path.
+    u = [0.0] * (rows + 1)
+    v = [0.0] * (columns + 1)
+    row_of = [0] * (columns + 1)
+    way = [0] * (columns + 1)
+
+    for row in range(1, rows + 1):
+        row_of[0] = row
+        column = 0
+        min_slack = [math.inf] * (columns + 1)
+        used = [False] * (columns + 1)
+
+        while row_of[column] != 0:
+            used[column] = True
+            current_row = row_of[column]
+            delta = math.inf
+            next_column = 0
+            for j in range(1, columns + 1):
+                if used[j]:
+                    continue
+                slack = cost[current_row - 1][j - 1] - u[current_row] - v[j]
+                if slack < min_slack[j]:
+                    min_slack[j] = slack
+                    way[j] = column
+                if min_slack[j] < delta:
+                    delta = min_slack[j]
+                    next_column = j
+
+            for j in range(columns + 1):
+                if used[j]:
+                    u[row_of[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_slack[j] -= delta
+            column = next_column
+
+        # Flip the augmenting path back to the sentinel.
+        while column != 0:
+            previous = way[column]
+            row_of[column] = row_of[previous]
+            column = previous
+
+    assignment = [0] * rows
+    for j in range(1, columns + 1):
+        if row_of[j] != 0:
+            assignment[row_of[j] - 1] = j - 1
+    return assignment
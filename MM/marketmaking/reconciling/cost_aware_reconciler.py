@@ -0,0 +1,118 @@
+import logging
+from decimal import Decimal
+from typing import final
+
+from state.state import State
+from monitoring import metrics
+from marketmaking.order import BasicOrder, DesiredOrders, FutureOrder, OpenOrders
+from marketmaking.reconciling.matching_reconciler import MatchingOrderReconciler
+from marketmaking.reconciling.order_reconciler import OrderReconciler, ReconciledOrders
+
+
+@final
+class CostAwareOrderReconciler(OrderReconciler):
+    '''
+    Matches desired orders with existing ones within the price and quantity tolerance like
+    `MatchingOrderReconciler`, but moves a matched existing order to its desired one only if
+    the update is worth its fee.
+
+    Replacing an order costs two calls (cancel and place), each paying the fee of the state
+    (`State.call_fee`) or `call_fee` until the fee is known, both in the quote asset. The benefit
+    of the update is `accuracy_value` times the distance of the existing price from the desired
+    one times the desired amount, ie. the value of quoting exactly (in the quote asset).
+    Updates are sent when the benefit exceeds the cost times `1 + hysteresis`.
+
+    The existing order serves as the memory of the hysteresis: once moved, it rests at the
+    desired price, and moves again only after the desired price drifted away from it by more
+    than the threshold. Prices oscillating within the threshold don't make any transactions.
+
+    The tolerance bounds how far the kept orders may be from the desired ones, regardless of
+    the fee. Existing orders without a desired one within tolerance are canceled and desired
+    orders without an existing one are placed, so the spread is never widened by missing orders.
+
+    With the same tolerance, this reconciler keeps a subset of the orders `MatchingOrderReconciler`
+    keeps (it re-places the matched ones not worth keeping), so it never sends fewer updates.
+    The fees are saved only with a tolerance wider than the one of the matching reconciler:
+    the tolerance then bounds the worst kept quote, and the fee decides which orders within it
+    move.
+    '''
+    def __init__(
+        self,
+        relative_price_tolerance: Decimal,
+        relative_quantity_tolerance: Decimal,
+        call_fee: Decimal,
+        accuracy_value: Decimal = Decimal(1),
+        hysteresis: Decimal = Decimal(0),
+    ):
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        if call_fee < 0:
+            raise ValueError(f"Invalid call fee {call_fee=}")
+
+        if accuracy_value <= 0:
+            raise ValueError(f"Invalid accuracy value {accuracy_value=}")
+
+        if hysteresis < 0:
+            raise ValueError(f"Invalid hysteresis {hysteresis=}")
+
+        self._matcher = MatchingOrderReconciler(
+            relative_price_tolerance=relative_price_tolerance,
+            relative_quantity_tolerance=relative_quantity_tolerance,
+        )
+        self.call_fee = call_fee
+        self.accuracy_value = accuracy_value
+        self.hysteresis = hysteresis
+
+    def reconcile(self, state: State, existing_orders: OpenOrders, desired_orders: DesiredOrders) -> ReconciledOrders:
+        call_fee = state.call_fee if state.call_fee is not None else self.call_fee
+        # Benefit (in the quote asset) an update has to exceed, divided by the accuracy value.
+        threshold = 2 * call_fee * (1 + self.hysteresis) / self.accuracy_value
+
+        to_place: list[FutureOrder] = []
+        to_cancel: list[BasicOrder] = []
+        to_keep: list[BasicOrder] = []
+        to_ignore: list[FutureOrder] = []
+        skipped = 0
+
+        for existing, desired in (
+            (existing_orders.bids, desired_orders.bids),
+            (existing_orders.asks, desired_orders.asks),
+        ):
+            matches = self._matcher.match_side(existing, desired)
+
+            kept = set()
+            for i, order in enumerate(desired):
+                j = matches.get(i)
+                if j is None:
+                    to_place.append(order)
+                    continue
+
+                resting = existing[j]
+                if resting.price == order.price and resting.amount == order.amount:
+                    kept.add(j)
+                elif abs(resting.price - order.price) * order.amount <= threshold:
+                    kept.add(j)
+                    skipped += 1
+                else:
+                    to_place.append(order)
+                    continue
+
+                to_keep.append(resting)
+                to_ignore.append(order)
+
+            to_cancel.extend(order for j, order in enumerate(existing) if j not in kept)
+
+        metrics.track_skipped_order_updates(skipped)
+
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info("Ignoring desired orders: %s", to_ignore)
+            self._logger.info("Keeping resting orders: %s", to_keep)
+            self._logger.info("Canceling orders: %s", to_cancel)
+            self._logger.info("Placing orders: %s", to_place)
+
+        return ReconciledOrders(
+            to_place=to_place,
+            to_cancel=to_cancel,
+            to_keep=to_keep,
+            to_ignore=to_ignore
+        )
@@ -0,0 +1,166 @@
+import logging
+from decimal import Decimal
+from typing import final
+
+from state.state import State
+from marketmaking.order import BasicOrder, DesiredOrders, FutureOrder, OpenOrders
+from marketmaking.reconciling.assignment import min_cost_assignment
+from marketmaking.reconciling.order_reconciler import OrderReconciler, ReconciledOrders
+
+
+@final
+class MatchingOrderReconciler(OrderReconciler):
+    '''
+    Same tolerance bounds as `ToleranceOrderReconciler`, but instead of keeping the first
+    acceptable existing order for every desired one, it keeps as many existing orders as
+    possible, which minimizes the number of cancels and places. Among those matchings it
+    prefers the one closest (in relative price and quantity) to the desired orders.
+
+    Works per side on orders sorted by price: the acceptable existing orders of a desired
+    order are a contiguous window of the sorted existing orders, so a sweep splits the side
+    into independent groups of orders competing for each other. Groups with a single desired
+    or existing order (all of them for ladders with levels further apart than the price
+    tolerance) are matched directly, larger ones by a minimum-cost assignment.
+    O(n log n) for typical ladders.
+    '''
+    def __init__(self, relative_price_tolerance: Decimal, relative_quantity_tolerance: Decimal):
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        if relative_price_tolerance < 0:
+            raise ValueError(f"Invalid price tolerance {relative_price_tolerance=}")
+
+        if relative_quantity_tolerance < 0:
+            raise ValueError(f"Invalid quantity tolerance {relative_quantity_tolerance=}")
+
+        self.relative_price_tolerance = relative_price_tolerance
+        self.relative_quantity_tolerance = relative_quantity_tolerance
+
+    def reconcile(self, state: State, existing_orders: OpenOrders, desired_orders: DesiredOrders) -> ReconciledOrders:
+        to_place: list[FutureOrder] = []
+        to_cancel: list[BasicOrder] = []
+        to_keep: list[BasicOrder] = []
+        to_ignore: list[FutureOrder] = []
+
+        for existing, desired in (
+            (existing_orders.bids, desired_orders.bids),
+            (existing_orders.asks, desired_orders.asks),
+        ):
+            matches = self.match_side(existing, desired) if existing and desired else None
+            # Nothing is kept once the orders move beyond the tolerance, eg. on most pulses of busy backtests.
+            if not matches:
+                to_place.extend(desired)
+                to_cancel.extend(existing)
+                continue
+
+            kept = set(matches.values())
+            for i, order in enumerate(desired):
+                if i in matches:
+                    to_ignore.append(order)
+                    to_keep.append(existing[matches[i]])
+                else:
+                    to_place.append(order)
+            to_cancel.extend(order for j, order in enumerate(existing) if j not in kept)
+
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info("Ignoring desired orders: %s", to_ignore)
+            self._logger.info("Keeping resting orders: %s", to_keep)
+            self._logger.info("Canceling orders: %s", to_cancel)
+            self._logger.info("Placing orders: %s", to_place)
+
+        return ReconciledOrders(
+            to_place=to_place,
+            to_cancel=to_cancel,
+            to_keep=to_keep,
+            to_ignore=to_ignore
+        )
+
+    def match_side(self, existing: list[BasicOrder], desired: list[FutureOrder]) -> dict[int, int]:
+        '''
+        Returns the index of the kept existing order for every matched desired order (by index).
+        '''
+        if len(existing) == 1 and len(desired) == 1:
+            return {0: 0} if self.is_within_tolerance(existing=existing[0], desired=desired[0]) else {}
+
+        existing_by_price = sorted(range(len(existing)), key=lambda j: existing[j].price)
+        desired_by_price = sorted(range(len(desired)), key=lambda i: desired[i].price)
+
+        # Bounds of acceptable prices, non-decreasing in the existing price.
+        # Computed like in `is_within_tolerance`, so that the windows hold exactly the acceptable prices.
+        tolerances = [existing[j].price * self.relative_price_tolerance for j in existing_by_price]
+        lower = [existing[j].price - t for j, t in zip(existing_by_price, tolerances)]
+        upper = [existing[j].price + t for j, t in zip(existing_by_price, tolerances)]
+
+        # Groups of desired orders with overlapping windows [start, end) of existing orders.
+        groups: list[tuple[list[int], int, int]] = []
+        start = end = 0
+        for i in desired_by_price:
+            price = desired[i].price
+            while end < len(existing_by_price) and lower[end] <= price:
+                end += 1
+            while start < end and upper[start] < price:
+                start += 1
+            if start == end:
+                continue
+
+            if groups and start < groups[-1][2]:
+                groups[-1][0].append(i)
+                groups[-1] = (groups[-1][0], groups[-1][1], end)
+            else:
+                groups.append(([i], start, end))
+
+        matches: dict[int, int] = {}
+        for group, group_start, group_end in groups:
+            candidates = [existing_by_price[k] for k in range(group_start, group_end)]
+            matches.update(self._match_group(existing, desired, group, candidates))
+        return matches
+
+    def _match_group(
+        self, existing: list[BasicOrder], desired: list[FutureOrder], group: list[int], candidates: list[int]
+    ) -> dict[int, int]:
+        costs = [
+            [self._cost(existing[j], desired[i]) for j in candidates]
+            for i in group
+        ]
+
+        if len(group) == 1 or len(candidates) == 1:
+            best = min(
+                ((cost, i, j) for i, row in zip(group, costs) for j, cost in zip(candidates, row) if cost is not None),
+                default=None,
+            )
+            return {} if best is None else {best[1]: best[2]}
+
+        # Every kept order saves a cancel and a place, so it outweighs any difference in distance.
+        keep_bonus = 1 + len(group) * max(
+            (cost for row in costs for cost in row if cost is not None), default=0.0
+        )
+        weights = [[0.0 if cost is None else cost - keep_bonus for cost in row] for row in costs]
+
+        if len(group) <= len(candidates):
+            pairs = zip(group, (candidates[j] for j in min_cost_assignment(weights)))
+        else:
+            transposed = [list(column) for column in zip(*weights)]
+            pairs = zip((group[i] for i in min_cost_assignment(transposed)), candidates)
+
+        return {i: j for i, j in pairs if self.is_within_tolerance(existing=existing[j], desired=desired[i])}
+
+    def _cost(self, existing: BasicOrder, desired: FutureOrder) -> float | None:
+        '''
+        Relative distance of the desired order from the existing one, None if out of tolerance.
+        '''
+        if not self.is_within_tolerance(existing=existing, desired=desired):
+            return None
+        return float(
+            abs(desired.price - existing.price) / existing.price
+            + abs(desired.amount - existing.amount) / existing.amount
+        )
+
+    def is_within_tolerance(self, existing: BasicOrder, desired: FutureOrder) -> bool:
+        if existing.is_bid() != desired.is_bid():
+            return False
+
+        price_tolerance = existing.price * self.relative_price_tolerance
+        if not existing.price - price_tolerance <= desired.price <= existing.price + price_tolerance:
+            return False
+
+        quantity_tolerance = existing.amount * self.relative_quantity_tolerance
+        return existing.amount - quantity_tolerance <= desired.amount <= existing.amount + quantity_tolerance
@@ -49,10 +49,11 @@ class ToleranceOrderReconciler(OrderReconciler):
         # should be cancelled.
         to_cancel = remaining_existing_orders
 
-        self._logger.info(f"Ignoring desired orders: {to_ignore}")
-        self._logger.info(f"Keeping resting orders: {to_keep}")
-        self._logger.info(f"Canceling orders: {to_cancel}")
-        self._logger.info(f"Placing orders: {to_place}")
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info("Ignoring desired orders: %s", to_ignore)
+            self._logger.info("Keeping resting orders: %s", to_keep)
+            self._logger.info("Canceling orders: %s", to_cancel)
+            self._logger.info("Placing orders: %s", to_place)
 
         return ReconciledOrders(
             to_place=to_place,
@@ -71,7 +72,7 @@ class ToleranceOrderReconciler(OrderReconciler):
 
 
     def is_within_tolerance(self, existing: BasicOrder, desired: FutureOrder) -> bool:
-        if existing.order_side != desired.order_side:
+        if existing.is_bid() != desired.is_bid():
             return False
 
         # Check price tolerance
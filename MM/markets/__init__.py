@@ -5,12 +5,21 @@ from .starknet_markets.ekubo_limit_order_market import EkuboLimitOrderMarket
 from .starknet_markets.remus_market import RemusMarket
 from .starknet_markets.ekubo_clmm_market import EkuboCLMMMarket
 
-async def get_starknet_market(name: str, account: WAccount, market_id: int) -> StarknetMarketABC:
+async def get_starknet_market(
+    name: str, account: WAccount, market_id: int, order_tracking: str = "polling"
+) -> StarknetMarketABC:
+    if order_tracking not in ("polling", "events"):
+        raise ValueError(f"Unknown order tracking `{order_tracking}`")
+    if order_tracking == "events" and name != "remus":
+        raise ValueError(f"Event-driven order tracking is not supported for market `{name}`")
+
     if name == 'ekubo_clmm':
         return await EkuboCLMMMarket.new(account = account, market_id = market_id)
     if name == 'ekubo_limit_orders':
         return await EkuboLimitOrderMarket.new(account = account, market_id=market_id)
     if name == 'remus':
-        return await RemusMarket.new(account = account, market_id = market_id)
+        return await RemusMarket.new(
+            account = account, market_id = market_id, track_order_events = order_tracking == "events"
+        )
     
     raise ValueError(f"Unable to find Starknet market for name `{name}`")
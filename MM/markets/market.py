@@ -1,14 +1,14 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Awaitable, Callable
 
 import httpx
 
 from state.account_state import PositionInfo
 from instruments.instrument import Instrument
-from marketmaking.order import AllOrders, BasicOrder, FutureOrder
-from starknet_py.net.client_models import Calls
+from marketmaking.order import AllOrders, BasicOrder, FutureOrder, OrderGrid
+from starknet_py.net.client_models import Call, Calls
 
 if TYPE_CHECKING:
     from state.state import State
@@ -50,6 +50,22 @@ class MarketABC[T](ABC):
         '''
         pass
 
+    @property
+    def order_grid(self) -> OrderGrid | None:
+        '''
+        Returns the grid of prices and amounts of the market's orders, if its orders are
+        placed in whole ticks and lots. Desired orders are snapped to it once per pulse.
+        '''
+        return None
+
+    @property
+    def fill_detector(self) -> Callable[[], Awaitable[bool]] | None:
+        '''
+        Returns a function that tells whether any of the market's orders was filled since
+        its previous call, or None if the market can't detect fills between pulses.
+        '''
+        return None
+
     @abstractmethod
     async def setup(self) -> None:
         '''
@@ -117,7 +133,14 @@ class MarketABC[T](ABC):
 
 
 class StarknetMarketABC(MarketABC[Calls]):
-    pass
+
+    async def get_setup_calls(self) -> list[Call]:
+        '''
+        Returns the calls that still have to be executed before trading, eg. missing token
+        approvals. The state is read from the chain, so no calls are returned once the market
+        is set up. This lets the setup of multiple markets be bundled into one transaction.
+        '''
+        return []
 
 class OffchainMarketABC(MarketABC[httpx.Request]):
     pass
@@ -1,4 +1,3 @@
-
 import asyncio
 from decimal import Decimal
 import logging
@@ -45,19 +44,20 @@ class EkuboCLMMMarket(StarknetMarketABC):
 
     @staticmethod
     async def new(account: WAccount, market_id: int) -> "EkuboCLMMMarket":
-        client = await EkuboClient.from_account(account = account.account)
         market_config = get_preloaded_ekubo_clmm_market_config(market_id)
     
         if market_config is None:
             raise ValueError(f"No preloaded ekubo clmm config found for id `{market_id}`")
         
-        base_token = await Contract.from_address(
-            address = market_config.base_token.address,
-            provider = account.account
-        )
-        quote_token = await Contract.from_address(
-            address = market_config.quote_token.address,
-            provider = account.account
+        # The venue and the token contracts are created concurrently.
+        client, (base_token, quote_token) = await asyncio.gather(
+            EkuboClient.from_account(
+                account = account.account, reader = account.reader, abi_cache = account.abi_cache
+            ),
+            account.abi_cache.get_contracts(
+                [market_config.base_token.address, market_config.quote_token.address],
+                provider = account.account,
+            ),
         )
         return EkuboCLMMMarket(
             market_id = market_id,
@@ -106,11 +106,15 @@ class EkuboCLMMMarket(StarknetMarketABC):
             _balance_quote
         ) = await asyncio.gather(
             self.get_current_orders(),
-            self._base_token.functions['balanceOf'].call(
-                account = self._account.address
+            self._account.reader.call(
+                self._base_token.functions['balanceOf'].prepare_call(
+                    account = self._account.address
+                )
             ),
-            self._quote_token.functions['balanceOf'].call(
-                account = self._account.address
+            self._account.reader.call(
+                self._quote_token.functions['balanceOf'].prepare_call(
+                    account = self._account.address
+                )
             )
         )
 
@@ -40,19 +40,20 @@ class EkuboLimitOrderMarket(StarknetMarketABC):
 
     @staticmethod
     async def new(account: WAccount, market_id: int) -> "EkuboLimitOrderMarket":
-        client = await EkuboClient.from_account(account = account.account)
         market_config = get_preloaded_ekubo_limit_order_market_config(market_id)
     
         if market_config is None:
             raise ValueError(f"No preloaded ekubo config found for id `{market_id}`")
         
-        base_token = await Contract.from_address(
-            address = market_config.base_token.address,
-            provider = account.account
-        )
-        quote_token = await Contract.from_address(
-            address = market_config.quote_token.address,
-            provider = account.account
+        # The venue and the token contracts are created concurrently.
+        client, (base_token, quote_token) = await asyncio.gather(
+            EkuboClient.from_account(
+                account = account.account, reader = account.reader, abi_cache = account.abi_cache
+            ),
+            account.abi_cache.get_contracts(
+                [market_config.base_token.address, market_config.quote_token.address],
+                provider = account.account,
+            ),
         )
         return EkuboLimitOrderMarket(
             market_id = market_id,
@@ -122,11 +123,15 @@ class EkuboLimitOrderMarket(StarknetMarketABC):
             _balance_quote
         ) = await asyncio.gather(
             self.get_current_orders(),
-            self._base_token.functions['balanceOf'].call(
-                account = self._account.address
+            self._account.reader.call(
+                self._base_token.functions['balanceOf'].prepare_call(
+                    account = self._account.address
+                )
             ),
-            self._quote_token.functions['balanceOf'].call(
-                account = self._account.address
+            self._account.reader.call(
+                self._quote_token.functions['balanceOf'].prepare_call(
+                    account = self._account.address
+                )
             )
         )
 
@@ -0,0 +1,35 @@
+import asyncio
+import logging
+
+from starknet_py.net.client_models import Call
+
+from markets.market import StarknetMarketABC
+from monitoring import tracing
+from platforms.starknet.starknet_account import WAccount
+
+
+async def setup_starknet_markets(account: WAccount, markets: list[StarknetMarketABC]) -> None:
+    '''
+    Sets up all the markets traded by the account at once. What each market is missing
+    is read concurrently and all the missing calls (eg. approvals) are executed in a single
+    multicall transaction, or none at all if the markets are already set up.
+    '''
+    with tracing.span("market_setup", markets=len(markets)):
+        market_calls = await asyncio.gather(*(m.get_setup_calls() for m in markets))
+        # Markets sharing a token and a venue ask for the same approval, it is sent once.
+        unique: dict[tuple[int, int, tuple[int, ...]], Call] = {}
+        for call in (call for c in market_calls for call in c):
+            unique.setdefault((call.to_addr, call.selector, tuple(call.calldata)), call)
+        calls = list(unique.values())
+
+        if not calls:
+            logging.info("All %s market(s) are already set up.", len(markets))
+            return
+
+        sent = await account.execute_v3(calls=calls)
+        logging.info(
+            "Setup transaction `%s` with %s call(s) sent.", hex(sent.transaction_hash), len(calls)
+        )
+        await account.wait_for_tx(sent.transaction_hash)
+
+    logging.info("Setting up %s market(s) is done.", len(markets))
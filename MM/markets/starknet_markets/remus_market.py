@@ -1,7 +1,8 @@
 import asyncio
 from decimal import Decimal
 import logging
-from typing import Iterable, final, TYPE_CHECKING
+from functools import partial
+from typing import Awaitable, Callable, Iterable, final, TYPE_CHECKING
 
 from starknet_py.contract import Contract
 from starknet_py.net.client_models import Calls, Call
@@ -10,14 +11,18 @@ from markets.market import PrologueOps, PrologueOp_SeekLiquidity
 from platforms.starknet.starknet_account import WAccount
 from state.account_state import PositionInfo
 from venues.remus.remus import RemusDexClient
-from marketmaking.order import AllOrders, BasicOrder, FutureOrder
+from venues.remus.remus_order_tracker import RemusOrderTracker
+from marketmaking.order import AllOrders, BasicOrder, FutureOrder, OrderGrid
 from markets.market import StarknetMarketABC
+from markets.starknet_markets.market_setup import setup_starknet_markets
 from venues.remus.remus_market_configs import RemusMarketConfig, get_preloaded_remus_market_config
 
 if TYPE_CHECKING:
     from state.state import State
 
 MAX_UINT = 2**256 - 1
+# Allowances above this are considered unlimited, as some tokens decrease even the max one when spending.
+UNLIMITED_ALLOWANCE = MAX_UINT // 2
 
 @final
 class RemusMarket(StarknetMarketABC):
@@ -29,7 +34,8 @@ class RemusMarket(StarknetMarketABC):
         remus_client: RemusDexClient,
         base_token_contract: Contract,
         quote_token_contract: Contract,
-        account: WAccount
+        account: WAccount,
+        order_tracker: RemusOrderTracker | None = None,
     ) -> None:
         self._market_id = market_id
         self._market_config = market_config
@@ -37,40 +43,69 @@ class RemusMarket(StarknetMarketABC):
         self._base_token = base_token_contract
         self._quote_token = quote_token_contract
         self._account = account
+        self._order_tracker = order_tracker
 
         self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
 
     @staticmethod
-    async def new(account: WAccount, market_id: int) -> "RemusMarket":
-        client = await RemusDexClient.from_account(account = account.account)
+    async def new(account: WAccount, market_id: int, track_order_events: bool = False) -> "RemusMarket":
+        '''
+        If `track_order_events` is set, the orders are tracked by RemusOrderTracker
+        instead of being read on every pulse.
+        '''
         market_config = get_preloaded_remus_market_config(market_id)
     
         if market_config is None:
             raise ValueError(f"No preloaded remus config found for id `{market_id}`")
         
-        base_token = await Contract.from_address(
-            address = market_config.base_token.address,
-            provider = account.account
-        )
-        quote_token = await Contract.from_address(
-            address = market_config.quote_token.address,
-            provider = account.account
+        # The venue and the token contracts are created concurrently.
+        client, (base_token, quote_token) = await asyncio.gather(
+            RemusDexClient.from_account(
+                account = account.account, reader = account.reader, abi_cache = account.abi_cache
+            ),
+            account.abi_cache.get_contracts(
+                [market_config.base_token.address, market_config.quote_token.address],
+                provider = account.account,
+            ),
         )
 
+        order_tracker = None
+        if track_order_events:
+            order_tracker = RemusOrderTracker(
+                view = client.view,
+                client = account.client,
+                reader = account.reader,
+                user_address = account.address,
+            )
+
         return RemusMarket(
             market_id = market_id,
             market_config=market_config,
             remus_client=client,
             base_token_contract=base_token,
             quote_token_contract=quote_token,
-            account=account
+            account=account,
+            order_tracker=order_tracker,
         )
 
     @property
     def market_cfg(self) -> RemusMarketConfig:
         return self._market_config
 
+    @property
+    def order_grid(self) -> OrderGrid:
+        return self._market_config.grid
+
+    @property
+    def fill_detector(self) -> Callable[[], Awaitable[bool]] | None:
+        if self._order_tracker is None:
+            return None
+        return partial(self._order_tracker.poll_fills, self._market_id)
+
     async def get_current_orders(self) -> AllOrders:
+        if self._order_tracker is not None:
+            return await self._order_tracker.get_orders(self._market_id)
+
         return await self._client.view.get_all_user_orders_for_market_id(
             address=self._account.address, market_id=self._market_id
         )
@@ -140,46 +175,44 @@ class RemusMarket(StarknetMarketABC):
         
 
     async def setup(self) -> None:
-
-        nonce = await self._account.get_nonce()
-
-        # Approve base token
-        await (
-            await self._base_token.functions["approve"].invoke_v3(
-                spender=int(self._client.address, 16),
-                amount=MAX_UINT,
-                nonce=nonce,
-                auto_estimate=True,
+        await setup_starknet_markets(self._account, [self])
+
+    async def get_setup_calls(self) -> list[Call]:
+        '''
+        Returns approvals of the tokens for Remus whose allowance is not unlimited yet.
+        '''
+        spender = int(self._client.address, 16)
+        tokens = [self._base_token, self._quote_token]
+
+        # Read in a single batched request.
+        allowances = await asyncio.gather(
+            *(
+                self._account.reader.call(
+                    token.functions["allowance"].prepare_call(self._account.address, spender)
+                )
+                for token in tokens
             )
-        ).wait_for_acceptance()
-        nonce += 1
-        self._logger.info(
-            "Set unlimited approval for address: %s, base token: %s",
-            hex(self._account.address),
-            hex(self._market_config.base_token.address),
         )
 
-        # Approve quote token
-        await (
-            await self._quote_token.functions["approve"].invoke_v3(
-                spender=int(self._client.address, 16),
-                amount=MAX_UINT,
-                nonce=nonce,
-                auto_estimate=True,
+        calls: list[Call] = []
+        for token, allowance in zip(tokens, allowances):
+            if allowance[0] >= UNLIMITED_ALLOWANCE:
+                continue
+
+            self._logger.info(
+                "Allowance of token %s for Remus is %s, it will be set to unlimited.",
+                hex(token.address),
+                allowance[0],
+            )
+            calls.append(
+                token.functions["approve"].prepare_invoke_v3(spender=spender, amount=MAX_UINT)
             )
-        ).wait_for_acceptance()
-        nonce += 1
-        self._logger.info(
-            "Set unlimited approval for address: %s, quote token: %s",
-            hex(self._account.address),
-            hex(self._market_config.quote_token.address),
-        )
 
-        await self._account.set_latest_nonce(nonce)
-        self._logger.info("Setting unlimited approvals is done.")
+        return calls
 
     async def get_total_position(self) -> PositionInfo:
-
+        # All the view calls are batched into one request by the account's reader and the orders
+        # are shared with `get_current_orders` of the same state snapshot.
         (
             orders,
             claimable_base,
@@ -194,8 +227,12 @@ class RemusMarket(StarknetMarketABC):
             self._client.view.get_claimable(
                 self._market_config.quote_token, self._account.address
             ),
-            self._base_token.functions["balanceOf"].call(account=self._account.account.address),
-            self._quote_token.functions["balanceOf"].call(account=self._account.account.address),
+            self._account.reader.call(
+                self._base_token.functions["balanceOf"].prepare_call(account=self._account.address)
+            ),
+            self._account.reader.call(
+                self._quote_token.functions["balanceOf"].prepare_call(account=self._account.address)
+            ),
         )
 
         # Remus has no terminal orders so we only account the active ones
@@ -0,0 +1,31 @@
+'''
+This module configures logging of the bot.
+'''
+
+import logging
+import sys
+
+from monitoring import metrics, tracing
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [pulse %(pulse_id)s] %(message)s"
+# Used when multiple strategy instances log into the same file.
+INSTANCE_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(instance)s pulse %(pulse_id)s] %(message)s"
+
+
+def setup_logging(log_level: str, log_format: str = LOG_FORMAT) -> None:
+    """Configures logging for the application."""
+    logging.basicConfig(
+        filename="marketmaker.log", filemode="a", level=logging.INFO, format=log_format
+    )
+    logging.getLogger("httpx").setLevel(logging.ERROR)
+    console = logging.StreamHandler(sys.stdout)
+    console.setLevel(logging.INFO)
+    console.setFormatter(logging.Formatter(log_format))
+
+    # Tag the records with the id of the pulse they were logged in.
+    for handler in logging.getLogger().handlers + [console]:
+        handler.addFilter(tracing.PulseIdLogFilter())
+
+    # Attach to root logger
+    logging.getLogger().addHandler(console)
+    logging.getLogger().addHandler(metrics.PrometheusMetricsErrorHandler())
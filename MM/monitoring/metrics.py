@@ -1,81 +1,270 @@
 '''
 This module provides Prometheus metrics for monitoring the bot's performance and state.
+
+Metrics of a strategy (pulse timings, positions, quotes...) are labeled by the `instance`
+of the strategy they belong to, so that multiple strategies can run in a single process.
+The instance is kept in a context variable, set once per strategy task by `set_instance`.
 '''
 
+from contextvars import ContextVar
 from decimal import Decimal
-from prometheus_client import Counter, Gauge, start_http_server
+from prometheus_client import (
+    REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, Metric, start_http_server
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+from prometheus_client.registry import Collector
 import logging
 import time
+from typing import Iterable
 
 from state.account_state import PositionInfo
 from marketmaking.reconciling.order_reconciler import ReconciledOrders
 
 
-def start_metrics_server(port: int = 8000) -> None:
+DEFAULT_INSTANCE = "default"
+
+_instance: ContextVar[str] = ContextVar("instance", default=DEFAULT_INSTANCE)
+
+
+def set_instance(name: str) -> None:
+    '''
+    Labels the metrics tracked in the current context (and tasks spawned from it) by `name`.
+    '''
+    _instance.set(name)
+
+
+def current_instance() -> str:
+    return _instance.get()
+
+
+def start_metrics_server(port: int = 8000, multiprocess_dir: str | None = None) -> None:
     '''
     Starts a Prometheus metrics server on the specified port.
+
+    If `multiprocess_dir` is given, the server exposes the metrics of this process together
+    with the metrics of all the processes writing into that directory (see prometheus_client
+    multiprocess mode, the processes must be started with `PROMETHEUS_MULTIPROC_DIR` set to it).
     '''
-    start_http_server(port)
+    if multiprocess_dir is None:
+        start_http_server(port)
+        return
+
+    registry = CollectorRegistry()
+    processes = MultiProcessCollector(None, path=multiprocess_dir)  # type: ignore[no-untyped-call]
+    registry.register(_MergedCollector([REGISTRY, processes]))
+    start_http_server(port, registry=registry)
+
+
+class _MergedCollector(Collector):
+    '''
+    Merges the samples of metrics of the same name from multiple collectors.
+    '''
+    def __init__(self, collectors: list[Collector]) -> None:
+        self._collectors = collectors
+
+    def collect(self) -> Iterable[Metric]:
+        families: dict[str, Metric] = {}
+        for collector in self._collectors:
+            for family in collector.collect():
+                if family.name in families:
+                    families[family.name].samples.extend(family.samples)
+                else:
+                    families[family.name] = family
+
+        return [family for family in families.values() if family.samples]
 
 
 last_error_gauge = Gauge(
-    "last_error_timestamp", "Timestamp (in seconds) of the last error that occurred"
+    "last_error_timestamp", "Timestamp (in seconds) of the last error that occurred", ["instance"]
 )
 
 loop_time = Gauge(
-    "loop_time", "Time (in seconds) it took the bot to complete one single loop"
+    "loop_time", "Time (in seconds) it took the bot to complete one single loop", ["instance"]
 )
 
 state_update_time = Gauge(
-    "state_update_time", "Time (in seconds) it took to update the state"
+    "state_update_time", "Time (in seconds) it took to update the state", ["instance"]
+)
+
+pulse_stage_time = Histogram(
+    "pulse_stage_seconds",
+    "Time (in seconds) spent in a stage of the pulse",
+    ["instance", "stage"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+pulse_triggers = Counter(
+    "pulse_triggers", "Total number of pulses fired per trigger", ["instance", "trigger"]
+)
+
+price_stream_fallbacks = Counter(
+    "price_stream_fallbacks",
+    "Total number of fair price requests served by REST fallback because of a stale stream",
+    ["stream"]
+)
+
+price_source_rejections = Counter(
+    "price_source_rejections",
+    "Total number of prices of aggregated sources rejected per reason (error, timeout, outlier)",
+    ["source", "reason"]
+)
+
+order_tracker_resyncs = Counter(
+    "order_tracker_resyncs",
+    "Total number of full order reads of event-driven order trackers per reason",
+    ["instance", "reason"]
+)
+
+skipped_order_updates = Counter(
+    "skipped_order_updates",
+    "Total number of order updates the reconciler skipped since their benefit didn't cover the fee",
+    ["instance"]
+)
+
+fee_estimates = Counter(
+    "fee_estimates",
+    "Resource bounds lookups of the fee model by result (hit, stale or miss)",
+    ["result"],
+)
+
+abi_lookups = Counter(
+    "abi_lookups",
+    "Contract ABI lookups of the ABI cache by result (memory, disk or fetched)",
+    ["result"],
+)
+
+instance_restarts = Counter(
+    "instance_restarts",
+    "Total number of restarts of strategy instances after a failure",
+    ["instance"],
+)
+
+shard_restarts = Counter(
+    "shard_restarts",
+    "Total number of restarts of shard processes after a crash",
+    ["shard"],
+)
+
+signing_time = Histogram(
+    "signing_seconds",
+    "Time (in seconds) it took to sign a payload in the signing pool, by kind of the payload",
+    ["kind"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+
+nonce_gaps = Counter(
+    "nonce_gaps",
+    "Nonces that were not consumed and are handed out again, by reason",
+    ["reason"],
+)
+
+tx_confirmation_time = Gauge(
+    "tx_confirmation_time",
+    "Time (in seconds) it took to confirm the last sent transaction",
+    ["instance"],
 )
 
-total_orders_sent = Counter("total_orders_sent", "Total number of orders sent")
+total_orders_sent = Counter("total_orders_sent", "Total number of orders sent", ["instance"])
 
 total_orders_canceled = Counter(
-    "total_orders_canceled", "Total amount of orders that was sent"
+    "total_orders_canceled", "Total amount of orders that was sent", ["instance"]
 )
 
-current_position_base = Gauge("current_position_base", "Current position in base token")
+current_position_base = Gauge(
+    "current_position_base", "Current position in base token", ["instance"]
+)
 current_position_quote = Gauge(
-    "current_position_quote", "Current position in quote token"
+    "current_position_quote", "Current position in quote token", ["instance"]
 )
 
-current_spread = Gauge("current_spread", "Current quoted spread")
-current_fp = Gauge("current_fair_price", "Current fair price")
-current_best_ask_price = Gauge("current_best_ask_price", "Current best ask price")
-current_best_bid_price = Gauge("current_best_bid_price", "Current best bid price")
-current_best_ask_amount = Gauge("current_best_ask_amount", "Current best ask amount")
-current_best_bid_amount = Gauge("current_best_bid_amount", "Current best bid amount")
+current_spread = Gauge("current_spread", "Current quoted spread", ["instance"])
+current_fp = Gauge("current_fair_price", "Current fair price", ["instance"])
+current_best_ask_price = Gauge("current_best_ask_price", "Current best ask price", ["instance"])
+current_best_bid_price = Gauge("current_best_bid_price", "Current best bid price", ["instance"])
+current_best_ask_amount = Gauge("current_best_ask_amount", "Current best ask amount", ["instance"])
+current_best_bid_amount = Gauge("current_best_bid_amount", "Current best bid amount", ["instance"])
 
 class PrometheusMetricsErrorHandler(logging.Handler):
     def emit(self, record: logging.LogRecord) -> None:
         if record.levelno >= logging.ERROR:
-            last_error_gauge.set(int(time.time()))
+            last_error_gauge.labels(instance=_instance.get()).set(int(time.time()))
 
 
 def track_loop_time(interval: float) -> None:
-    loop_time.set(interval)
+    loop_time.labels(instance=_instance.get()).set(interval)
 
 
 def track_state_update_time(interval: float) -> None:
-    state_update_time.set(interval)
+    state_update_time.labels(instance=_instance.get()).set(interval)
+
+
+def track_stage_time(stage: str, interval: float) -> None:
+    pulse_stage_time.labels(instance=_instance.get(), stage=stage).observe(interval)
+
+
+def track_pulse_triggers(triggers: Iterable[str]) -> None:
+    for trigger in triggers:
+        pulse_triggers.labels(instance=_instance.get(), trigger=trigger).inc()
+
+
+def track_price_stream_fallback(stream: str) -> None:
+    price_stream_fallbacks.labels(stream=stream).inc()
+
+
+def track_price_source_rejection(source: str, reason: str) -> None:
+    price_source_rejections.labels(source=source, reason=reason).inc()
+
+
+def track_order_tracker_resync(reason: str) -> None:
+    order_tracker_resyncs.labels(instance=_instance.get(), reason=reason).inc()
+
+
+def track_skipped_order_updates(val: int) -> None:
+    skipped_order_updates.labels(instance=_instance.get()).inc(val)
+
+
+def track_fee_estimate(result: str) -> None:
+    fee_estimates.labels(result=result).inc()
+
+
+def track_abi_lookup(result: str) -> None:
+    abi_lookups.labels(result=result).inc()
+
+
+def track_instance_restart() -> None:
+    instance_restarts.labels(instance=_instance.get()).inc()
+
+
+def track_shard_restart(shard: int) -> None:
+    shard_restarts.labels(shard=str(shard)).inc()
+
+
+def track_signing_time(kind: str, interval: float) -> None:
+    signing_time.labels(kind=kind).observe(interval)
+
+
+def track_nonce_gap(reason: str) -> None:
+    nonce_gaps.labels(reason=reason).inc()
+
+
+def track_tx_confirmation_time(interval: float) -> None:
+    tx_confirmation_time.labels(instance=_instance.get()).set(interval)
 
 
 def track_orders_sent(val: int) -> None:
-    total_orders_sent.inc(val)
+    total_orders_sent.labels(instance=_instance.get()).inc(val)
 
 
 def track_orders_canceled(val: int) -> None:
-    total_orders_canceled.inc(val)
+    total_orders_canceled.labels(instance=_instance.get()).inc(val)
 
 
 def track_base_position(val: float) -> None:
-    current_position_base.set(val)
+    current_position_base.labels(instance=_instance.get()).set(val)
 
 
 def track_quote_position(val: float) -> None:
-    current_position_quote.set(val)
+    current_position_quote.labels(instance=_instance.get()).set(val)
 
 
 def track_position(position: PositionInfo) -> None:
@@ -83,22 +272,22 @@ def track_position(position: PositionInfo) -> None:
     track_quote_position(float(position.total_quote))
 
 def track_current_spread(val: float) -> None:
-    current_spread.set(val)
+    current_spread.labels(instance=_instance.get()).set(val)
 
 def track_current_fp(val: float) -> None:
-    current_fp.set(val)
+    current_fp.labels(instance=_instance.get()).set(val)
 
 def track_current_best_ask_price(val: float) -> None:
-    current_best_ask_price.set(val)
+    current_best_ask_price.labels(instance=_instance.get()).set(val)
 
 def track_current_best_bid_price(val: float) -> None:
-    current_best_bid_price.set(val)
+    current_best_bid_price.labels(instance=_instance.get()).set(val)
 
 def track_current_best_ask_amount(val: float) -> None:
-    current_best_ask_amount.set(val)
+    current_best_ask_amount.labels(instance=_instance.get()).set(val)
 
 def track_current_best_bid_amount(val: float) -> None:
-    current_best_bid_amount.set(val)
+    current_best_bid_amount.labels(instance=_instance.get()).set(val)
 
 def track_quoted_info(orders: ReconciledOrders, fair_price: Decimal) -> None:
     orders_in_market = orders.to_keep + orders.to_place
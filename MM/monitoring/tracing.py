@@ -0,0 +1,125 @@
+'''
+This module provides tracing of the pulse hot path.
+
+Each stage of the pulse (oracle fetch, view calls, order chain elements, reconciliation, calldata
+build, fee estimation, transaction send, confirmation wait...) is wrapped in a `span`, which records
+its duration into the `pulse_stage_seconds` Prometheus histogram and exports it as a span tagged
+with the id of the pulse it belongs to.
+
+Spans are logged by the `spans` logger at DEBUG level and, if the `opentelemetry-api` package
+is installed (and an OpenTelemetry SDK configured), exported through OpenTelemetry as well.
+The pulse id propagates to the tasks spawned during the pulse, since it is kept in a context variable.
+'''
+
+import importlib
+import importlib.util
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+from monitoring import metrics
+
+_pulse_id: ContextVar[int | None] = ContextVar("pulse_id", default=None)
+_pulse_ids = itertools.count(1)
+
+_span_logger = logging.getLogger("spans")
+
+_enabled = True
+
+# Called with the stage and the duration of every finished span, eg. by benchmarks.
+SpanListener = Callable[[str, float], None]
+_listeners: list[SpanListener] = []
+
+_tracer: Any = None
+if importlib.util.find_spec("opentelemetry") is not None:
+    _tracer = importlib.import_module("opentelemetry.trace").get_tracer("MM")
+
+
+def set_enabled(enabled: bool) -> None:
+    '''
+    Turns the spans on or off. Backtests turn them off, as they run the pulse without the platform
+    and the stage times of a replay don't belong among the metrics of the live strategy.
+    '''
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def add_span_listener(listener: SpanListener) -> None:
+    _listeners.append(listener)
+
+
+def remove_span_listener(listener: SpanListener) -> None:
+    _listeners.remove(listener)
+
+
+def start_pulse() -> int:
+    '''
+    Assigns a new pulse id to the current context (and tasks spawned from it).
+    '''
+    pulse_id = next(_pulse_ids)
+    _pulse_id.set(pulse_id)
+    return pulse_id
+
+
+def current_pulse_id() -> int | None:
+    return _pulse_id.get()
+
+
+@contextmanager
+def span(stage: str, **attributes: str | int | float) -> Iterator[None]:
+    '''
+    Measures the duration of the enclosed stage of the current pulse.
+    '''
+    if not _enabled:
+        yield
+        return
+
+    pulse_id = _pulse_id.get()
+    status = "ok"
+
+    otel_span = None
+    if _tracer is not None:
+        otel_span = _tracer.start_span(
+            stage, attributes={"pulse_id": pulse_id if pulse_id is not None else -1, **attributes}
+        )
+
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        duration = time.perf_counter() - start
+
+        metrics.track_stage_time(stage, duration)
+        for listener in _listeners:
+            listener(stage, duration)
+        _span_logger.debug(
+            "pulse=%s stage=%s duration=%.6f status=%s %s",
+            pulse_id, stage, duration, status,
+            " ".join(f"{k}={v}" for k, v in attributes.items()),
+        )
+
+        if otel_span is not None:
+            otel_span.set_attribute("status", status)
+            otel_span.end()
+
+
+class PulseIdLogFilter(logging.Filter):
+    '''
+    Adds `pulse_id` of the current pulse and the strategy `instance` it belongs to
+    to log records, so that they can be used in the log format.
+    '''
+    def filter(self, record: logging.LogRecord) -> bool:
+        pulse_id = _pulse_id.get()
+        record.pulse_id = pulse_id if pulse_id is not None else "-"
+        record.instance = metrics.current_instance()
+        return True
@@ -0,0 +1,189 @@
+'''
+This module provides process-wide HTTP sessions with keep-alive connection pooling, so that
+oracle, venue and RPC calls don't pay a fresh TCP+TLS handshake on every pulse.
+
+`HttpSession` wraps a pooled `httpx.AsyncClient` (used by data sources and venue views) and adds
+per-host concurrency limits and retries with exponential backoff for idempotent requests.
+`get_rpc_session` returns a pooled `aiohttp.ClientSession` for starknet_py's `FullNodeClient`
+and `get_ws_session` the one long-lived websocket streams connect with.
+'''
+
+import asyncio
+import importlib.util
+import logging
+from typing import Any
+from urllib.parse import urlsplit
+
+import aiohttp
+import httpx
+
+from cfg.cfg_classes import HttpConfig
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class HttpSession:
+    '''
+    Pooled HTTP session shared by all data sources and venue views.
+    HTTP/2 is used only if enabled in the config and the `h2` package is installed.
+    '''
+    def __init__(self, cfg: HttpConfig) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        self._cfg = cfg
+
+        http2 = cfg.http2 and importlib.util.find_spec("h2") is not None
+        if cfg.http2 and not http2:
+            self._logger.info("Package `h2` is not installed, falling back to HTTP/1.1")
+
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=cfg.max_connections,
+                max_keepalive_connections=cfg.max_keepalive_connections,
+                keepalive_expiry=float(cfg.keepalive_expiry),
+            ),
+            timeout=httpx.Timeout(
+                float(cfg.timeout),
+                connect=float(cfg.connect_timeout),
+            ),
+        )
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        '''
+        Sends a request built from the arguments, see `send`.
+        '''
+        return await self.send(self.client.build_request(method, url, **kwargs))
+
+    async def send(self, request: httpx.Request) -> httpx.Response:
+        '''
+        Sends the request while respecting the per-host connection limit.
+        Idempotent requests are retried on transport errors and retryable status codes.
+        '''
+        retries = self._cfg.retries if request.method in IDEMPOTENT_METHODS else 0
+
+        async with self._host_limit(request.url.host):
+            for attempt in range(retries + 1):
+                try:
+                    response = await self.client.send(request)
+                except httpx.TransportError as e:
+                    if attempt == retries:
+                        raise
+                    self._logger.warning("Request to %s failed: %s, retrying", request.url.host, e)
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                        return response
+                    await response.aclose()
+                    self._logger.warning(
+                        "Request to %s returned %s, retrying", request.url.host, response.status_code
+                    )
+
+                await asyncio.sleep(float(self._cfg.retry_backoff) * 2**attempt)
+
+        raise AssertionError("unreachable")
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    def _host_limit(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._cfg.max_connections_per_host)
+            self._host_limits[host] = semaphore
+        return semaphore
+
+
+_http_config = HttpConfig()
+_http_session: HttpSession | None = None
+_rpc_sessions: dict[str, aiohttp.ClientSession] = {}
+_ws_session: aiohttp.ClientSession | None = None
+
+
+def configure_http_sessions(cfg: HttpConfig) -> None:
+    '''
+    Sets the configuration used for the shared sessions. Has to be called before
+    the sessions are first used.
+    '''
+    global _http_config
+
+    if _http_session is not None or _rpc_sessions or _ws_session is not None:
+        raise RuntimeError("HTTP sessions are already in use, unable to reconfigure them")
+
+    _http_config = cfg
+
+
+def get_http_session() -> HttpSession:
+    '''
+    Returns the process-wide HttpSession, creating it on first use.
+    '''
+    global _http_session
+
+    if _http_session is None:
+        _http_session = HttpSession(_http_config)
+
+    return _http_session
+
+
+def get_rpc_session(rpc_url: str) -> aiohttp.ClientSession:
+    '''
+    Returns the process-wide aiohttp session for the host of given rpc url.
+    Has to be called from within a running event loop.
+    '''
+    host = urlsplit(rpc_url).netloc
+
+    session = _rpc_sessions.get(host)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=_http_config.max_connections,
+                limit_per_host=_http_config.max_connections_per_host,
+                keepalive_timeout=float(_http_config.keepalive_expiry),
+            ),
+            timeout=aiohttp.ClientTimeout(
+                total=float(_http_config.timeout),
+                connect=float(_http_config.connect_timeout),
+            ),
+        )
+        _rpc_sessions[host] = session
+
+    return session
+
+
+def get_ws_session() -> aiohttp.ClientSession:
+    '''
+    Returns the process-wide aiohttp session for websocket streams. Unlike the other sessions,
+    it has no total timeout (streams stay connected indefinitely), only the connect timeout.
+    Has to be called from within a running event loop.
+    '''
+    global _ws_session
+
+    if _ws_session is None or _ws_session.closed:
+        _ws_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(
+                total=None,
+                connect=float(_http_config.connect_timeout),
+            ),
+        )
+
+    return _ws_session
+
+
+async def close_http_sessions() -> None:
+    global _http_session, _ws_session
+
+    if _http_session is not None:
+        await _http_session.aclose()
+        _http_session = None
+
+    for session in _rpc_sessions.values():
+        await session.close()
+    _rpc_sessions.clear()
+
+    if _ws_session is not None:
+        await _ws_session.close()
+        _ws_session = None
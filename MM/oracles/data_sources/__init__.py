@@ -1,15 +1,48 @@
+from decimal import Decimal
+
 from .data_source import DataSource
-from .binance import BinanceDataSource
-from .gateio import GateIoDataSource
+from .aggregated import AggregatedDataSource
+from .binance import BinanceDataSource, BinanceStreamingDataSource
+from .gateio import GateIoDataSource, GateIoStreamingDataSource
+from networking.http_session import HttpSession
 
 
-def get_data_source(source: str, base: str, quote: str) -> DataSource:
+def get_data_source(
+    source: str,
+    base: str,
+    quote: str,
+    session: HttpSession | None = None,
+    sources: list[str] | None = None,
+    args: dict[str, Decimal | int | str] | None = None,
+) -> DataSource:
     '''
     Returns a DataSource instance based on the provided source name.
+    If no session is provided, the process-wide shared one is used.
+    Streaming data sources (`*_stream`) have to be started before use.
+    The `aggregated` data source combines the data sources named in `sources`,
+    configured by `args`.
     '''
     if source.lower() == "binance":
-        return BinanceDataSource(base=base, quote=quote)
+        return BinanceDataSource(base=base, quote=quote, session=session)
     elif source.lower() == "gateio":
-        return GateIoDataSource(base=base, quote=quote)
+        return GateIoDataSource(base=base, quote=quote, session=session)
+    elif source.lower() == "binance_stream":
+        return BinanceStreamingDataSource(base=base, quote=quote, session=session)
+    elif source.lower() == "gateio_stream":
+        return GateIoStreamingDataSource(base=base, quote=quote, session=session)
+    elif source.lower() == "aggregated":
+        if not sources:
+            raise ValueError("No `sources` provided for the aggregated data source")
+        args = args or {}
+        return AggregatedDataSource(
+            sources={s: get_data_source(s, base, quote, session) for s in sources},
+            aggregation=str(args.get("aggregation", "median")),
+            quorum=int(args["quorum"]) if "quorum" in args else None,
+            source_timeout=float(args.get("source_timeout", 2)),
+            max_deviation=Decimal(args.get("max_deviation", 3)),
+            min_relative_deviation=Decimal(args.get("min_relative_deviation", "0.001")),
+            volume_ttl=float(args.get("volume_ttl", 300)),
+            outlier_grace=float(args.get("outlier_grace", 0.1)),
+        )
     else:
         raise ValueError(f"Unknown data source `{source}` provided")
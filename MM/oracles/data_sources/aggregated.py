@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import statistics
+from decimal import Decimal
+from typing import final
+
+from monitoring import metrics
+from .data_source import DataSource
+
+AGGREGATIONS = ("median", "vwmean")
+
+# Scales MAD to be a consistent estimator of standard deviation for normally distributed prices.
+MAD_SCALE = Decimal("1.4826")
+# Minimal number of prices the outliers are rejected from.
+MIN_OUTLIER_PRICES = 3
+
+
+@final
+class AggregatedDataSource(DataSource):
+    '''
+    AggregatedDataSource queries all the `sources` concurrently and combines their prices,
+    so that a single slow or broken source doesn't stall nor distort the fair price.
+
+    Each source has `source_timeout` seconds to answer. The price is computed as soon as `quorum`
+    sources answered (majority of the sources by default), the remaining requests are canceled.
+    If fewer than `MIN_OUTLIER_PRICES` prices are in by then, the remaining sources get
+    at most `outlier_grace` more seconds to answer, so that the outliers can be rejected.
+
+    Prices deviating from the median by more than `max_deviation` scaled MADs (median absolute
+    deviations) are rejected as outliers. The deviation is never considered an outlier if it is
+    below `min_relative_deviation` of the median, so that nearly equal prices (and thus close
+    to zero MAD) don't lead to rejection of sources that are off by a fraction of a tick.
+    Outliers can't be told apart with fewer than `MIN_OUTLIER_PRICES` prices (both of two prices
+    are equally far from their median), so all of them are accepted then.
+
+    The accepted prices are combined by `median` or by `vwmean`, the mean weighted by 24h volumes
+    of the sources. Volumes are refreshed in background every `volume_ttl` seconds. If a volume
+    of any accepted source is unknown, the median is used instead.
+
+    The cached price is aggregated the same way, from the cached prices of the sources,
+    if at least `quorum` of them hold one.
+    '''
+    def __init__(
+        self,
+        sources: dict[str, DataSource],
+        aggregation: str = "median",
+        quorum: int | None = None,
+        source_timeout: float = 2,
+        max_deviation: Decimal = Decimal(3),
+        min_relative_deviation: Decimal = Decimal("0.001"),
+        volume_ttl: float = 300,
+        outlier_grace: float = 0.1,
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        if not sources:
+            raise ValueError("No sources to aggregate")
+
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation `{aggregation}`, expected one of {AGGREGATIONS}")
+
+        if quorum is None:
+            quorum = len(sources) // 2 + 1
+
+        if not (1 <= quorum <= len(sources)):
+            raise ValueError(f"Invalid {quorum=} for {len(sources)} sources")
+
+        if source_timeout <= 0 or max_deviation <= 0 or min_relative_deviation < 0 or outlier_grace < 0:
+            raise ValueError(
+                f"Invalid params: {source_timeout=} {max_deviation=} {min_relative_deviation=} {outlier_grace=}"
+            )
+
+        if len(sources) < MIN_OUTLIER_PRICES:
+            self._logger.warning(
+                "Only %s price sources, outliers are rejected from at least %s.",
+                len(sources), MIN_OUTLIER_PRICES
+            )
+
+        self._sources = sources
+        self._aggregation = aggregation
+        self._quorum = quorum
+        self._source_timeout = source_timeout
+        self._outlier_grace = outlier_grace
+        self._max_deviation = max_deviation
+        self._min_relative_deviation = min_relative_deviation
+        self._volume_ttl = volume_ttl
+
+        self._volumes: dict[str, Decimal] = {}
+        self._volumes_updated_at: float | None = None
+        self._volume_task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        for source in self._sources.values():
+            await source.start()
+
+    async def stop(self) -> None:
+        if self._volume_task is not None:
+            self._volume_task.cancel()
+            await asyncio.gather(self._volume_task, return_exceptions=True)
+            self._volume_task = None
+
+        for source in self._sources.values():
+            await source.stop()
+
+    async def get_price(self) -> Decimal:
+        return self._aggregate(await self._collect_quorum())
+
+    def get_cached_price(self) -> Decimal | None:
+        prices: dict[str, Decimal] = {}
+        for name, source in self._sources.items():
+            price = source.get_cached_price()
+            if price is not None:
+                prices[name] = price
+
+        if len(prices) < self._quorum:
+            return None
+
+        return self._aggregate(prices)
+
+    def _aggregate(self, prices: dict[str, Decimal]) -> Decimal:
+        accepted = self._reject_outliers(prices)
+
+        if self._aggregation == "vwmean":
+            self._refresh_volumes_if_stale()
+            weighted = self._weighted_mean(accepted)
+            if weighted is not None:
+                return weighted
+
+        return statistics.median(accepted.values())
+
+    async def get_volume(self) -> Decimal | None:
+        volumes = await asyncio.gather(
+            *(s.get_volume() for s in self._sources.values()), return_exceptions=True
+        )
+        known = [v for v in volumes if isinstance(v, Decimal)]
+        return sum(known, Decimal(0)) if known else None
+
+    async def _collect_quorum(self) -> dict[str, Decimal]:
+        tasks = {
+            asyncio.create_task(asyncio.wait_for(source.get_price(), self._source_timeout)): name
+            for name, source in self._sources.items()
+        }
+
+        loop = asyncio.get_running_loop()
+        prices: dict[str, Decimal] = {}
+        pending = set(tasks)
+        grace_deadline: float | None = None
+        try:
+            while pending:
+                if len(prices) >= self._quorum:
+                    if len(prices) >= MIN_OUTLIER_PRICES:
+                        break
+                    # Quorum is in, the others get a short grace to make outliers detectable.
+                    if grace_deadline is None:
+                        grace_deadline = loop.time() + self._outlier_grace
+                    timeout = grace_deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                else:
+                    timeout = None
+
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = tasks[task]
+                    try:
+                        prices[name] = task.result()
+                    except TimeoutError:
+                        self._logger.warning("Price source `%s` timed out.", name)
+                        metrics.track_price_source_rejection(name, "timeout")
+                    except Exception as e:
+                        self._logger.warning("Price source `%s` failed: %s", name, str(e))
+                        metrics.track_price_source_rejection(name, "error")
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if len(prices) < self._quorum:
+            raise ValueError(
+                f"Only {len(prices)} of {len(self._sources)} price sources answered, "
+                f"quorum is {self._quorum}"
+            )
+
+        return prices
+
+    def _reject_outliers(self, prices: dict[str, Decimal]) -> dict[str, Decimal]:
+        # Warned about once at construction, this is hit on every call with fewer sources.
+        if len(prices) < MIN_OUTLIER_PRICES:
+            return prices
+
+        median = statistics.median(prices.values())
+        mad = statistics.median(abs(p - median) for p in prices.values())
+        threshold = max(self._max_deviation * MAD_SCALE * mad, self._min_relative_deviation * median)
+
+        accepted = {}
+        for name, price in prices.items():
+            if abs(price - median) <= threshold:
+                accepted[name] = price
+            else:
+                self._logger.warning(
+                    "Rejecting price %s of source `%s` as an outlier (median %s).", price, name, median
+                )
+                metrics.track_price_source_rejection(name, "outlier")
+
+        return accepted
+
+    def _weighted_mean(self, prices: dict[str, Decimal]) -> Decimal | None:
+        weights = [self._volumes.get(name, Decimal(0)) for name in prices]
+        if any(w <= 0 for w in weights):
+            return None
+
+        total = sum(weights, Decimal(0))
+        return sum((p * w for p, w in zip(prices.values(), weights)), Decimal(0)) / total
+
+    def _refresh_volumes_if_stale(self) -> None:
+        if self._volume_task is not None and not self._volume_task.done():
+            return
+
+        now = asyncio.get_running_loop().time()
+        if self._volumes_updated_at is not None and now - self._volumes_updated_at < self._volume_ttl:
+            return
+
+        self._volumes_updated_at = now
+        self._volume_task = asyncio.create_task(self._refresh_volumes())
+
+    async def _refresh_volumes(self) -> None:
+        names = list(self._sources)
+        volumes = await asyncio.gather(
+            *(
+                asyncio.wait_for(self._sources[name].get_volume(), self._source_timeout)
+                for name in names
+            ),
+            return_exceptions=True,
+        )
+
+        for name, volume in zip(names, volumes):
+            if isinstance(volume, Decimal):
+                self._volumes[name] = volume
+            else:
+                self._logger.warning("Unable to fetch volume of source `%s`: %s", name, volume)
+                self._volumes.pop(name, None)
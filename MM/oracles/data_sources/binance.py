@@ -1,11 +1,16 @@
 import asyncio
 from decimal import Decimal
-from typing import Awaitable, Callable, final
-import httpx
+from typing import Callable, final
+from networking.http_session import HttpSession, get_http_session
 from .data_source import DataSource
+from .price_stream import (
+    PriceStream, StreamingDataSource, parse_book_ticker_mid, single_price
+)
 
 BINANCE_API_BASE = "https://api.binance.com"
 TRADE_ENDPOINT = "/api/v3/aggTrades"
+TICKER_ENDPOINT = "/api/v3/ticker/24hr"
+BINANCE_WS_BASE = "wss://stream.binance.com:9443/ws"
 
 
 def build_trade_url(base: str, quote: str) -> str:
@@ -13,26 +18,50 @@ def build_trade_url(base: str, quote: str) -> str:
     return f"{BINANCE_API_BASE}{TRADE_ENDPOINT}?symbol={symbol}&limit=1"
 
 
-async def fetch_price(base: str, quote: str) -> Decimal:
+def build_book_ticker_stream(base: str, quote: str, max_staleness: float) -> PriceStream:
+    """Returns a stream of mid prices of `base/quote` trading pair
+    built from Binance best bid/ask updates.
+    """
+    symbol = f"{base.lower()}{quote.lower()}"
+    return PriceStream(
+        name=f"binance:{symbol}",
+        url=f"{BINANCE_WS_BASE}/{symbol}@bookTicker",
+        parse=parse_book_ticker_mid,
+        max_staleness=max_staleness,
+    )
+
+
+async def fetch_price(session: HttpSession, base: str, quote: str) -> Decimal:
     """Fetches the latest price of `base/quote` trading pair from Binance.
     The price is fetched using the latest aggregated trade data.
     """
     url = build_trade_url(base, quote)
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url)
+    resp = await session.get(url)
     resp.raise_for_status()
     data = resp.json()
     return Decimal(data[0]["p"])
 
 
-async def fetch_cross_price(base: str, quote: str, via: str = "USDT") -> Decimal:
+async def fetch_volume(session: HttpSession, base: str, quote: str) -> Decimal:
+    """Fetches the 24h traded volume of `base/quote` trading pair from Binance in quote asset.
+    """
+    symbol = f"{base.upper()}{quote.upper()}"
+    resp = await session.get(f"{BINANCE_API_BASE}{TICKER_ENDPOINT}?symbol={symbol}")
+    resp.raise_for_status()
+    data = resp.json()
+    return Decimal(data["quoteVolume"])
+
+
+async def fetch_cross_price(
+    session: HttpSession, base: str, quote: str, via: str = "USDT"
+) -> Decimal:
     """
     Fetches the price of `base/quote` via a third currency `via`.
     For example, to get the price of `ETH/USDC`, it fetches `ETH/USDT` and `USDC/USDT`
     and calculates the price as `ETH/USDT / USDC/USDT`.
     """
     base_price, quote_price = await asyncio.gather(
-        fetch_price(base, via), fetch_price(quote, via)
+        fetch_price(session, base, via), fetch_price(session, quote, via)
     )
     return base_price / quote_price
 
@@ -44,23 +73,66 @@ class BinanceDataSource(DataSource):
     It supports fetching prices for specific pairs like ETH/USDC, STRK/USDC, and WBTC/USDC.
     If a pair is not supported, it raises a ValueError.
     '''
-    def __init__(self, base: str, quote: str) -> None:
+    def __init__(self, base: str, quote: str, session: HttpSession | None = None) -> None:
         self.base = base.upper()
         self.quote = quote.upper()
-        self._fetcher = self._select_fetcher()
+        self._session = session or get_http_session()
+        self._symbol = self._select_symbol()
 
-    def _select_fetcher(self) -> Callable[[], Awaitable[Decimal]]:
+    def _select_symbol(self) -> tuple[str, str]:
         match (self.base, self.quote):
             case ("ETH", "USDC"):
-                return lambda: fetch_price("ETH", "USDC")
+                return "ETH", "USDC"
             case ("STRK", "USDC"):
-                return lambda: fetch_price("STRK", "USDC")
+                return "STRK", "USDC"
             case ("WBTC", "USDC"):
-                return lambda: fetch_price("BTC", "USDC")
+                return "BTC", "USDC"
             case _:
                 raise ValueError(
                     f"No Binance price fetcher set for `{self.base}/{self.quote}`"
                 )
 
     async def get_price(self) -> Decimal:
-        return await self._fetcher()
+        return await fetch_price(self._session, *self._symbol)
+
+    async def get_volume(self) -> Decimal | None:
+        return await fetch_volume(self._session, *self._symbol)
+
+
+@final
+class BinanceStreamingDataSource(StreamingDataSource):
+    '''
+    BinanceStreamingDataSource streams best bid/ask of the trading pairs from Binance
+    websocket API and provides their mid price without any request on `get_price`.
+    It supports the same pairs as BinanceDataSource, which is used as a fallback
+    whenever a stream has no update younger than `max_staleness` seconds.
+    '''
+    def __init__(
+        self,
+        base: str,
+        quote: str,
+        session: HttpSession | None = None,
+        max_staleness: float = 5,
+    ) -> None:
+        self.base = base.upper()
+        self.quote = quote.upper()
+        self._max_staleness = max_staleness
+        streams, combine = self._select_streams()
+        super().__init__(
+            streams=streams,
+            combine=combine,
+            fallback=BinanceDataSource(base, quote, session),
+        )
+
+    def _select_streams(self) -> tuple[list[PriceStream], Callable[[list[Decimal]], Decimal]]:
+        match (self.base, self.quote):
+            case ("ETH", "USDC"):
+                return [build_book_ticker_stream("ETH", "USDC", self._max_staleness)], single_price
+            case ("STRK", "USDC"):
+                return [build_book_ticker_stream("STRK", "USDC", self._max_staleness)], single_price
+            case ("WBTC", "USDC"):
+                return [build_book_ticker_stream("BTC", "USDC", self._max_staleness)], single_price
+            case _:
+                raise ValueError(
+                    f"No Binance price stream set for `{self.base}/{self.quote}`"
+                )
@@ -17,3 +17,27 @@ class DataSource(ABC):
         Returns a price of `base/quote` pair provided during initialization.
         """
         raise NotImplementedError
+
+    def get_cached_price(self) -> Decimal | None:
+        """
+        Returns the price the data source already holds in memory (eg. streamed in background)
+        without any request, or None if it holds no fresh price.
+        """
+        return None
+
+    async def get_volume(self) -> Decimal | None:
+        """
+        Returns the 24h traded volume of the pair (in quote asset of the traded pair),
+        used for weighting of the sources. None if the source doesn't provide volumes.
+        """
+        return None
+
+    async def start(self) -> None:
+        """
+        Starts background work of the data source (eg. streaming connections), if any.
+        """
+
+    async def stop(self) -> None:
+        """
+        Stops background work started by `start`.
+        """
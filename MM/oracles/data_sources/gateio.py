@@ -1,11 +1,18 @@
 import asyncio
+import time
 from decimal import Decimal
-from typing import Awaitable, Callable, final
-import httpx
+from typing import Any, Callable, final
+from networking.http_session import HttpSession, get_http_session
 from .data_source import DataSource
+from .price_stream import (
+    PriceStream, StreamingDataSource, cross_price, parse_book_ticker_mid
+)
 
 GATEIO_BASE_URL = "https://api.gateio.ws/api/v4"
 TRADE_ENDPOINT = "/spot/trades"
+TICKER_ENDPOINT = "/spot/tickers"
+GATEIO_WS_URL = "wss://api.gateio.ws/ws/v4/"
+BOOK_TICKER_CHANNEL = "spot.book_ticker"
 
 
 def build_trade_url(base: str, quote: str) -> str:
@@ -13,26 +20,67 @@ def build_trade_url(base: str, quote: str) -> str:
     return f"{GATEIO_BASE_URL}{TRADE_ENDPOINT}?currency_pair={symbol}&limit=1"
 
 
-async def fetch_price(base: str, quote: str) -> Decimal:
+def parse_book_ticker_update(message: Any) -> Decimal | None:
+    """Returns the mid price from Gate.io `spot.book_ticker` update,
+    other messages (eg. subscription acknowledgement) are ignored.
+    """
+    if not isinstance(message, dict):
+        return None
+    if message.get("channel") != BOOK_TICKER_CHANNEL or message.get("event") != "update":
+        return None
+    return parse_book_ticker_mid(message.get("result"))
+
+
+def build_book_ticker_stream(base: str, quote: str, max_staleness: float) -> PriceStream:
+    """Returns a stream of mid prices of `base/quote` trading pair
+    built from Gate.io best bid/ask updates.
+    """
+    symbol = f"{base.upper()}_{quote.upper()}"
+    return PriceStream(
+        name=f"gateio:{symbol}",
+        url=GATEIO_WS_URL,
+        parse=parse_book_ticker_update,
+        subscribe=lambda: {
+            "time": int(time.time()),
+            "channel": BOOK_TICKER_CHANNEL,
+            "event": "subscribe",
+            "payload": [symbol],
+        },
+        max_staleness=max_staleness,
+    )
+
+
+async def fetch_price(session: HttpSession, base: str, quote: str) -> Decimal:
     """Fetches the latest price of `base/quote` trading pair from Binance.
     The price is fetched using the latest aggregated trade data.
     """
     url = build_trade_url(base, quote)
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url)
+    resp = await session.get(url)
     resp.raise_for_status()
     data = resp.json()
     return Decimal(data[0]["price"])
 
 
-async def fetch_cross_price(base: str, quote: str, via: str = "USDT") -> Decimal:
+async def fetch_volume(session: HttpSession, base: str, quote: str) -> Decimal:
+    """Fetches the 24h traded volume of `base/quote` trading pair from Gate.io in quote asset.
+    """
+    symbol = f"{base.upper()}_{quote.upper()}"
+    resp = await session.get(f"{GATEIO_BASE_URL}{TICKER_ENDPOINT}?currency_pair={symbol}")
+    resp.raise_for_status()
+    data = resp.json()
+    return Decimal(data[0]["quote_volume"])
+
+
+async def fetch_cross_price(
+    session: HttpSession, base: str, quote: str, via: str = "USDT"
+) -> Decimal:
     """
     Fetches the price of `base/quote` via a third currency `via`.
     For example, to get the price of `ETH/USDC`, it fetches `ETH/USDT` and `USDC/USDT`
     and calculates the price as `ETH/USDT / USDC/USDT`.
     """
     base_price, quote_price = await asyncio.gather(
-        fetch_price(base, via), fetch_price(quote, via)
+        fetch_price(session, base, via), fetch_price(session, quote, via)
     )
     return base_price / quote_price
 
@@ -41,22 +89,67 @@ async def fetch_cross_price(base: str, quote: str, via: str = "USDT") -> Decimal
 class GateIoDataSource(DataSource):
     '''
     GateIoDataSource provides price information for trading pairs on Gate.io.
-    It supports fetching prices for specific pairs like WBTC/DOG.
+    It supports fetching prices for specific pairs like WBTC/DOG, ETH/USDC, STRK/USDC
+    and WBTC/USDC, all of them computed as cross prices via USDT.
     If a pair is not supported, it raises a ValueError.
     '''
-    def __init__(self, base: str, quote: str) -> None:
+    def __init__(self, base: str, quote: str, session: HttpSession | None = None) -> None:
         self.base = base.upper()
         self.quote = quote.upper()
-        self._fetcher = self._select_fetcher()
-
-    def _select_fetcher(self) -> Callable[[], Awaitable[Decimal]]:
-        match (self.base, self.quote):
-            case ("WBTC", "DOG"):
-                return lambda: fetch_cross_price("WBTC", "DOG")
-            case _:
-                raise ValueError(
-                    f"No Binance price fetcher set for `{self.base}/{self.quote}`"
-                )
+        self._session = session or get_http_session()
+        self._pair = _select_pair(self.base, self.quote)
 
     async def get_price(self) -> Decimal:
-        return await self._fetcher()
+        return await fetch_cross_price(self._session, *self._pair)
+
+    async def get_volume(self) -> Decimal | None:
+        # Volume of the `base/USDT` leg, which dominates the liquidity of the cross price.
+        base, _ = self._pair
+        return await fetch_volume(self._session, base, "USDT")
+
+
+@final
+class GateIoStreamingDataSource(StreamingDataSource):
+    '''
+    GateIoStreamingDataSource streams best bid/ask of the trading pairs from Gate.io
+    websocket API and provides their mid price without any request on `get_price`.
+    It supports the same pairs as GateIoDataSource, which is used as a fallback
+    whenever a stream has no update younger than `max_staleness` seconds.
+    '''
+    def __init__(
+        self,
+        base: str,
+        quote: str,
+        session: HttpSession | None = None,
+        max_staleness: float = 5,
+    ) -> None:
+        self.base = base.upper()
+        self.quote = quote.upper()
+        self._max_staleness = max_staleness
+        streams, combine = self._select_streams()
+        super().__init__(
+            streams=streams,
+            combine=combine,
+            fallback=GateIoDataSource(base, quote, session),
+        )
+
+    def _select_streams(self) -> tuple[list[PriceStream], Callable[[list[Decimal]], Decimal]]:
+        base, quote = _select_pair(self.base, self.quote)
+        streams = [
+            build_book_ticker_stream(base, "USDT", self._max_staleness),
+            build_book_ticker_stream(quote, "USDT", self._max_staleness),
+        ]
+        return streams, cross_price
+
+
+def _select_pair(base: str, quote: str) -> tuple[str, str]:
+    '''
+    Returns Gate.io currencies whose USDT prices make up the price of `base/quote`.
+    '''
+    match (base, quote):
+        case ("WBTC", "DOG") | ("ETH", "USDC") | ("STRK", "USDC") | ("WBTC", "USDC"):
+            return base, quote
+        case _:
+            raise ValueError(
+                f"No Gate.io price fetcher set for `{base}/{quote}`"
+            )
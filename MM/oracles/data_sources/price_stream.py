@@ -0,0 +1,195 @@
+import asyncio
+import json
+import logging
+from decimal import Decimal
+from typing import Any, Callable
+
+import aiohttp
+
+from monitoring import metrics
+from networking.http_session import get_ws_session
+from .data_source import DataSource
+
+MIN_RECONNECT_BACKOFF = 0.5
+
+
+class PriceStream:
+    '''
+    Keeps the latest price of a single symbol that is streamed over a websocket.
+
+    The connection is maintained by a background task started with `start`, over the shared
+    websocket session. It reconnects with exponential backoff (from `min_reconnect_backoff` up to
+    `max_reconnect_backoff` seconds) whenever the connection drops.
+    `price` is None until the first update arrives or if the last update is older
+    than `max_staleness` seconds.
+    '''
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        parse: Callable[[Any], Decimal | None],
+        subscribe: Callable[[], dict[str, Any]] | None = None,
+        max_staleness: float = 5,
+        max_reconnect_backoff: float = 30,
+        heartbeat: float = 15,
+        min_reconnect_backoff: float = MIN_RECONNECT_BACKOFF,
+    ) -> None:
+        self._logger = logging.getLogger(f"{self.__class__.__name__}[{name}]")
+
+        self.name = name
+        self._url = url
+        self._parse = parse
+        self._subscribe = subscribe
+        self._max_staleness = max_staleness
+        self._min_reconnect_backoff = min_reconnect_backoff
+        self._max_reconnect_backoff = max_reconnect_backoff
+        self._heartbeat = heartbeat
+
+        self._price: Decimal | None = None
+        self._updated_at: float | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def price(self) -> Decimal | None:
+        if self._price is None or self.age is None or self.age > self._max_staleness:
+            return None
+        return self._price
+
+    @property
+    def age(self) -> float | None:
+        '''
+        Number of seconds since the last price update.
+        '''
+        if self._updated_at is None:
+            return None
+        return asyncio.get_running_loop().time() - self._updated_at
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        backoff = self._min_reconnect_backoff
+        while True:
+            last_update = self._updated_at
+            try:
+                await self._stream(get_ws_session())
+                self._logger.warning("Stream closed by the server, reconnecting.")
+            except Exception as e:
+                self._logger.warning("Stream failed: %s, reconnecting in %ss.", e, backoff)
+
+            # Connection that delivered some updates was healthy, start backing off anew.
+            if self._updated_at != last_update:
+                backoff = self._min_reconnect_backoff
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self._max_reconnect_backoff)
+
+    async def _stream(self, session: aiohttp.ClientSession) -> None:
+        async with session.ws_connect(self._url, heartbeat=self._heartbeat) as ws:
+            self._logger.info("Connected to %s", self._url)
+
+            if self._subscribe is not None:
+                await ws.send_json(self._subscribe())
+
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    if msg.type == aiohttp.WSMsgType.ERROR:
+                        raise ws.exception() or ConnectionError("Websocket error")
+                    continue
+
+                price = self._parse(json.loads(msg.data))
+                if price is not None:
+                    self._price = price
+                    self._updated_at = asyncio.get_running_loop().time()
+
+
+class StreamingDataSource(DataSource):
+    '''
+    Base class for data sources whose prices are streamed in background by PriceStreams,
+    so that `get_price` returns instantly from memory.
+
+    The price is computed from the latest prices of all `streams` by `combine`. If any stream
+    has no fresh price (eg. during reconnect), the price is fetched from the REST `fallback` instead.
+    '''
+    def __init__(
+        self,
+        streams: list[PriceStream],
+        combine: Callable[[list[Decimal]], Decimal],
+        fallback: DataSource,
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        self._streams = streams
+        self._combine = combine
+        self._fallback = fallback
+
+    async def start(self) -> None:
+        for stream in self._streams:
+            await stream.start()
+
+    async def stop(self) -> None:
+        for stream in self._streams:
+            await stream.stop()
+
+    def get_cached_price(self) -> Decimal | None:
+        prices: list[Decimal] = []
+
+        for stream in self._streams:
+            price = stream.price
+            if price is None:
+                return None
+            prices.append(price)
+
+        return self._combine(prices)
+
+    async def get_price(self) -> Decimal:
+        prices: list[Decimal] = []
+
+        for stream in self._streams:
+            price = stream.price
+            if price is None:
+                self._logger.info("No fresh price in stream `%s`, using REST fallback.", stream.name)
+                metrics.track_price_stream_fallback(stream.name)
+                return await self._fallback.get_price()
+            prices.append(price)
+
+        return self._combine(prices)
+
+    async def get_volume(self) -> Decimal | None:
+        return await self._fallback.get_volume()
+
+
+def parse_book_ticker_mid(ticker: Any) -> Decimal | None:
+    '''
+    Returns the mid price of a book ticker update with `b` (best bid) and `a` (best ask) fields.
+    '''
+    if not isinstance(ticker, dict) or "b" not in ticker or "a" not in ticker:
+        return None
+
+    bid = Decimal(ticker["b"])
+    ask = Decimal(ticker["a"])
+    if bid <= 0 or ask <= 0:
+        return None
+
+    return (bid + ask) / 2
+
+
+def single_price(prices: list[Decimal]) -> Decimal:
+    return prices[0]
+
+
+def cross_price(prices: list[Decimal]) -> Decimal:
+    '''
+    Combines `base/via` and `quote/via` prices into `base/quote` price.
+    '''
+    base_price, quote_price = prices
+    return base_price / quote_price
@@ -0,0 +1,52 @@
+"""
+This script runs multiple strategies, ie. multiple markets traded by one or more accounts,
+in a single process. They share the HTTP and RPC connections, the price sources and the
+nonces of each account, and expose their metrics, labeled by instance, on a single port.
+
+With `shards` set in the `[orchestrator]` config, the strategies are spread across that many
+worker processes, supervised by this one (see `ShardSupervisor`).
+
+See `cfg.load_orchestrator_config` for the format of the config.
+"""
+
+import asyncio
+import logging
+import pprint
+
+from orchestration import Orchestrator, ShardSupervisor
+from cfg import load_orchestrator_config
+from args import parse_args
+from monitoring import metrics
+from monitoring.logs import INSTANCE_LOG_FORMAT, setup_logging
+from networking.http_session import configure_http_sessions, close_http_sessions
+from signing import configure_signing, close_signing_service
+
+
+async def main() -> None:
+
+    args = parse_args()
+
+    cfg = load_orchestrator_config(args.cfg_path)
+
+    setup_logging("DEBUG", log_format=INSTANCE_LOG_FORMAT)
+
+    logging.info(f"Loaded config:\n {pprint.pformat(dict(cfg))}")
+
+    configure_http_sessions(cfg.http)
+    configure_signing(cfg.signing)
+
+    try:
+        if cfg.shards == 1:
+            metrics.start_metrics_server(cfg.metrics_port)
+            await Orchestrator(cfg).run()
+        else:
+            supervisor = ShardSupervisor(cfg, log_format=INSTANCE_LOG_FORMAT)
+            metrics.start_metrics_server(cfg.metrics_port, multiprocess_dir=supervisor.multiprocess_dir)
+            await supervisor.run()
+    finally:
+        await close_http_sessions()
+        close_signing_service()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,6 @@
+from .orchestrator import Orchestrator
+from .shared_resources import SharedResources
+from .sharding import ShardSupervisor
+from .strategy_instance import StrategyInstance
+
+__all__ = ["Orchestrator", "SharedResources", "ShardSupervisor", "StrategyInstance"]
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from collections import defaultdict
+
+from cfg.cfg_classes import OrchestratorConfig
+from markets.starknet_markets.market_setup import setup_starknet_markets
+from monitoring import metrics
+from platforms.starknet.starknet_account import WAccount
+
+from .shared_resources import SharedResources
+from .strategy_instance import StrategyInstance
+
+
+class Orchestrator:
+    '''
+    Runs multiple strategy instances in a single asyncio loop, sharing the resources
+    (accounts, data sources, HTTP and RPC sessions) between them.
+
+    The instances are built concurrently and the markets of each account are set up together,
+    in at most one transaction per account. Then each instance runs its own pulse loop.
+
+    Failures are isolated per instance: an instance that fails to build, set up or run is logged,
+    counted in the `instance_restarts` metric and started again after `restart_delay` seconds,
+    while the others keep running. All the metrics and logs of an instance are labeled by its name.
+    '''
+    def __init__(self, cfg: OrchestratorConfig, resources: SharedResources | None = None) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        self._restart_delay = float(cfg.restart_delay)
+        self._resources = resources if resources is not None else SharedResources()
+        self._instances = [
+            StrategyInstance(name=name, cfg=instance_cfg, resources=self._resources)
+            for name, instance_cfg in cfg.instances.items()
+        ]
+
+    async def run(self) -> None:
+        '''
+        Runs all the instances until canceled.
+        '''
+        self._logger.info("Starting %s strategy instance(s).", len(self._instances))
+        try:
+            ready = await self._start_all()
+            await asyncio.gather(
+                *(self._supervise(instance, ready=instance in ready) for instance in self._instances)
+            )
+        finally:
+            await self._resources.close()
+
+    async def _start_all(self) -> list[StrategyInstance]:
+        # Returns the instances that were built and set up.
+        results = await asyncio.gather(
+            *(self._build(instance) for instance in self._instances), return_exceptions=True
+        )
+        built = [i for i, result in zip(self._instances, results) if not isinstance(result, BaseException)]
+
+        by_account: dict[WAccount, list[StrategyInstance]] = defaultdict(list)
+        for instance in built:
+            by_account[instance.platform.account].append(instance)
+
+        setups = await asyncio.gather(
+            *(
+                setup_starknet_markets(account, [i.platform.market for i in instances])
+                for account, instances in by_account.items()
+            ),
+            return_exceptions=True,
+        )
+
+        ready: list[StrategyInstance] = []
+        for (account, instances), setup in zip(by_account.items(), setups):
+            if isinstance(setup, BaseException):
+                self._logger.error(
+                    "Setup of markets of account %s failed: %s", hex(account.address), str(setup)
+                )
+            else:
+                ready.extend(instances)
+
+        return ready
+
+    async def _build(self, instance: StrategyInstance) -> None:
+        metrics.set_instance(instance.name)
+        try:
+            await instance.build()
+        except Exception as e:
+            self._logger.error("Unable to build instance `%s`: %s", instance.name, str(e), exc_info=True)
+            raise
+
+    async def _supervise(self, instance: StrategyInstance, ready: bool) -> None:
+        metrics.set_instance(instance.name)
+
+        while True:
+            try:
+                if not ready:
+                    await instance.build()
+                    await setup_starknet_markets(instance.platform.account, [instance.platform.market])
+                ready = False
+
+                await instance.run()
+                self._logger.error("Instance `%s` stopped.", instance.name)
+            except Exception as e:
+                self._logger.error("Instance `%s` failed: %s", instance.name, str(e), exc_info=True)
+
+            metrics.track_instance_restart()
+            self._logger.info("Restarting instance `%s` in %s s.", instance.name, self._restart_delay)
+            await asyncio.sleep(self._restart_delay)
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import struct
+import time
+from decimal import Decimal
+from multiprocessing.shared_memory import SharedMemory
+
+from oracles.data_sources.data_source import DataSource
+
+# Slot of a price: sequence number, publish timestamp and the price as a decimal string.
+_SEQUENCE = struct.Struct("<Q")
+_VALUE = struct.Struct("<d64s")
+SLOT_SIZE = _SEQUENCE.size + _VALUE.size
+
+
+class StalePriceError(Exception):
+    '''
+    Raised when the price on the board is missing or older than allowed.
+    '''
+
+
+class FairPriceBoard:
+    '''
+    Fair prices published by one process and read by others through shared memory.
+
+    Each price source has its own slot, identified by its key (the config of the price source).
+    A slot is written by a single publisher and guarded by a sequence number (seqlock), which
+    is odd while the slot is being written, so that readers never see a half-written price and
+    never block the publisher.
+    '''
+    def __init__(self, keys: list[str], name: str | None = None) -> None:
+        self._slots = {key: i for i, key in enumerate(keys)}
+        self.keys = list(keys)
+
+        create = name is None
+        self._memory = SharedMemory(name=name, create=create, size=max(1, len(keys)) * SLOT_SIZE)
+        self._owner = create
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def publish(self, key: str, price: Decimal) -> None:
+        offset = self._slots[key] * SLOT_SIZE
+        buf = self._memory.buf
+        assert buf is not None
+
+        (sequence,) = _SEQUENCE.unpack_from(buf, offset)
+        _SEQUENCE.pack_into(buf, offset, sequence + 1)
+        _VALUE.pack_into(buf, offset + _SEQUENCE.size, time.time(), str(price).encode())
+        _SEQUENCE.pack_into(buf, offset, sequence + 2)
+
+    def read(self, key: str) -> tuple[Decimal, float] | None:
+        '''
+        Returns the last published price with its timestamp, None if it was not published yet.
+        '''
+        offset = self._slots[key] * SLOT_SIZE
+        buf = self._memory.buf
+        assert buf is not None
+
+        while True:
+            (before,) = _SEQUENCE.unpack_from(buf, offset)
+            if before == 0:
+                return None
+            if before % 2:
+                continue
+
+            timestamp, raw = _VALUE.unpack_from(buf, offset + _SEQUENCE.size)
+
+            (after,) = _SEQUENCE.unpack_from(buf, offset)
+            if before == after:
+                return Decimal(raw.rstrip(b"\0").decode()), timestamp
+
+    def close(self) -> None:
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+
+class BoardDataSource(DataSource):
+    '''
+    Data source reading the fair price published on the FairPriceBoard by another process.
+    '''
+    def __init__(self, board: FairPriceBoard, key: str, max_age: float = 10) -> None:
+        self._board = board
+        self._key = key
+        self._max_age = max_age
+
+    async def get_price(self) -> Decimal:
+        published = self._board.read(self._key)
+        if published is None:
+            raise StalePriceError("No fair price published yet")
+
+        price, timestamp = published
+        age = time.time() - timestamp
+        if age > self._max_age:
+            raise StalePriceError(f"Fair price is {age:.1f}s old")
+
+        return price
+
+
+async def publish_prices(
+    board: FairPriceBoard, sources: dict[str, DataSource], interval: float
+) -> None:
+    '''
+    Publishes the prices of the data sources, keyed like on the board, every `interval` seconds.
+    '''
+    logger = logging.getLogger("FairPriceBoard")
+
+    async def publish(key: str, source: DataSource) -> None:
+        while True:
+            try:
+                board.publish(key, await source.get_price())
+            except Exception as e:
+                logger.warning("Unable to get price of %s: %s", key, str(e))
+            await asyncio.sleep(interval)
+
+    await asyncio.gather(*(publish(key, source) for key, source in sources.items()))
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from multiprocessing import get_context
+from multiprocessing.process import BaseProcess
+
+from prometheus_client import multiprocess
+
+from cfg.cfg_classes import OrchestratorConfig, StrategyConfig
+from monitoring import metrics
+from monitoring.logs import setup_logging
+from networking.http_session import close_http_sessions, configure_http_sessions
+from signing import close_signing_service, configure_signing
+
+from .orchestrator import Orchestrator
+from .price_board import FairPriceBoard, publish_prices
+from .shared_resources import SharedResources, price_source_key
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def partition_instances(
+    instances: dict[str, StrategyConfig], shards: int
+) -> list[dict[str, StrategyConfig]]:
+    '''
+    Spreads the instances across at most `shards` shards, evenly by their number.
+    Instances of one account are kept in the same shard, as its nonces are managed by one process.
+    '''
+    by_account: dict[str, dict[str, StrategyConfig]] = {}
+    for name, cfg in instances.items():
+        account = str(cfg.platform.config.account.wallet_address)
+        by_account.setdefault(account, {})[name] = cfg
+
+    partitions: list[dict[str, StrategyConfig]] = [{} for _ in range(min(shards, len(by_account)))]
+    # Largest groups first, each to the least loaded shard.
+    for group in sorted(by_account.values(), key=len, reverse=True):
+        min(partitions, key=len).update(group)
+
+    return partitions
+
+
+class ShardSupervisor:
+    '''
+    Runs the strategy instances in multiple worker processes (shards), each running an Orchestrator
+    of its own instances, so that their CPU-bound work (order chain arithmetic, ABI serialization,
+    signing) runs in parallel instead of serializing on the GIL of a single process.
+
+    Fair prices are fetched once, by the supervisor, and published to all the shards through
+    a FairPriceBoard in shared memory. Metrics of the shards are written in the prometheus_client
+    multiprocess mode and served, together with the supervisor's, on the supervisor's port.
+
+    Shards that crash are started again after `restart_delay` seconds.
+    '''
+    def __init__(self, cfg: OrchestratorConfig, log_format: str) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        self._cfg = cfg
+        self._log_format = log_format
+        self._partitions = partition_instances(cfg.instances, cfg.shards or os.cpu_count() or 1)
+        self._restart_delay = float(cfg.restart_delay)
+
+        # Started by `spawn`, as forking a process with a running event loop is not safe.
+        self._context = get_context("spawn")
+        self._processes: dict[int, BaseProcess] = {}
+
+        self.multiprocess_dir = os.environ.get(MULTIPROC_DIR_ENV) or tempfile.mkdtemp(prefix="mm-metrics-")
+        # Inherited by the shards.
+        os.environ[MULTIPROC_DIR_ENV] = self.multiprocess_dir
+
+    async def run(self) -> None:
+        '''
+        Runs the shards until canceled.
+        '''
+        resources = SharedResources()
+        price_sources = {
+            price_source_key(cfg.price_source): cfg.price_source for cfg in self._cfg.instances.values()
+        }
+        sources = {key: await resources.get_data_source(cfg) for key, cfg in price_sources.items()}
+
+        board = FairPriceBoard(keys=list(sources))
+        publisher = asyncio.create_task(
+            publish_prices(board, sources, interval=float(self._cfg.price_publish_interval))
+        )
+
+        self._logger.info(
+            "Running %s instance(s) in %s shard(s).", len(self._cfg.instances), len(self._partitions)
+        )
+        try:
+            restart_at: dict[int, float] = {}
+            for shard in range(len(self._partitions)):
+                self._start(shard, board)
+
+            while True:
+                await asyncio.sleep(1)
+
+                for shard, process in self._processes.items():
+                    if shard in restart_at or process.is_alive():
+                        continue
+
+                    self._logger.error(
+                        "Shard %s crashed with exit code %s, restarting in %s s.",
+                        shard, process.exitcode, self._restart_delay,
+                    )
+                    if process.pid is not None:
+                        multiprocess.mark_process_dead(process.pid, self.multiprocess_dir)  # type: ignore[no-untyped-call]
+                    metrics.track_shard_restart(shard)
+                    restart_at[shard] = time.monotonic() + self._restart_delay
+
+                for shard, at in list(restart_at.items()):
+                    if time.monotonic() >= at:
+                        del restart_at[shard]
+                        self._start(shard, board)
+        finally:
+            publisher.cancel()
+            await self._stop_all()
+            board.close()
+            await resources.close()
+
+    def _start(self, shard: int, board: FairPriceBoard) -> None:
+        cfg = self._cfg.model_copy(update={"instances": self._partitions[shard]})
+
+        process = self._context.Process(
+            target=_run_shard,
+            args=(shard, cfg.model_dump_json(), board.name, board.keys, self._log_format),
+            name=f"shard-{shard}",
+            daemon=True,
+        )
+        process.start()
+        self._processes[shard] = process
+        self._logger.info(
+            "Shard %s (pid %s) started with instances: %s",
+            shard, process.pid, ", ".join(self._partitions[shard]),
+        )
+
+    async def _stop_all(self) -> None:
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self._processes.values():
+            await asyncio.to_thread(process.join, 10)
+
+
+def _run_shard(shard: int, cfg_json: str, board_name: str, board_keys: list[str], log_format: str) -> None:
+    # Entry point of a shard process.
+    setup_logging("DEBUG", log_format=log_format)
+    logging.info("Shard %s started.", shard)
+
+    cfg = OrchestratorConfig.model_validate_json(cfg_json)
+    asyncio.run(_run_shard_orchestrator(cfg, FairPriceBoard(keys=board_keys, name=board_name)))
+
+
+async def _run_shard_orchestrator(cfg: OrchestratorConfig, board: FairPriceBoard) -> None:
+    configure_http_sessions(cfg.http)
+    configure_signing(cfg.signing)
+    resources = SharedResources(price_board=board, max_price_age=float(cfg.max_price_age))
+    try:
+        await Orchestrator(cfg, resources=resources).run()
+    finally:
+        await close_http_sessions()
+        close_signing_service()
+        board.close()
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+
+from cfg.cfg_classes import PriceSourceConfig, StrategyConfig
+from oracles.data_sources import get_data_source
+from oracles.data_sources.data_source import DataSource
+from platforms.starknet.starknet_account import WAccount, get_wrapped_account
+
+from .price_board import BoardDataSource, FairPriceBoard
+
+
+class SharedResources:
+    '''
+    Resources shared by the strategy instances running in one process.
+
+    Instances trading from the same wallet share one WAccount, so that its nonces are handed out
+    by a single NonceManager and its view calls, fee estimates and ABIs are shared. The account is
+    configured by the platform config of the first instance that asks for it.
+    Instances following the same price source share one (started) data source, so that eg.
+    a single websocket stream serves all of them. HTTP and RPC sessions are shared process-wide.
+
+    If a `price_board` is given, the prices are read from it instead, as published by another
+    process (see ShardSupervisor).
+    '''
+    def __init__(self, price_board: FairPriceBoard | None = None, max_price_age: float = 10) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        self._price_board = price_board
+        self._max_price_age = max_price_age
+
+        self._accounts: dict[str, WAccount] = {}
+        self._data_sources: dict[str, DataSource] = {}
+        self._data_source_starts: dict[str, asyncio.Task[None]] = {}
+
+    def get_account(self, cfg: StrategyConfig) -> WAccount:
+        platform_cfg = cfg.platform.config
+        key = str(platform_cfg.account.wallet_address)
+
+        account = self._accounts.get(key)
+        if account is None:
+            account = get_wrapped_account(
+                platform_cfg.account,
+                fee_cfg=platform_cfg.fee,
+                max_in_flight=platform_cfg.max_in_flight_transactions,
+                abi_cache_dir=platform_cfg.abi_cache_dir,
+            )
+            self._accounts[key] = account
+
+        return account
+
+    async def get_data_source(self, cfg: PriceSourceConfig) -> DataSource:
+        '''
+        Returns the started data source of given config.
+        '''
+        key = price_source_key(cfg)
+
+        if self._price_board is not None:
+            return BoardDataSource(self._price_board, key, max_age=self._max_price_age)
+
+        if key not in self._data_sources:
+            data_source = get_data_source(
+                cfg.price_source,
+                cfg.base_asset,
+                cfg.quote_asset,
+                sources=cfg.sources,
+                args=cfg.args,
+            )
+            self._data_sources[key] = data_source
+            self._data_source_starts[key] = asyncio.create_task(data_source.start())
+
+        start = self._data_source_starts[key]
+        try:
+            await asyncio.shield(start)
+        except Exception:
+            # Next instance asking for it tries again.
+            if self._data_source_starts.get(key) is start:
+                del self._data_sources[key]
+                del self._data_source_starts[key]
+            raise
+
+        return self._data_sources[key]
+
+    async def close(self) -> None:
+        results = await asyncio.gather(
+            *(data_source.stop() for data_source in self._data_sources.values()),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self._logger.warning("Unable to stop data source: %s", str(result))
+
+        self._data_sources.clear()
+        self._data_source_starts.clear()
+
+
+def price_source_key(cfg: PriceSourceConfig) -> str:
+    '''
+    Identifies the price source, instances with the same key share it.
+    '''
+    return cfg.model_dump_json()
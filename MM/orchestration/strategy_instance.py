@@ -0,0 +1,138 @@
+import logging
+import time
+
+from cfg.cfg_classes import StrategyConfig
+from marketmaking.marketmakers.simple_marketmaker import SimpleMarketMaker
+from marketmaking.order import BasicOrder
+from marketmaking.orderchain.order_chain import OrderChain
+from marketmaking.reconciling import get_reconciler
+from monitoring import metrics, tracing
+from platforms.starknet.starknet_platform import StarknetPlatform
+from scheduling import get_pulse_scheduler
+from scheduling.pulse_scheduler import PulseScheduler
+from state.state_fetcher import PollingStateFetcher
+
+from .shared_resources import SharedResources
+
+
+class StrategyInstance:
+    '''
+    A single market making strategy, ie. one market traded by one account, configured
+    by a StrategyConfig. `build` creates all its components, using the shared resources
+    (account, data source) where possible, and `run` runs its pulse loop.
+
+    Errors of a single pulse are handled by the loop itself, `run` raises only if the loop
+    can't go on, eg. when the scheduler fails.
+    '''
+    def __init__(self, name: str, cfg: StrategyConfig, resources: SharedResources) -> None:
+        self._logger = logging.getLogger(f"{self.__class__.__name__}[{name}]")
+
+        self.name = name
+        self._cfg = cfg
+        self._resources = resources
+
+        self._platform: StarknetPlatform | None = None
+        self._state_fetcher: PollingStateFetcher | None = None
+        self._market_maker: SimpleMarketMaker | None = None
+        self._scheduler: PulseScheduler | None = None
+
+    @property
+    def platform(self) -> StarknetPlatform:
+        if self._platform is None:
+            raise RuntimeError(f"Instance `{self.name}` is not built")
+        return self._platform
+
+    async def build(self) -> None:
+        cfg = self._cfg
+
+        order_chain = OrderChain.from_config(cfg.order_chain)
+        reconciler = get_reconciler(cfg.reconciler)
+
+        platform = await StarknetPlatform.from_config(
+            cfg=cfg, w_account=self._resources.get_account(cfg)
+        )
+        data_source = await self._resources.get_data_source(cfg.price_source)
+
+        self._state_fetcher = PollingStateFetcher(
+            market=platform.market,  # type: ignore
+            fair_price_fetcher=data_source,
+            inflight=platform.inflight_tracker,
+            reader=platform.reader,
+            pin_block=cfg.platform.config.pin_state_to_block,
+            fee_model=platform.account.fee_model,
+        )
+        self._market_maker = SimpleMarketMaker(
+            order_reconciler=reconciler,
+            order_chain=order_chain,
+        )
+        self._scheduler = get_pulse_scheduler(
+            cfg.scheduler,
+            price_source=data_source,
+            block_number_fetcher=platform.get_block_number,
+            fill_detector=platform.market.fill_detector,
+        )
+        self._platform = platform
+
+    async def run(self) -> None:
+        '''
+        Runs the pulse loop until it is canceled.
+        '''
+        platform = self.platform
+        assert self._state_fetcher is not None
+        assert self._market_maker is not None
+        assert self._scheduler is not None
+        scheduler = self._scheduler
+
+        await scheduler.start()
+        try:
+            while True:
+                triggers = await scheduler.wait_for_pulse()
+                tracing.start_pulse()
+                self._logger.info("Pulse triggered by: %s", ", ".join(sorted(triggers)))
+                metrics.track_pulse_triggers(triggers)
+
+                loop_start_time = time.time()
+                failed = False
+                try:
+
+                    with tracing.span("state_fetch"):
+                        state = await self._state_fetcher.get_state()
+
+                    metrics.track_state_update_time(time.time() - loop_start_time)
+
+                    self._logger.info("My current orders: %s", state.account.orders)
+                    self._logger.info("Fair price queried: %s.", state.fair_price)
+                    self._logger.info("Current position: %s", state.account.position)
+
+                    metrics.track_position(state.account.position)
+
+                    self._log_orders(
+                        state.account.orders.active.asks, state.account.orders.active.bids
+                    )
+
+                    with tracing.span("strategy"):
+                        prologue, reconciled_orders = await self._market_maker.pulse(state=state)
+
+                    with tracing.span("execute"):
+                        await platform.execute_operations(
+                            state=state, prologue=prologue, ops=reconciled_orders
+                        )
+
+                except Exception as e:
+                    failed = True
+
+                    if not await platform.error_handled(e):
+                        self._logger.error("Unhandled error occurred: %s", str(e), exc_info=True)
+
+                scheduler.pulse_finished(failed=failed)
+                metrics.track_loop_time(time.time() - loop_start_time)
+        finally:
+            await scheduler.stop()
+
+    def _log_orders(self, asks: list[BasicOrder], bids: list[BasicOrder]) -> None:
+        self._logger.info("PRETTY PRINTED CURRENT ORDERS.")
+        for ask in sorted(asks, key=lambda x: -x.price):
+            self._logger.info("\t\t%s; %s", ask.price, ask.amount_remaining)
+        self._logger.info("XXX")
+        for bid in sorted(bids, key=lambda x: -x.price):
+            self._logger.info("\t\t%s; %s", bid.price, bid.amount_remaining)
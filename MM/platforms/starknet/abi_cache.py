@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import os
+import pickle
+from dataclasses import dataclass
+from importlib.metadata import version
+from typing import Any, Iterable, cast
+
+from starknet_py.abi.v0.model import Abi as AbiV0
+from starknet_py.abi.v1.model import Abi as AbiV1
+from starknet_py.abi.v2.model import Abi as AbiV2
+from starknet_py.contract import Contract, ContractData
+from starknet_py.net.account.base_account import BaseAccount
+from starknet_py.net.client import Client
+from starknet_py.net.models.address import AddressRepresentation, parse_address
+from starknet_py.proxy.contract_abi_resolver import ContractAbiResolver
+
+from monitoring import metrics
+
+# Parsed ABIs are pickled, so they are cached per version of the library that parsed them.
+STARKNET_PY_VERSION = version("starknet-py")
+
+
+@dataclass(frozen=True)
+class ContractAbi:
+    abi: list[dict[str, Any]]
+    cairo_version: int
+    parsed_abi: AbiV0 | AbiV1 | AbiV2
+
+
+class AbiCache:
+    '''
+    Creates Contracts like `Contract.from_address`, but keeps the ABIs by class hash, in memory
+    and, if `directory` is given, on disk, so that they are not downloaded on every start.
+
+    The class hash at the address is always read from the chain (a single cheap call), so an
+    upgraded contract never gets a stale ABI, only the class itself is cached. Classes are
+    immutable, so the cached ABI of a class hash never needs to be invalidated.
+
+    Besides the download, most of the time of `Contract.from_address` is spent parsing the ABI,
+    so the parsed ABI is cached too and handed to the contracts instead of parsing it again.
+    The files are pickles, so the directory must not be writable by anyone untrusted.
+    '''
+    def __init__(self, directory: str | None = None) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        self._directory = directory
+        self._abis: dict[int, ContractAbi] = {}
+        # Classes being loaded, so that contracts sharing a class (eg. tokens) load it once.
+        self._loading: dict[int, asyncio.Task[ContractAbi]] = {}
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    async def get_contract(
+        self, address: AddressRepresentation, provider: BaseAccount | Client
+    ) -> Contract:
+        client = provider.client if isinstance(provider, BaseAccount) else provider
+        parsed_address = parse_address(address)
+
+        class_hash = await client.get_class_hash_at(contract_address=parsed_address)
+        contract_abi = await self._get_abi(class_hash, client)
+
+        return _new_contract(parsed_address, contract_abi, provider)
+
+    async def get_contracts(
+        self, addresses: Iterable[AddressRepresentation], provider: BaseAccount | Client
+    ) -> list[Contract]:
+        '''
+        Creates the contracts at given addresses concurrently.
+        '''
+        return list(
+            await asyncio.gather(*(self.get_contract(address, provider) for address in addresses))
+        )
+
+    async def _get_abi(self, class_hash: int, client: Client) -> ContractAbi:
+        contract_abi = self._abis.get(class_hash)
+        if contract_abi is not None:
+            metrics.track_abi_lookup("memory")
+            return contract_abi
+
+        task = self._loading.get(class_hash)
+        if task is None:
+            task = asyncio.create_task(self._load(class_hash, client))
+            self._loading[class_hash] = task
+            task.add_done_callback(lambda _: self._loading.pop(class_hash, None))
+
+        return await asyncio.shield(task)
+
+    async def _load(self, class_hash: int, client: Client) -> ContractAbi:
+        contract_abi = self._read(class_hash)
+        if contract_abi is not None:
+            metrics.track_abi_lookup("disk")
+        else:
+            contract_class = await client.get_class_by_hash(class_hash=class_hash)
+            if contract_class.abi is None:
+                raise ValueError(f"Class {hex(class_hash)} has no ABI")
+
+            abi = cast(list[dict[str, Any]], ContractAbiResolver.get_abi_from_contract_class(contract_class))
+            cairo_version = ContractAbiResolver._get_cairo_version(contract_class)
+            contract_abi = ContractAbi(
+                abi=abi,
+                cairo_version=cairo_version,
+                parsed_abi=ContractData.from_abi(0, abi, cairo_version).parsed_abi,
+            )
+            self._write(class_hash, contract_abi)
+            metrics.track_abi_lookup("fetched")
+
+        self._abis[class_hash] = contract_abi
+        return contract_abi
+
+    def _path(self, class_hash: int) -> str | None:
+        if self._directory is None:
+            return None
+        return os.path.join(self._directory, f"{class_hash:#066x}-{STARKNET_PY_VERSION}.pickle")
+
+    def _read(self, class_hash: int) -> ContractAbi | None:
+        path = self._path(class_hash)
+        if path is None or not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                contract_abi = pickle.load(f)
+            if not isinstance(contract_abi, ContractAbi):
+                raise TypeError(f"Unexpected type {type(contract_abi)}")
+            return contract_abi
+        except Exception as e:
+            self._logger.warning("Ignoring corrupted cached ABI `%s`: %s", path, str(e))
+            return None
+
+    def _write(self, class_hash: int, contract_abi: ContractAbi) -> None:
+        path = self._path(class_hash)
+        if path is None:
+            return
+
+        # Written to a temporary file first, so that a crash never leaves a partial file behind.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(contract_abi, f)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PicklingError) as e:
+            self._logger.warning("Unable to cache ABI of class %s: %s", hex(class_hash), str(e))
+
+
+def _new_contract(address: int, contract_abi: ContractAbi, provider: BaseAccount | Client) -> Contract:
+    # Same as `Contract(address, abi, provider)`, except that the ABI is not parsed again.
+    data = ContractData.from_abi(address, contract_abi.abi, contract_abi.cairo_version)
+    # `parsed_abi` is a cached property, it is read from the instance dict.
+    data.__dict__["parsed_abi"] = contract_abi.parsed_abi
+
+    contract = Contract(address=address, abi=[], provider=provider, cairo_version=contract_abi.cairo_version)
+    contract.data = data
+    contract._functions = Contract._make_functions(
+        contract_data=data,
+        client=contract.client,
+        account=contract.account,
+        cairo_version=contract_abi.cairo_version,
+    )
+    return contract
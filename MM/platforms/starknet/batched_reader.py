@@ -0,0 +1,270 @@
+import asyncio
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from starknet_py.serialization.tuple_dataclass import TupleDataclass
+from starknet_py.contract import PreparedFunctionCall
+from starknet_py.net.client import Client
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.client_models import BlockHashAndNumber
+from starknet_py.net.client_utils import get_block_identifier
+from starknet_py.net.full_node_client import FullNodeClient
+
+from monitoring import tracing
+from networking.http_session import get_rpc_session
+
+# Identifies a view call: pinned block number, contract address, entry point selector and calldata.
+CallKey = tuple[int | None, int, int, tuple[int, ...]]
+
+
+@dataclass
+class QueuedCall:
+    call: PreparedFunctionCall
+    block_number: int | None
+    future: asyncio.Future[list[int]]
+
+
+@dataclass
+class Snapshot:
+    '''
+    Block the calls of a snapshot read and the results shared within it.
+    '''
+    block_number: int | None
+    results: dict[CallKey, asyncio.Future[list[int]]] = field(default_factory=dict)
+
+
+class BatchNotSupportedError(Exception):
+    '''
+    Raised when the node doesn't accept JSON-RPC batch requests.
+    '''
+
+
+class BatchedStarknetReader:
+    '''
+    Read layer for contract view calls, which packs the calls issued within `batch_window` seconds
+    into a single JSON-RPC batch request (of at most `max_batch_size` calls).
+
+    Identical calls issued at the same time share a single request. Within a `snapshot` (eg. one
+    state fetch), results of identical calls are shared too, so that eg. orders fetched by
+    both the position and the orders queries are fetched only once per pulse. A snapshot can be
+    pinned to a block, so that all its calls read the same consistent chain state.
+
+    The snapshot belongs to the task that entered it (and the tasks it creates meanwhile), so that
+    fetches running concurrently over one reader (eg. of strategies sharing a wallet) each read
+    their own block and share results only within themselves.
+
+    If the node doesn't support JSON-RPC batches, the calls are sent one by one concurrently.
+    '''
+    def __init__(
+        self,
+        client: Client,
+        batch_window: float = 0.005,
+        max_batch_size: int = 100,
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        if batch_window < 0 or max_batch_size < 1:
+            raise ValueError(f"Invalid params: {batch_window=} {max_batch_size=}")
+
+        self._client = client
+        self._batch_window = batch_window
+        self._max_batch_size = max_batch_size
+
+        # JSON-RPC batches are sent only through the full node client and only if the node supports them.
+        self._batching_supported = isinstance(client, FullNodeClient)
+
+        # Calls in flight, shared by all the callers, and the snapshot of the current context.
+        self._in_flight: dict[CallKey, asyncio.Future[list[int]]] = {}
+        self._snapshot: ContextVar[Snapshot | None] = ContextVar(f"snapshot_{id(self)}", default=None)
+        self._queue: list[QueuedCall] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task[None]] = set()
+
+    @property
+    def block_number(self) -> int | None:
+        '''
+        Block the calls of the current snapshot are pinned to, None if they read the pending state.
+        '''
+        snapshot = self._snapshot.get()
+        return snapshot.block_number if snapshot is not None else None
+
+    async def get_latest_block(self) -> BlockHashAndNumber:
+        assert isinstance(self._client, FullNodeClient)
+        block: BlockHashAndNumber = await self._client.get_block_hash_and_number()
+        return block
+
+    @contextmanager
+    def snapshot(self, block_number: int | None = None) -> Iterator[None]:
+        '''
+        Within the snapshot results of identical calls are reused instead of being fetched again.
+        Outside of any snapshot only calls that are in flight at the same time are deduplicated.
+
+        If `block_number` is given, all the calls within the snapshot read the state at that block.
+        Nested snapshots share the block and the results of the enclosing one, unless they are
+        pinned to another block.
+        '''
+        current = self._snapshot.get()
+        if current is not None and block_number in (None, current.block_number):
+            yield
+            return
+
+        token = self._snapshot.set(Snapshot(block_number=block_number))
+        try:
+            yield
+        finally:
+            self._snapshot.reset(token)
+
+    async def call(self, prepared: PreparedFunctionCall) -> TupleDataclass | tuple[Any, ...]:
+        '''
+        Calls the prepared view function and returns the deserialized result,
+        the same way `PreparedFunctionCall.call` does.
+        '''
+        raw = await self.call_raw(prepared)
+        return prepared._payload_transformer.deserialize(raw)
+
+    async def call_raw(self, prepared: PreparedFunctionCall) -> list[int]:
+        '''
+        Calls the prepared view function and returns the raw result felts.
+        '''
+        snapshot = self._snapshot.get()
+        block_number = snapshot.block_number if snapshot is not None else None
+        key = (block_number, prepared.to_addr, prepared.selector, tuple(prepared.calldata))
+
+        future = snapshot.results.get(key) if snapshot is not None else None
+        if future is None:
+            future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._in_flight[key] = future
+            self._queue.append(QueuedCall(prepared, block_number, future))
+            future.add_done_callback(lambda f: self._forget(key, f))
+            self._schedule_flush()
+
+        if snapshot is not None:
+            snapshot.results[key] = future
+
+        # Shielded, so that a canceled caller doesn't cancel the call for the others sharing it.
+        return await asyncio.shield(future)
+
+    def _forget(self, key: CallKey, future: asyncio.Future[list[int]]) -> None:
+        # Mark the exception as retrieved, the callers still receive it when awaiting.
+        if not future.cancelled():
+            future.exception()
+
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+    def _schedule_flush(self) -> None:
+        if len(self._queue) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self._batch_window, self._flush
+            )
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._queue = self._queue, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._execute(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _execute(self, batch: list[QueuedCall]) -> None:
+        if self._batching_supported and len(batch) > 1:
+            try:
+                with tracing.span("rpc_view_batch", size=len(batch)):
+                    results = await self._send_batch(batch)
+            except BatchNotSupportedError as e:
+                self._logger.warning(
+                    "JSON-RPC batches are not supported (%s), falling back to single calls.", str(e)
+                )
+                self._batching_supported = False
+            except Exception as e:
+                self._logger.warning("JSON-RPC batch request failed (%s), retrying as single calls.", str(e))
+            else:
+                for queued, result in zip(batch, results):
+                    _resolve(queued.future, result)
+                return
+
+        single_results = await asyncio.gather(
+            *(self._call_single(queued) for queued in batch),
+            return_exceptions=True,
+        )
+        for queued, single_result in zip(batch, single_results):
+            _resolve(queued.future, single_result)
+
+    async def _call_single(self, queued: QueuedCall) -> list[int]:
+        with tracing.span("rpc_view_call"):
+            result: list[int] = await self._client.call_contract(
+                call=queued.call, block_number=queued.block_number
+            )
+            return result
+
+    async def _send_batch(self, batch: list[QueuedCall]) -> list[list[int] | Exception]:
+        assert isinstance(self._client, FullNodeClient)
+
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "id": i,
+                "method": "starknet_call",
+                "params": {
+                    "request": {
+                        "contract_address": hex(queued.call.to_addr),
+                        "entry_point_selector": hex(queued.call.selector),
+                        "calldata": [hex(felt) for felt in queued.call.calldata],
+                    },
+                    **get_block_identifier(block_number=queued.block_number),
+                },
+            }
+            for i, queued in enumerate(batch)
+        ]
+
+        session = self._client._client.session or get_rpc_session(self._client.url)
+        async with session.post(self._client.url, json=payload) as response:
+            if 400 <= response.status < 500 and response.status != 429:
+                raise BatchNotSupportedError(f"HTTP status {response.status}")
+            response.raise_for_status()
+            body = await response.json(content_type=None)
+
+        if not isinstance(body, list) or len(body) != len(batch):
+            raise BatchNotSupportedError(f"Unexpected batch response: {str(body)[:200]}")
+
+        results: list[list[int] | Exception] = [
+            ClientError(message="Missing result in batch response") for _ in batch
+        ]
+        for item in body:
+            results[int(item["id"])] = _parse_call_result(item)
+
+        return results
+
+
+def _parse_call_result(item: dict[str, Any]) -> list[int] | Exception:
+    if "result" in item:
+        return [int(i, 16) for i in item["result"]]
+
+    error = item.get("error", {})
+    return ClientError(
+        code=error.get("code"),
+        message=error.get("message", "Unknown error"),
+        data=error.get("data"),
+    )
+
+
+def _resolve(future: asyncio.Future[list[int]], result: list[int] | BaseException) -> None:
+    if future.done():
+        return
+
+    if isinstance(result, BaseException):
+        future.set_exception(result)
+    else:
+        future.set_result(result)
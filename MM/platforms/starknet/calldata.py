@@ -0,0 +1,116 @@
+from typing import Any, Callable
+
+from starknet_py.contract import ContractFunction
+from starknet_py.hash.selector import get_selector_from_name
+from starknet_py.net.client_models import Call
+from starknet_py.serialization.data_serializers.cairo_data_serializer import CairoDataSerializer
+from starknet_py.serialization.data_serializers.felt_serializer import FeltSerializer
+from starknet_py.serialization.data_serializers.uint_serializer import UintSerializer
+
+U128_MASK = 2**128 - 1
+FELT_PRIME = 2**251 + 17 * 2**192 + 1
+
+Encoder = Callable[[Any], list[int]]
+
+
+class CalldataTemplate:
+    '''
+    Builds calls of a contract function without running the whole ABI serialization
+    (`ContractFunction.prepare_invoke_v3`) every time.
+
+    The selector and the serializers of the arguments are resolved once and the calldata of
+    the `fixed` arguments is serialized once. `build` then encodes only the variable arguments,
+    felts and integers directly, and patches them between the fixed parts.
+    '''
+    def __init__(self, function: ContractFunction, **fixed: Any) -> None:
+        serializers: dict[str, CairoDataSerializer[Any, Any]] = (
+            function._payload_transformer.inputs_serializer.serializers
+        )
+
+        unknown = set(fixed) - set(serializers)
+        if unknown:
+            raise ValueError(f"Unknown arguments of `{function.name}`: {sorted(unknown)}")
+
+        self.to_addr: int = function.contract_data.address
+        self.selector: int = get_selector_from_name(function.name)
+        self._name = function.name
+
+        # Either serialized calldata of fixed arguments or a variable argument with its encoder.
+        self._segments: list[list[int] | tuple[str, Encoder]] = []
+        for name, serializer in serializers.items():
+            if name in fixed:
+                calldata = list(serializer.serialize(fixed[name]))
+                if self._segments and isinstance(self._segments[-1], list):
+                    self._segments[-1].extend(calldata)
+                else:
+                    self._segments.append(calldata)
+            else:
+                self._segments.append((name, _get_encoder(serializer)))
+
+        self._variable = frozenset(name for name in serializers if name not in fixed)
+
+    def build(self, **variable: Any) -> Call:
+        if variable.keys() != self._variable:
+            raise ValueError(
+                f"Expected arguments {sorted(self._variable)} of `{self._name}`, got {sorted(variable)}"
+            )
+
+        calldata: list[int] = []
+        for segment in self._segments:
+            if isinstance(segment, list):
+                calldata.extend(segment)
+            else:
+                name, encode = segment
+                calldata.extend(encode(variable[name]))
+
+        return Call(to_addr=self.to_addr, selector=self.selector, calldata=calldata)
+
+
+class CalldataTemplates:
+    '''
+    Lazily created templates, keyed by the contract, the function and the fixed arguments.
+    '''
+    def __init__(self) -> None:
+        self._templates: dict[tuple[int, str, str], CalldataTemplate] = {}
+
+    def get(self, function: ContractFunction, **fixed: Any) -> CalldataTemplate:
+        key = (function.contract_data.address, function.name, repr(sorted(fixed.items())))
+
+        template = self._templates.get(key)
+        if template is None:
+            template = CalldataTemplate(function, **fixed)
+            self._templates[key] = template
+
+        return template
+
+
+def _get_encoder(serializer: CairoDataSerializer[Any, Any]) -> Encoder:
+    if isinstance(serializer, FeltSerializer):
+        return _encode_felt
+    if isinstance(serializer, UintSerializer):
+        return _encode_u256 if serializer.bits == 256 else _get_uint_encoder(serializer.bits)
+
+    return lambda value: list(serializer.serialize(value))
+
+
+def _encode_felt(value: int) -> list[int]:
+    if not 0 <= value < FELT_PRIME:
+        raise ValueError(f"Value {value} out of felt range")
+    return [value]
+
+
+def _get_uint_encoder(bits: int) -> Encoder:
+    bound = 2**bits
+
+    def encode(value: int) -> list[int]:
+        if not 0 <= value < bound:
+            raise ValueError(f"Value {value} out of u{bits} range")
+        return [value]
+
+    return encode
+
+
+def _encode_u256(value: int) -> list[int]:
+    if not 0 <= value < 2**256:
+        raise ValueError(f"Value {value} out of u256 range")
+    return [value & U128_MASK, value >> 128]
@@ -0,0 +1,254 @@
+import asyncio
+import logging
+from collections import Counter, deque
+from dataclasses import dataclass
+from decimal import Decimal
+
+from starknet_py.net.account.account import Account
+from starknet_py.net.client_models import (
+    Call, Calls, EstimatedFee, ResourceBounds, ResourceBoundsMapping, StarknetBlockWithTxHashes
+)
+from starknet_py.net.full_node_client import FullNodeClient
+
+from monitoring import metrics
+
+# Fees of V3 transactions are paid in fri, 10**-18 STRK.
+FRI_PER_STRK: int = 10**18
+
+# Identifies the transaction by its entry points: (contract address, selector, number of calls).
+CallShape = tuple[tuple[int, int, int], ...]
+
+# Bounds of a transaction prepared only for the fee estimation.
+ZERO_RESOURCE_BOUNDS = ResourceBoundsMapping(
+    l1_gas=ResourceBounds(max_amount=0, max_price_per_unit=0),
+    l1_data_gas=ResourceBounds(max_amount=0, max_price_per_unit=0),
+    l2_gas=ResourceBounds(max_amount=0, max_price_per_unit=0),
+)
+
+
+@dataclass(frozen=True)
+class GasAmounts:
+    '''
+    Gas consumed by a transaction of some call shape.
+    '''
+    l1_gas: int
+    l1_data_gas: int
+    l2_gas: int
+    estimated_at: float
+
+
+@dataclass(frozen=True)
+class GasPrices:
+    '''
+    Gas prices in fri (STRK), in which the fees of V3 transactions are paid.
+    '''
+    l1_gas: int
+    l1_data_gas: int
+    l2_gas: int
+
+
+class FeeModel:
+    '''
+    Provides explicit resource bounds for invoke transactions, so that the fee doesn't have
+    to be estimated before every transaction.
+
+    Gas amounts consumed by transactions are estimated once per call shape (the entry points
+    and how many times each of them is called) and cached. Estimates older than `estimate_ttl`
+    seconds are still used, but refreshed in background.
+
+    Gas prices are sampled in background every `price_refresh_interval` seconds from the latest
+    block, the maximum over the last `price_window` blocks is used. Until the first sample
+    is available, prices of the estimates are used.
+
+    The bounds are the amounts multiplied by `amount_margin` and the prices by `price_margin`.
+    '''
+    def __init__(
+        self,
+        account: Account,
+        amount_margin: Decimal = Decimal("1.5"),
+        price_margin: Decimal = Decimal("1.5"),
+        estimate_ttl: float = 300,
+        price_refresh_interval: float = 10,
+        price_window: int = 10,
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        if amount_margin < 1 or price_margin < 1 or price_window < 1 or price_refresh_interval <= 0:
+            raise ValueError(
+                f"Invalid params: {amount_margin=} {price_margin=} "
+                f"{price_window=} {price_refresh_interval=}"
+            )
+
+        self._account = account
+        self._amount_margin = amount_margin
+        self._price_margin = price_margin
+        self._estimate_ttl = estimate_ttl
+        self._price_refresh_interval = price_refresh_interval
+
+        self._amounts: dict[CallShape, GasAmounts] = {}
+        self._estimated_prices: GasPrices | None = None
+        self._block_prices: deque[tuple[int, GasPrices]] = deque(maxlen=price_window)
+
+        self._price_task: asyncio.Task[None] | None = None
+        self._refreshes: dict[CallShape, asyncio.Task[None]] = {}
+
+    async def get_resource_bounds(self, calls: Calls, nonce: int) -> ResourceBoundsMapping:
+        '''
+        Returns resource bounds for the transaction with given calls. Estimates the fee only
+        if the shape of the calls wasn't estimated yet.
+        '''
+        self._ensure_price_refresh()
+
+        shape = call_shape(calls)
+        amounts = self._amounts.get(shape)
+
+        if amounts is None:
+            metrics.track_fee_estimate("miss")
+            amounts = await self._estimate(shape, calls, nonce)
+        elif asyncio.get_running_loop().time() - amounts.estimated_at >= self._estimate_ttl:
+            metrics.track_fee_estimate("stale")
+            self._refresh_in_background(shape, calls)
+        else:
+            metrics.track_fee_estimate("hit")
+
+        return self._to_bounds(amounts, self._get_prices())
+
+    def get_fee_per_call(self) -> Decimal | None:
+        '''
+        Returns the expected fee (in STRK) of one call of a transaction, averaged over the estimated
+        call shapes at the current gas prices, or None if no fee was estimated yet. Makes no requests.
+        '''
+        if not self._amounts:
+            return None
+
+        prices = self._get_prices()
+        fee = sum(
+            a.l1_gas * prices.l1_gas + a.l1_data_gas * prices.l1_data_gas + a.l2_gas * prices.l2_gas
+            for a in self._amounts.values()
+        )
+        calls = sum(n for shape in self._amounts for _, _, n in shape)
+        return Decimal(fee) / (calls * FRI_PER_STRK)
+
+    def invalidate(self, calls: Calls) -> None:
+        '''
+        Drops the estimate of the calls' shape, eg. after the transaction was rejected.
+        '''
+        self._amounts.pop(call_shape(calls), None)
+
+    def reset(self) -> None:
+        '''
+        Drops all the estimates, eg. after a transaction ran out of gas.
+        '''
+        self._amounts.clear()
+
+    async def stop(self) -> None:
+        tasks = [t for t in (self._price_task, *self._refreshes.values()) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self._price_task = None
+        self._refreshes.clear()
+
+    async def _estimate(self, shape: CallShape, calls: Calls, nonce: int) -> GasAmounts:
+        # `estimate_fee` signs its own query version of the transaction, so it isn't signed here.
+        tx = await self._account._prepare_invoke_v3(
+            calls=calls, resource_bounds=ZERO_RESOURCE_BOUNDS, nonce=nonce
+        )
+        estimated = await self._account.estimate_fee(tx)
+        assert isinstance(estimated, EstimatedFee)
+
+        amounts = GasAmounts(
+            l1_gas=estimated.l1_gas_consumed,
+            l1_data_gas=estimated.l1_data_gas_consumed,
+            l2_gas=estimated.l2_gas_consumed,
+            estimated_at=asyncio.get_running_loop().time(),
+        )
+        self._amounts[shape] = amounts
+        self._estimated_prices = GasPrices(
+            l1_gas=estimated.l1_gas_price,
+            l1_data_gas=estimated.l1_data_gas_price,
+            l2_gas=estimated.l2_gas_price,
+        )
+
+        self._logger.debug("Estimated gas of %s: %s", shape, amounts)
+        return amounts
+
+    def _refresh_in_background(self, shape: CallShape, calls: Calls) -> None:
+        if shape in self._refreshes:
+            return
+
+        task = asyncio.create_task(self._refresh(shape, calls))
+        self._refreshes[shape] = task
+        task.add_done_callback(lambda _: self._refreshes.pop(shape, None))
+
+    async def _refresh(self, shape: CallShape, calls: Calls) -> None:
+        try:
+            # The transaction these calls came from might be already included, so use a fresh nonce.
+            nonce = await self._account.get_nonce()
+            await self._estimate(shape, calls, nonce)
+        except Exception as e:
+            self._logger.warning("Unable to refresh fee estimate of %s: %s", shape, str(e))
+
+    def _get_prices(self) -> GasPrices:
+        prices = [p for _, p in self._block_prices]
+        if self._estimated_prices is not None and not prices:
+            prices.append(self._estimated_prices)
+
+        # The fee is estimated before the prices are used, so there is always some price.
+        assert prices
+        return GasPrices(
+            l1_gas=max(p.l1_gas for p in prices),
+            l1_data_gas=max(p.l1_data_gas for p in prices),
+            l2_gas=max(p.l2_gas for p in prices),
+        )
+
+    def _to_bounds(self, amounts: GasAmounts, prices: GasPrices) -> ResourceBoundsMapping:
+        return ResourceBoundsMapping(
+            l1_gas=self._to_resource_bounds(amounts.l1_gas, prices.l1_gas),
+            l1_data_gas=self._to_resource_bounds(amounts.l1_data_gas, prices.l1_data_gas),
+            l2_gas=self._to_resource_bounds(amounts.l2_gas, prices.l2_gas),
+        )
+
+    def _to_resource_bounds(self, amount: int, price: int) -> ResourceBounds:
+        return ResourceBounds(
+            max_amount=int(amount * self._amount_margin),
+            max_price_per_unit=int(price * self._price_margin),
+        )
+
+    def _ensure_price_refresh(self) -> None:
+        if self._price_task is None or self._price_task.done():
+            self._price_task = asyncio.create_task(self._refresh_prices())
+
+    async def _refresh_prices(self) -> None:
+        client = self._account.client
+        assert isinstance(client, FullNodeClient)
+
+        while True:
+            try:
+                block = await client.get_block_with_tx_hashes(block_number="latest")
+                assert isinstance(block, StarknetBlockWithTxHashes)
+
+                # Each block is sampled once, so that the window spans `price_window` blocks.
+                if not self._block_prices or self._block_prices[-1][0] != block.block_number:
+                    self._block_prices.append((
+                        block.block_number,
+                        GasPrices(
+                            l1_gas=block.l1_gas_price.price_in_fri,
+                            l1_data_gas=block.l1_data_gas_price.price_in_fri,
+                            l2_gas=block.l2_gas_price.price_in_fri,
+                        )
+                    ))
+            except Exception as e:
+                self._logger.warning("Unable to fetch gas prices: %s", str(e))
+
+            await asyncio.sleep(self._price_refresh_interval)
+
+
+def call_shape(calls: Calls) -> CallShape:
+    '''
+    Returns the shape of the calls, ie. entry points with the number of their calls.
+    '''
+    call_list = [calls] if isinstance(calls, Call) else list(calls)
+    counts = Counter((c.to_addr, c.selector) for c in call_list)
+    return tuple(sorted((addr, selector, n) for (addr, selector), n in counts.items()))
@@ -0,0 +1,185 @@
+import asyncio
+import heapq
+import logging
+from dataclasses import dataclass
+
+from starknet_py.net.account.account import Account
+from starknet_py.net.client_models import TransactionReceipt
+from starknet_py.transaction_errors import (
+    TransactionNotReceivedError, TransactionRejectedError, TransactionRevertedError
+)
+
+from monitoring import metrics
+
+
+@dataclass
+class PendingNonce:
+    '''
+    Nonce handed out by the NonceManager, `tx_hash` is set once its transaction is sent.
+    '''
+    nonce: int
+    tx_hash: int | None = None
+
+
+class NonceManager:
+    '''
+    Hands out nonces of the account locally, without querying the chain for every transaction,
+    so that multiple transactions can be in flight at the same time.
+
+    The on-chain nonce is read only on the first allocation and after `resync`. At most
+    `max_in_flight` nonces are allocated and not confirmed at the same time, further
+    allocations wait until some transaction settles.
+
+    Every sent transaction is tracked by its nonce until its receipt is known. Nonces that don't
+    get consumed, because their transaction was not sent, was rejected or was not received within
+    `confirmation_timeout` seconds, leave a gap, which would block all the later transactions.
+    Such nonces are handed out again before any new one, so that the gap is filled (re-sequencing).
+    Reverted transactions consume their nonce, so they leave no gap.
+    '''
+    def __init__(
+        self,
+        account: Account,
+        max_in_flight: int = 8,
+        check_interval: float = 0.5,
+        confirmation_timeout: float = 120,
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        if max_in_flight < 1:
+            raise ValueError(f"Invalid {max_in_flight=}")
+
+        self._account = account
+        self._max_in_flight = max_in_flight
+        self._check_interval = check_interval
+        self._confirmation_timeout = confirmation_timeout
+
+        self._next: int | None = None
+        self._gaps: list[int] = []
+        self._pending: dict[int, PendingNonce] = {}
+        self._confirmations: dict[int, asyncio.Task[TransactionReceipt]] = {}
+        self._condition = asyncio.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def allocate(self) -> int:
+        '''
+        Returns the nonce for the next transaction. It must be either passed to `sent`
+        once the transaction is sent or given back by `release`.
+        '''
+        async with self._condition:
+            await self._condition.wait_for(lambda: len(self._pending) < self._max_in_flight)
+
+            if self._next is None:
+                await self._sync()
+                assert self._next is not None
+
+            if self._gaps:
+                nonce = heapq.heappop(self._gaps)
+            else:
+                nonce = self._next
+                self._next += 1
+
+            self._pending[nonce] = PendingNonce(nonce=nonce)
+            return nonce
+
+    def sent(self, nonce: int, tx_hash: int) -> None:
+        '''
+        Starts tracking of the transaction sent with the allocated nonce.
+        '''
+        self._pending[nonce].tx_hash = tx_hash
+
+        task = asyncio.create_task(self._confirm(nonce, tx_hash))
+        self._confirmations[tx_hash] = task
+        # The failure is logged and reported to the waiters, if there are any.
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def release(self, nonce: int) -> None:
+        '''
+        Gives back the allocated nonce whose transaction was not sent.
+        '''
+        async with self._condition:
+            self._pending.pop(nonce, None)
+            self._free(nonce, "unsent")
+            self._condition.notify_all()
+
+    async def wait_for_tx(self, tx_hash: int) -> TransactionReceipt | None:
+        '''
+        Waits for the receipt of the tracked transaction, returns None if it is not tracked.
+        Raises the same errors as `Client.wait_for_tx`.
+        '''
+        task = self._confirmations.get(tx_hash)
+        if task is None:
+            return None
+        # Shielded, so that a canceled waiter doesn't stop the tracking.
+        return await asyncio.shield(task)
+
+    async def wait_all(self) -> None:
+        '''
+        Waits until all the sent transactions settle.
+        '''
+        await asyncio.gather(*self._confirmations.values(), return_exceptions=True)
+
+    async def resync(self) -> None:
+        '''
+        Reads the nonce from the chain again on the next allocation, eg. after a nonce error.
+        '''
+        async with self._condition:
+            self._logger.info("Resyncing nonce, %s transactions in flight.", len(self._pending))
+            self._next = None
+
+    async def _sync(self) -> None:
+        on_chain = await self._account.get_nonce()
+
+        # Transactions in flight don't count to the on-chain nonce yet, their nonces are not reused.
+        # Any other nonce between the on-chain and the next one was not consumed, so it is a gap.
+        self._next = max([on_chain, *(n + 1 for n in self._pending)])
+        self._gaps = [n for n in range(on_chain, self._next) if n not in self._pending]
+        heapq.heapify(self._gaps)
+
+        self._logger.info("On-chain nonce %s, next nonce %s.", on_chain, self._next)
+
+    def _free(self, nonce: int, reason: str) -> None:
+        if self._next is None:
+            # Gaps are found again on the next sync.
+            return
+
+        if nonce == self._next - 1:
+            self._next -= 1
+        elif nonce not in self._gaps:
+            heapq.heappush(self._gaps, nonce)
+            self._logger.warning("Nonce %s left a gap (%s), it will be reused.", nonce, reason)
+            metrics.track_nonce_gap(reason)
+
+    async def _confirm(self, nonce: int, tx_hash: int) -> TransactionReceipt:
+        gap: str | None = None
+        unknown = False
+        try:
+            return await asyncio.wait_for(
+                self._account.client.wait_for_tx(tx_hash=tx_hash, check_interval=self._check_interval),
+                self._confirmation_timeout,
+            )
+        except TransactionRevertedError:
+            # Reverted transaction consumes its nonce.
+            raise
+        except (TransactionRejectedError, TransactionNotReceivedError):
+            gap = "rejected"
+            raise
+        except TimeoutError:
+            gap = "timeout"
+            raise
+        except Exception as e:
+            self._logger.warning("Unable to confirm transaction %s: %s", hex(tx_hash), str(e))
+            unknown = True
+            raise
+        finally:
+            async with self._condition:
+                self._pending.pop(nonce, None)
+                self._confirmations.pop(tx_hash, None)
+                if gap is not None:
+                    self._free(nonce, gap)
+                elif unknown:
+                    # Whether the nonce was consumed is not known, it is found out on the next sync.
+                    self._next = None
+                self._condition.notify_all()
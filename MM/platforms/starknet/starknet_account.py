@@ -1,12 +1,22 @@
+import dataclasses
 import logging
-import datetime
 
 from starknet_py.net.account.account import Account
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.client_models import Calls, SentTransactionResponse, TransactionReceipt
 from starknet_py.net.full_node_client import FullNodeClient
 from starknet_py.net.models.chains import StarknetChainId
 from starknet_py.net.signer.key_pair import KeyPair
+from starknet_py.transaction_errors import TransactionRevertedError
 
-from cfg.starknet_platform_cfg import StarknetAccountConfig
+from cfg.starknet_platform_cfg import StarknetAccountConfig, StarknetFeeConfig
+from monitoring import tracing
+from networking.http_session import get_rpc_session
+from platforms.starknet.abi_cache import AbiCache
+from platforms.starknet.batched_reader import BatchedStarknetReader
+from platforms.starknet.fee_model import FeeModel
+from platforms.starknet.nonce_manager import NonceManager
+from signing import SigningService, get_signing_service
 
 NETWORK = "MAINNET"
 
@@ -16,92 +26,108 @@ NETWORK = "MAINNET"
 
 
 class WAccount:
-    PREFER_ONCHAIN_NONCE_THRESHOLD = 60
-
     """
     This is a wrapper class for the Starknet account.
     """
 
-    def __init__(self, account: Account) -> None:
+    def __init__(
+        self,
+        account: Account,
+        fee_model: FeeModel | None = None,
+        nonce_manager: NonceManager | None = None,
+        abi_cache: AbiCache | None = None,
+        signing_service: SigningService | None = None,
+    ) -> None:
         self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
         self._logger.info("Initializing WAccount: %s", hex(account.address))
 
         self.account = account
         self.address = account.address
 
-        # There will be inflights transactions for this account.
-        # This is used to find the latest nonce for this account.
-        self._latest_transaction_timestamp: int | None = None
-        # The latest transaction nonce for this account. It might not be the actual latest nonce,
-        # since the latest transaction might have failed.
-        self._latest_transaction_nonce: int | None = None
+        # Hands out nonces locally, so that multiple transactions can be in flight.
+        self.nonces = nonce_manager if nonce_manager is not None else NonceManager(account=account)
 
-    async def get_nonce(self) -> int:
-        """
-        Get the on-chain nonce for the account and compare it with the latest
-        self._latest_transaction_nonce.
-        If the self._latest_transaction_timestamp is recent, use
-        the self._latest_transaction_nonce. Otherwise use the on-chain nonce.
+        # Shared by all markets of this account, so that their view calls are batched together.
+        self.reader = BatchedStarknetReader(client=account.client)
 
-        :return: Nonce for the transaction.
-        """
-        if (self._latest_transaction_nonce is None) or (
-            self._latest_transaction_timestamp is None
-        ):
-            on_chain_nonce = await self.account.get_nonce()
-            self._logger.info(
-                "On-chain nonce for account A %s: %s", hex(self.address), on_chain_nonce
-            )
-            return on_chain_nonce
-        elif (
-            datetime.datetime.now().timestamp() - self._latest_transaction_timestamp
-        ) < self.PREFER_ONCHAIN_NONCE_THRESHOLD:
-            # If the latest transaction was recent, use the latest nonce.
-            self._logger.info(
-                "Non-On-chain nonce for account B %s: %s",
-                hex(self.address),
-                self._latest_transaction_nonce,
-            )
-            return self._latest_transaction_nonce
-
-        # If the latest transaction was not recent, use the on-chain nonce.
-        on_chain_nonce = await self.account.get_nonce()
-        self._logger.info(
-            "On-chain nonce for account C %s: %s", hex(self.address), on_chain_nonce
-        )
-        return on_chain_nonce
+        # Provides resource bounds of the transactions without estimating the fee every time.
+        self.fee_model = fee_model if fee_model is not None else FeeModel(account=account)
 
-    async def set_latest_nonce(self, nonce: int) -> None:
+        # Creates the contracts the account interacts with, without downloading known ABIs.
+        self.abi_cache = abi_cache if abi_cache is not None else AbiCache()
+
+        # Signs the transactions off the event loop.
+        self.signing = signing_service if signing_service is not None else get_signing_service()
+
+    @property
+    def client(self) -> FullNodeClient:
         """
-        Set the latest nonce for the account.
-        :param nonce: Nonce to be set.
+        The full node client of the underlying account.
         """
-        self._logger.info(
-            "Setting latest nonce to: %s, from %s",
-            nonce,
-            self._latest_transaction_nonce,
-        )
-        self._latest_transaction_nonce = nonce
-        self._latest_transaction_timestamp = int(datetime.datetime.now().timestamp())
+        client = self.account.client
+        assert isinstance(client, FullNodeClient)
+        return client
 
-    async def increment_nonce(self) -> None:
+    async def execute_v3(self, calls: Calls, nonce: int | None = None) -> SentTransactionResponse:
         """
-        Increment the latest nonce for the account.
-        This is used to ensure that the next transaction will have a unique nonce.
+        Sign and send an invoke transaction with the given calls and the next free nonce
+        (or the `nonce` allocated by `nonces.allocate` beforehand). Unlike `Account.execute_v3`
+        with `auto_estimate`, the resource bounds are taken from the fee model, so usually
+        no fee estimation precedes the transaction.
         """
-        latest_nonce = await self.get_nonce()
-        await self.set_latest_nonce(latest_nonce + 1)
-
-    async def reset_latest_nonce(self) -> None:
+        if nonce is None:
+            nonce = await self.nonces.allocate()
+        try:
+            with tracing.span("fee_estimation"):
+                resource_bounds = await self.fee_model.get_resource_bounds(calls=calls, nonce=nonce)
+
+            with tracing.span("tx_sign"):
+                # Same as `Account.sign_invoke_v3`, but the hash is computed and signed in the pool.
+                tx = await self.account._prepare_invoke_v3(
+                    calls=calls,
+                    resource_bounds=resource_bounds,
+                    nonce=nonce,
+                )
+                signature = await self.signing.sign(
+                    "starknet_invoke", self.account.signer.sign_transaction, tx
+                )
+                signed = dataclasses.replace(tx, signature=signature)
+
+            with tracing.span("tx_send"):
+                sent = await self.client.send_transaction(signed)
+        except BaseException as e:
+            await self.nonces.release(nonce)
+            if isinstance(e, ClientError):
+                # The bounds might be the reason of the rejection, estimate them again next time.
+                self.fee_model.invalidate(calls)
+            raise
+
+        self._logger.info("Sent transaction %s with nonce %s.", hex(sent.transaction_hash), nonce)
+        self.nonces.sent(nonce, sent.transaction_hash)
+        return sent
+
+    async def wait_for_tx(self, tx_hash: int, check_interval: float = 0.5) -> TransactionReceipt:
         """
-        Reset the latest nonce for the account.
-        This is usually used when there is observed error between the on chain nonce and the self._latest_transaction_nonce.
+        Wait for the transaction to be accepted.
         """
-        self._logger.info(
-            "Resetting latest nonce from %s", self._latest_transaction_nonce
-        )
-        self._latest_transaction_nonce = None
-        self._latest_transaction_timestamp = None
+        with tracing.span("tx_confirmation"):
+            try:
+                receipt = await self.nonces.wait_for_tx(tx_hash)
+                if receipt is None:
+                    receipt = await self.client.wait_for_tx(tx_hash=tx_hash, check_interval=check_interval)
+                return receipt
+            except TransactionRevertedError as e:
+                if e.message is not None and "gas" in e.message.lower():
+                    self._logger.warning("Transaction ran out of gas, dropping fee estimates.")
+                    self.fee_model.reset()
+                raise
+
+    async def reset_nonce(self) -> None:
+        """
+        Read the nonce from the chain again before the next transaction.
+        This is usually used when the node rejected a transaction because of its nonce.
+        """
+        await self.nonces.resync()
 
 
 def _get_native_account(account_cfg: StarknetAccountConfig) -> Account:
@@ -135,7 +161,7 @@ def _get_native_account(account_cfg: StarknetAccountConfig) -> Account:
             f"No account password found from env variable `{account_cfg.password_path_env}`"
         )
 
-    client = FullNodeClient(node_url=rpc_url)
+    client = FullNodeClient(node_url=rpc_url, session=get_rpc_session(rpc_url))
     account = Account(
         client=client,
         address=wallet_address,
@@ -148,6 +174,25 @@ def _get_native_account(account_cfg: StarknetAccountConfig) -> Account:
     logging.info("Succesfully loaded account.")
     return account
 
-def get_wrapped_account(account_cfg: StarknetAccountConfig) -> WAccount:
+def get_wrapped_account(
+    account_cfg: StarknetAccountConfig,
+    fee_cfg: StarknetFeeConfig | None = None,
+    max_in_flight: int = 8,
+    abi_cache_dir: str | None = None,
+) -> WAccount:
     account = _get_native_account(account_cfg)
-    return WAccount(account=account)
\ No newline at end of file
+
+    fee_cfg = fee_cfg if fee_cfg is not None else StarknetFeeConfig()
+    fee_model = FeeModel(
+        account=account,
+        amount_margin=fee_cfg.amount_margin,
+        price_margin=fee_cfg.price_margin,
+        estimate_ttl=fee_cfg.estimate_ttl,
+        price_refresh_interval=fee_cfg.price_refresh_interval,
+        price_window=fee_cfg.price_window,
+    )
+    nonce_manager = NonceManager(account=account, max_in_flight=max_in_flight)
+    abi_cache = AbiCache(directory=abi_cache_dir)
+    return WAccount(
+        account=account, fee_model=fee_model, nonce_manager=nonce_manager, abi_cache=abi_cache
+    )
\ No newline at end of file
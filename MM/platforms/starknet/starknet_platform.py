@@ -4,10 +4,13 @@ import logging
 from starknet_py.net.client_errors import ClientError
 from markets.market import StarknetMarketABC, PrologueOps
 from platforms.starknet.starknet_account import WAccount, get_wrapped_account
+from platforms.starknet.batched_reader import BatchedStarknetReader
 from cfg.cfg_classes import StrategyConfig
 from marketmaking.reconciling.order_reconciler import ReconciledOrders
 from markets import get_starknet_market
+from markets.starknet_markets.market_setup import setup_starknet_markets
 from tx_builders.tx_builder import TxBuilder
+from tx_builders.inflight_tracker import InFlightTracker
 from tx_builders import get_tx_builder
 
 from ..platform_abc import PlatformABC
@@ -25,13 +28,28 @@ class StarknetPlatform(PlatformABC):
         self._tx_builder = tx_builder
 
     @staticmethod
-    async def from_config(cfg: StrategyConfig) -> "StarknetPlatform":
+    async def from_config(cfg: StrategyConfig, w_account: WAccount | None = None) -> "StarknetPlatform":
+        '''
+        If `w_account` is given, the platform trades through it instead of a new account,
+        so that eg. multiple platforms of the same wallet share its nonces.
+        '''
         platform_cfg = cfg.platform.config
         market_cfg = cfg.market
-        w_account = get_wrapped_account(platform_cfg.account)
-
-        market = await get_starknet_market(market_cfg.venue, account = w_account, market_id = market_cfg.market_id)
-        tx_builder = get_tx_builder(platform_cfg.tx_builder.name, market)
+        if w_account is None:
+            w_account = get_wrapped_account(
+                platform_cfg.account,
+                fee_cfg = platform_cfg.fee,
+                max_in_flight = platform_cfg.max_in_flight_transactions,
+                abi_cache_dir = platform_cfg.abi_cache_dir,
+            )
+
+        market = await get_starknet_market(
+            market_cfg.venue,
+            account = w_account,
+            market_id = market_cfg.market_id,
+            order_tracking = market_cfg.order_tracking,
+        )
+        tx_builder = get_tx_builder(platform_cfg.tx_builder.name, market, platform_cfg.tx_builder.args)
 
         return StarknetPlatform(
             w_account=w_account,
@@ -40,7 +58,7 @@ class StarknetPlatform(PlatformABC):
         )
 
     async def initialize_trading(self) -> None:
-        await self._market.setup()
+        await setup_starknet_markets(self._waccount, [self._market])
 
 
     async def execute_operations(self, state: "State", prologue: list[PrologueOps], ops: ReconciledOrders) -> None:
@@ -53,8 +71,11 @@ class StarknetPlatform(PlatformABC):
             prologue = prologue_calls
         )
 
+    async def get_block_number(self) -> int:
+        return await self._waccount.client.get_block_number()
+
     async def reset(self) -> None:
-        await self._waccount.reset_latest_nonce()
+        await self._waccount.reset_nonce()
 
 
     async def error_handled(self, e: Exception) -> bool:
@@ -69,6 +90,18 @@ class StarknetPlatform(PlatformABC):
         return False
 
 
+    @property
+    def account(self) -> WAccount:
+        return self._waccount
+
     @property
     def market(self) -> StarknetMarketABC:
-        return self._market
\ No newline at end of file
+        return self._market
+
+    @property
+    def reader(self) -> BatchedStarknetReader:
+        return self._waccount.reader
+
+    @property
+    def inflight_tracker(self) -> InFlightTracker | None:
+        return self._tx_builder.inflight_tracker
\ No newline at end of file
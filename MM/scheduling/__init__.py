@@ -0,0 +1,40 @@
+from decimal import Decimal
+from typing import Awaitable, Callable
+
+from .pulse_scheduler import PulseScheduler, PulseTrigger
+from .fixed_interval_scheduler import FixedIntervalPulseScheduler
+from .event_driven_scheduler import EventDrivenPulseScheduler
+
+from cfg.cfg_classes import SchedulerConfig
+from oracles.data_sources.data_source import DataSource
+
+
+def get_pulse_scheduler(
+    cfg: SchedulerConfig,
+    price_source: DataSource,
+    block_number_fetcher: Callable[[], Awaitable[int]] | None = None,
+    fill_detector: Callable[[], Awaitable[bool]] | None = None,
+) -> PulseScheduler:
+    if cfg.name == "fixed_interval":
+        return FixedIntervalPulseScheduler(
+            interval=float(cfg.args.get("interval", 10)),
+            error_backoff=float(cfg.args.get("error_backoff", 5)),
+        )
+
+    if cfg.name == "event_driven":
+        return EventDrivenPulseScheduler(
+            price_source=price_source,
+            block_number_fetcher=block_number_fetcher,
+            relative_price_threshold=Decimal(cfg.args["relative_price_threshold"]),
+            min_interval=float(cfg.args.get("min_interval", 1)),
+            max_staleness=float(cfg.args.get("max_staleness", 10)),
+            price_poll_interval=float(cfg.args.get("price_poll_interval", 0.5)),
+            rest_price_poll_interval=float(cfg.args.get("rest_price_poll_interval", 2)),
+            block_poll_interval=float(cfg.args.get("block_poll_interval", 1)),
+            error_backoff=float(cfg.args.get("error_backoff", 5)),
+            pulse_on_new_block=bool(cfg.args.get("pulse_on_new_block", False)),
+            fill_detector=fill_detector,
+            fill_poll_interval=float(cfg.args.get("fill_poll_interval", 1)),
+        )
+
+    raise ValueError(f"Unknown PulseScheduler name: {cfg.name}")
@@ -0,0 +1,208 @@
+import asyncio
+import logging
+from decimal import Decimal
+from typing import Awaitable, Callable, final
+
+from oracles.data_sources.data_source import DataSource
+from .pulse_scheduler import PulseScheduler, PulseTrigger
+
+
+@final
+class EventDrivenPulseScheduler(PulseScheduler):
+    '''
+    Fires a pulse whenever one of the watched events happens:
+        - the fair price moved more than `relative_price_threshold` since the last pulse,
+        - a new block was produced (only if `pulse_on_new_block` is set),
+        - an order was filled, as reported by `fill_detector` (polled every `fill_poll_interval`
+          seconds) or through `notify`,
+        - no pulse happened for `max_staleness` seconds.
+
+    The fair price is read every `price_poll_interval` seconds from the price held in memory by
+    the price source (eg. streamed). Only if the source holds none, the price is fetched from
+    the source at most every `rest_price_poll_interval` seconds.
+
+    Triggers arriving while a pulse is running are coalesced into a single following pulse
+    and two pulses are never started less than `min_interval` seconds apart.
+    After a failed pulse the next one is delayed by at least `error_backoff` seconds.
+    '''
+    def __init__(
+        self,
+        price_source: DataSource,
+        block_number_fetcher: Callable[[], Awaitable[int]] | None,
+        relative_price_threshold: Decimal,
+        min_interval: float,
+        max_staleness: float,
+        price_poll_interval: float,
+        block_poll_interval: float,
+        error_backoff: float,
+        pulse_on_new_block: bool,
+        rest_price_poll_interval: float = 2,
+        fill_detector: Callable[[], Awaitable[bool]] | None = None,
+        fill_poll_interval: float = 1,
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        if relative_price_threshold <= 0:
+            raise ValueError(f"Invalid price threshold {relative_price_threshold=}")
+
+        if not (0 <= min_interval <= max_staleness):
+            raise ValueError(f"Invalid params: {min_interval=} {max_staleness=}")
+
+        if min(price_poll_interval, rest_price_poll_interval, block_poll_interval, fill_poll_interval) <= 0:
+            raise ValueError(
+                f"Invalid params: {price_poll_interval=} {rest_price_poll_interval=} "
+                f"{block_poll_interval=} {fill_poll_interval=}"
+            )
+
+        self._price_source = price_source
+        self._block_number_fetcher = block_number_fetcher
+        self._fill_detector = fill_detector
+
+        self._relative_price_threshold = relative_price_threshold
+        self._min_interval = min_interval
+        self._max_staleness = max_staleness
+        self._price_poll_interval = price_poll_interval
+        self._rest_price_poll_interval = rest_price_poll_interval
+        self._fill_poll_interval = fill_poll_interval
+        self._block_poll_interval = block_poll_interval
+        self._error_backoff = error_backoff
+        self._pulse_on_new_block = pulse_on_new_block
+
+        self._pending: set[PulseTrigger] = set()
+        self._wakeup = asyncio.Event()
+        self._watchers: list[asyncio.Task[None]] = []
+
+        self._last_pulse_start: float | None = None
+        self._not_before: float = 0
+
+        # Latest observed price and the price that was current when the last pulse started.
+        self._last_price: Decimal | None = None
+        self._reference_price: Decimal | None = None
+        self._last_block: int | None = None
+
+    async def start(self) -> None:
+        self._watchers.append(asyncio.create_task(self._watch_price()))
+
+        if self._block_number_fetcher is not None and self._pulse_on_new_block:
+            self._watchers.append(asyncio.create_task(self._watch_blocks()))
+
+        if self._fill_detector is not None:
+            self._watchers.append(asyncio.create_task(self._watch_fills()))
+
+    async def stop(self) -> None:
+        for watcher in self._watchers:
+            watcher.cancel()
+
+        await asyncio.gather(*self._watchers, return_exceptions=True)
+        self._watchers = []
+
+    def notify(self, trigger: PulseTrigger) -> None:
+        self._pending.add(trigger)
+        self._wakeup.set()
+
+    async def wait_for_pulse(self) -> set[PulseTrigger]:
+        loop = asyncio.get_running_loop()
+
+        if self._last_pulse_start is None:
+            self._pending.add(PulseTrigger.INITIAL)
+
+        while not self._pending:
+            assert self._last_pulse_start is not None
+            timeout = self._last_pulse_start + self._max_staleness - loop.time()
+            if timeout <= 0:
+                self._pending.add(PulseTrigger.STALENESS)
+                break
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
+
+        # Respect the minimal interval; any trigger arriving meanwhile is coalesced into this pulse.
+        earliest = self._not_before
+        if self._last_pulse_start is not None:
+            earliest = max(earliest, self._last_pulse_start + self._min_interval)
+
+        delay = earliest - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        triggers = self._pending
+        self._pending = set()
+        self._wakeup.clear()
+
+        self._last_pulse_start = loop.time()
+        self._reference_price = self._last_price
+
+        return triggers
+
+    def pulse_finished(self, failed: bool) -> None:
+        if failed:
+            self._not_before = asyncio.get_running_loop().time() + self._error_backoff
+
+    async def _watch_price(self) -> None:
+        loop = asyncio.get_running_loop()
+        fetched_at: float | None = None
+
+        while True:
+            price = self._price_source.get_cached_price()
+
+            if price is None and (fetched_at is None or loop.time() - fetched_at >= self._rest_price_poll_interval):
+                fetched_at = loop.time()
+                try:
+                    price = await self._price_source.get_price()
+                except Exception as e:
+                    self._logger.warning("Unable to fetch fair price: %s", str(e))
+
+            if price is not None:
+                self._on_price(price)
+
+            await asyncio.sleep(self._price_poll_interval)
+
+    def _on_price(self, price: Decimal) -> None:
+        self._last_price = price
+
+        if self._reference_price is None:
+            self._reference_price = price
+            return
+
+        move = abs(price / self._reference_price - 1)
+        if move >= self._relative_price_threshold:
+            self._logger.info(
+                "Fair price moved by %s (%s -> %s)", move, self._reference_price, price
+            )
+            self.notify(PulseTrigger.FAIR_PRICE)
+
+    async def _watch_blocks(self) -> None:
+        assert self._block_number_fetcher is not None
+
+        while True:
+            try:
+                block_number = await self._block_number_fetcher()
+                self._on_block(block_number)
+            except Exception as e:
+                self._logger.warning("Unable to fetch block number: %s", str(e))
+
+            await asyncio.sleep(self._block_poll_interval)
+
+    def _on_block(self, block_number: int) -> None:
+        if self._last_block is not None and block_number > self._last_block:
+            self._logger.debug("New block %s", block_number)
+            if self._pulse_on_new_block:
+                self.notify(PulseTrigger.NEW_BLOCK)
+
+        self._last_block = block_number
+
+    async def _watch_fills(self) -> None:
+        assert self._fill_detector is not None
+
+        while True:
+            try:
+                if await self._fill_detector():
+                    self._logger.info("Order fill detected")
+                    self.notify(PulseTrigger.ORDER_FILL)
+            except Exception as e:
+                self._logger.warning("Unable to detect order fills: %s", str(e))
+
+            await asyncio.sleep(self._fill_poll_interval)
@@ -0,0 +1,44 @@
+import asyncio
+import logging
+from typing import final
+
+from .pulse_scheduler import PulseScheduler, PulseTrigger
+
+
+@final
+class FixedIntervalPulseScheduler(PulseScheduler):
+    '''
+    Fires a pulse every `interval` seconds after the previous one finished.
+    If the previous pulse failed, it additionally waits `error_backoff` seconds.
+    '''
+    def __init__(self, interval: float, error_backoff: float) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        if interval < 0:
+            raise ValueError(f"Invalid interval {interval=}")
+
+        if error_backoff < 0:
+            raise ValueError(f"Invalid error backoff {error_backoff=}")
+
+        self._interval = interval
+        self._error_backoff = error_backoff
+
+        self._started = False
+        self._last_failed = False
+
+    async def wait_for_pulse(self) -> set[PulseTrigger]:
+        if not self._started:
+            self._started = True
+            return {PulseTrigger.INITIAL}
+
+        delay = self._interval
+        if self._last_failed:
+            delay += self._error_backoff
+
+        self._logger.info("Sleeping for %s seconds before next pulse...", delay)
+        await asyncio.sleep(delay)
+
+        return {PulseTrigger.INTERVAL}
+
+    def pulse_finished(self, failed: bool) -> None:
+        self._last_failed = failed
@@ -0,0 +1,55 @@
+from abc import ABC, abstractmethod
+from enum import StrEnum
+
+
+class PulseTrigger(StrEnum):
+    '''
+    Reasons for which a pulse of the market maker can be fired.
+    '''
+    INITIAL = "initial"
+    INTERVAL = "interval"
+    FAIR_PRICE = "fair_price"
+    NEW_BLOCK = "new_block"
+    ORDER_FILL = "order_fill"
+    STALENESS = "staleness"
+
+
+class PulseScheduler(ABC):
+    '''
+    Abstract base class for pulse schedulers.
+    A pulse scheduler decides when the next pulse of the market maker should be fired.
+    The main loop awaits `wait_for_pulse`, runs the pulse and reports back via `pulse_finished`.
+    '''
+
+    async def start(self) -> None:
+        '''
+        Starts any background work the scheduler needs (eg. watchers).
+        '''
+        pass
+
+    async def stop(self) -> None:
+        '''
+        Stops any background work started in `start`.
+        '''
+        pass
+
+    def notify(self, trigger: PulseTrigger) -> None:
+        '''
+        Requests a pulse from outside of the scheduler, eg. when an order fill was observed.
+        Schedulers that do not react to external events ignore it.
+        '''
+        pass
+
+    @abstractmethod
+    async def wait_for_pulse(self) -> set[PulseTrigger]:
+        '''
+        Waits until the next pulse should be fired and returns the triggers that caused it.
+        '''
+        raise NotImplementedError
+
+    @abstractmethod
+    def pulse_finished(self, failed: bool) -> None:
+        '''
+        Reports that the pulse returned by the last `wait_for_pulse` call has finished.
+        '''
+        raise NotImplementedError
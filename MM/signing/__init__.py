@@ -0,0 +1,8 @@
+from .signing_service import (
+    SigningService,
+    close_signing_service,
+    configure_signing,
+    get_signing_service,
+)
+
+__all__ = ["SigningService", "close_signing_service", "configure_signing", "get_signing_service"]
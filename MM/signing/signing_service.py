@@ -0,0 +1,95 @@
+'''
+This module provides a process-wide signing service, so that signing transactions and orders
+(hashing of the payload and ECDSA) doesn't block the event loop while eg. a large batch of
+orders is being signed, and so that the signatures of a batch are computed in parallel.
+
+The hashing and signing of starknet_py (and of paradex_py, built on it) runs in C through ctypes,
+which releases the GIL, so the default thread pool signs in parallel. The process pool avoids
+the GIL entirely, but the signing functions and their arguments have to be picklable.
+'''
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Iterable, TypeVar
+
+from cfg.cfg_classes import SigningConfig
+from monitoring import metrics
+
+T = TypeVar("T")
+
+
+class SigningService:
+    '''
+    Runs signing functions in a pool of worker threads or processes.
+    '''
+    def __init__(self, cfg: SigningConfig) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        self._executor: Executor
+        if cfg.executor == "process":
+            # Started by `spawn`, as forking a process with a running event loop is not safe.
+            self._executor = ProcessPoolExecutor(max_workers=cfg.max_workers, mp_context=get_context("spawn"))
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=cfg.max_workers, thread_name_prefix="signing")
+
+        self._logger.info("Signing in a %s pool of %s workers.", cfg.executor, cfg.max_workers)
+
+    async def sign(self, kind: str, fn: Callable[..., T], *args: Any) -> T:
+        '''
+        Runs `fn(*args)` in the pool. The time spent, including waiting for a free worker,
+        is tracked per `kind` of the signed payload.
+        '''
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            metrics.track_signing_time(kind, time.perf_counter() - start)
+
+    async def sign_many(self, kind: str, fn: Callable[[Any], T], payloads: Iterable[Any]) -> list[T]:
+        '''
+        Signs the payloads in parallel, returns the signatures in the order of the payloads.
+        '''
+        return list(await asyncio.gather(*(self.sign(kind, fn, payload) for payload in payloads)))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_signing_config = SigningConfig()
+_signing_service: SigningService | None = None
+
+
+def configure_signing(cfg: SigningConfig) -> None:
+    '''
+    Sets the configuration used for the shared signing service. Has to be called before
+    the service is first used.
+    '''
+    global _signing_config
+
+    if _signing_service is not None:
+        raise RuntimeError("Signing service is already in use, unable to reconfigure it")
+
+    _signing_config = cfg
+
+
+def get_signing_service() -> SigningService:
+    '''
+    Returns the process-wide SigningService, creating it on first use.
+    '''
+    global _signing_service
+
+    if _signing_service is None:
+        _signing_service = SigningService(_signing_config)
+
+    return _signing_service
+
+
+def close_signing_service() -> None:
+    global _signing_service
+
+    if _signing_service is not None:
+        _signing_service.shutdown()
+        _signing_service = None
@@ -4,12 +4,32 @@ import logging
 
 
 from state.account_state import AccountState
+from marketmaking.order import OrderGrid
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    '''
+    Describes the origin of the state components. If the Starknet reads were pinned to a block,
+    `block_number` and `block_hash` identify it, so that all the on-chain components are consistent.
+    The `*_fetched_at` fields are unix timestamps of when the components were fetched.
+    '''
+    block_number: int | None
+    block_hash: int | None
+    position_fetched_at: float
+    orders_fetched_at: float
+    fair_price_fetched_at: float
 
 
 @dataclass
 class State:
     account: AccountState
     _fair_price: Decimal
+    snapshot: StateSnapshot | None = None
+    # Expected fee of one call (placing or canceling an order) in the quote asset, None if unknown.
+    call_fee: Decimal | None = None
+    # Grid of the market's orders, the order chain snaps the desired orders to it.
+    grid: OrderGrid | None = None
 
     @property
     def fair_price(self) -> Decimal:
@@ -17,7 +37,9 @@ class State:
 
     @fair_price.setter
     def fair_price(self, new_fp: Decimal) -> None:
-        logging.info(f"Updating fair price from {self._fair_price} to {new_fp}")
+        # The chain sets it on every pulse, the check is much cheaper than a disabled `logging.info`.
+        if logging.root.isEnabledFor(logging.INFO):
+            logging.info("Updating fair price from %s to %s", self._fair_price, new_fp)
         self._fair_price = new_fp
 
 
@@ -47,5 +69,5 @@ class State:
 
 #     @fair_price.setter
 #     def fair_price(self, new_fp: Decimal) -> None:
-#         logging.info(f"Updating fair price from {self._fair_price} to {new_fp}")
+#         logging.info("Updating fair price from %s to %s", self._fair_price, new_fp)
 #         self._fair_price = new_fp
@@ -1,57 +1,202 @@
 import asyncio
+from dataclasses import replace
 from decimal import Decimal
+import logging
+import time
+from typing import Awaitable, TypeVar
 
-from starknet_py.net.client_models import Calls
+from starknet_py.net.client_models import BlockHashAndNumber, Calls
 import httpx
 
-from .state import State
+from .state import State, StateSnapshot
 from oracles.data_sources.data_source import DataSource
-from state.account_state import AccountState
+from state.account_state import AccountState, PositionInfo
+from marketmaking.order import AllOrders
 from markets.market import MarketABC
+from tx_builders.inflight_tracker import InFlightTracker
+from platforms.starknet.batched_reader import BatchedStarknetReader
+from platforms.starknet.fee_model import FeeModel
+from instruments.instrument import Instrument
+from instruments.starknet import SN_STRK, StarknetToken
+from monitoring import tracing
+
+# How many times the state is refetched when an in-flight transaction settles during the fetch.
+MAX_INFLIGHT_REFETCHES = 3
+
+T = TypeVar("T")
 
 
 class PollingStateFetcher:
+    '''
+    Fetches the account state and the fair price concurrently.
+
+    With `pin_block` set (and a `reader` provided), all the Starknet reads of one fetch are pinned
+    to the latest block, so that the position and the orders are consistent. In-flight transactions
+    are then overlaid exactly by their inclusion block, without any defensive refetches.
+
+    With a `fee_model` provided, the state carries the expected fee of one call in the quote asset,
+    as long as the fees (paid in STRK) can be priced by the market, ie. STRK is its base or quote.
+    '''
+
+    def __init__(
+        self,
+        market: MarketABC[Calls | httpx.Request],
+        fair_price_fetcher: DataSource,
+        inflight: InFlightTracker | None = None,
+        reader: BatchedStarknetReader | None = None,
+        pin_block: bool = False,
+        fee_model: FeeModel | None = None,
+    ):
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        if pin_block and reader is None:
+            raise ValueError("Block pinning requires a reader")
 
-    def __init__(self, market: MarketABC[Calls | httpx.Request], fair_price_fetcher: DataSource):
         self._market = market
         self._fp_fetcher = fair_price_fetcher
+        self._inflight = inflight
+        self._reader = reader
+        self._pin_block = pin_block
+        self._fee_model = fee_model
 
     async def get_state(self) -> State:
+        if self._inflight is None:
+            return await self._fetch_state()
+
+        if self._pin_block:
+            state = await self._fetch_state()
+            assert state.snapshot is not None and state.snapshot.block_number is not None
+
+            block_number = state.snapshot.block_number
+            self._inflight.prune_at_block(block_number)
+            state.account = replace(
+                state.account,
+                orders = self._inflight.overlay_at_block(state.account.orders, block_number)
+            )
+            return state
+
+        loop = asyncio.get_running_loop()
+
+        for _ in range(MAX_INFLIGHT_REFETCHES):
+            fetch_start = loop.time()
+            state = await self._fetch_state()
+
+            # If some in-flight transaction settled meanwhile, we can't tell whether
+            # the fetched orders already contain its effects, so fetch again.
+            if not self._inflight.settled_since(fetch_start):
+                break
+
+            self._logger.info("In-flight transaction settled during state fetch, refetching.")
+
+        self._inflight.prune(fetch_start)
+
+        state.account = replace(
+            state.account,
+            orders = self._inflight.overlay(state.account.orders, fetched_since=fetch_start)
+        )
+        return state
+
+    async def _fetch_state(self) -> State:
         async with asyncio.TaskGroup() as tg:
             acc_task = tg.create_task(
                 self._get_account_state()
             )
             fp_task = tg.create_task(
-                self._get_fair_price()
+                _timed(self._get_fair_price())
             )
 
-        acc_state = acc_task.result()
-        fair_price = fp_task.result()
+        acc_state, block, position_fetched_at, orders_fetched_at = acc_task.result()
+        fair_price, fair_price_fetched_at = fp_task.result()
 
         return State(
             account = acc_state,
-            _fair_price = fair_price
+            _fair_price = fair_price,
+            snapshot = StateSnapshot(
+                block_number = block.block_number if block is not None else None,
+                block_hash = block.block_hash if block is not None else None,
+                position_fetched_at = position_fetched_at,
+                orders_fetched_at = orders_fetched_at,
+                fair_price_fetched_at = fair_price_fetched_at,
+            ),
+            call_fee = self._get_call_fee(fair_price),
+            grid = self._market.order_grid,
         )
 
+    def _get_call_fee(self, fair_price: Decimal) -> Decimal | None:
+        if self._fee_model is None:
+            return None
+
+        fee = self._fee_model.get_fee_per_call()
+        if fee is None:
+            return None
+
+        market_cfg = self._market.market_cfg
+        if _is_strk(market_cfg.quote_token):
+            return fee
+        if _is_strk(market_cfg.base_token):
+            return fee * fair_price
+        return None
+
+    async def _get_account_state(
+        self
+    ) -> tuple[AccountState, BlockHashAndNumber | None, float, float]:
+        '''
+        Returns the account state, the block it was pinned to (if any)
+        and the timestamps of the position and orders fetches.
+        '''
+        if self._reader is None:
+            return await self._get_account_state_at(None)
+
+        block = None
+        if self._pin_block:
+            with tracing.span("block_pin"):
+                block = await self._reader.get_latest_block()
+
+        # View calls of one fetch are batched and identical ones (eg. orders) are fetched only once.
+        with self._reader.snapshot(block_number=block.block_number if block is not None else None):
+            return await self._get_account_state_at(block)
 
-    async def _get_account_state(self) -> AccountState:
+    async def _get_account_state_at(
+        self, block: BlockHashAndNumber | None
+    ) -> tuple[AccountState, BlockHashAndNumber | None, float, float]:
 
         async with asyncio.TaskGroup() as tg:
             position_task = tg.create_task(
-                self._market.get_total_position()
+                _timed(self._get_position())
             )
             orders_task = tg.create_task(
-                self._market.get_current_orders()
+                _timed(self._get_orders())
             )
-        
-        position = position_task.result()
-        orders = orders_task.result()
 
-        return AccountState(
+        position, position_fetched_at = position_task.result()
+        orders, orders_fetched_at = orders_task.result()
+
+        account = AccountState(
             position=position,
             orders = orders
         )
-    
+        return account, block, position_fetched_at, orders_fetched_at
+
+    async def _get_position(self) -> PositionInfo:
+        with tracing.span("position_fetch"):
+            return await self._market.get_total_position()
+
+    async def _get_orders(self) -> AllOrders:
+        with tracing.span("orders_fetch"):
+            return await self._market.get_current_orders()
+
     async def _get_fair_price(self) -> Decimal:
-        return await self._fp_fetcher.get_price()
+        with tracing.span("oracle_fetch"):
+            return await self._fp_fetcher.get_price()
+
+
+def _is_strk(token: Instrument) -> bool:
+    return isinstance(token, StarknetToken) and token.address == SN_STRK.address
+
 
+async def _timed(aw: Awaitable[T]) -> tuple[T, float]:
+    '''
+    Returns the result of the awaitable and the unix timestamp of its completion.
+    '''
+    result = await aw
+    return result, time.time()
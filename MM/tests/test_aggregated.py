@@ -0,0 +1,103 @@
+import asyncio
+import time
+import unittest
+from decimal import Decimal
+
+from oracles.data_sources.aggregated import AggregatedDataSource
+from oracles.data_sources.data_source import DataSource
+
+
+class FixedDataSource(DataSource):
+    '''
+    Answers `price` after `delay` seconds (never if None), holds `cached` in memory.
+    '''
+    def __init__(self, price: str, delay: float | None = 0, cached: str | None = None) -> None:
+        self.price = Decimal(price)
+        self.delay = delay
+        self.cached = Decimal(cached) if cached is not None else None
+        self.canceled = False
+
+    async def get_price(self) -> Decimal:
+        try:
+            if self.delay is None:
+                await asyncio.Event().wait()
+            else:
+                await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.canceled = True
+            raise
+        return self.price
+
+    def get_cached_price(self) -> Decimal | None:
+        return self.cached
+
+
+class AggregatedDataSourceTest(unittest.IsolatedAsyncioTestCase):
+    async def test_returns_on_quorum_without_waiting_for_hanging_source(self) -> None:
+        hanging = FixedDataSource("150", delay=None)
+        source = AggregatedDataSource(
+            {"a": FixedDataSource("100"), "b": FixedDataSource("101"), "c": hanging},
+            source_timeout=5,
+            outlier_grace=0.05,
+        )
+
+        start = time.perf_counter()
+        price = await source.get_price()
+
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(price, Decimal("100.5"))
+        await asyncio.sleep(0)
+        self.assertTrue(hanging.canceled)
+
+    async def test_grace_lets_outlier_be_rejected(self) -> None:
+        source = AggregatedDataSource(
+            {"a": FixedDataSource("100"), "b": FixedDataSource("101"), "c": FixedDataSource("150", delay=0.02)},
+            outlier_grace=1,
+        )
+
+        self.assertEqual(await source.get_price(), Decimal("100.5"))
+
+    async def test_returns_once_enough_prices_for_outliers(self) -> None:
+        hanging = FixedDataSource("100", delay=None)
+        source = AggregatedDataSource(
+            {
+                "a": FixedDataSource("100"),
+                "b": FixedDataSource("101"),
+                "c": FixedDataSource("150"),
+                "d": hanging,
+            },
+            source_timeout=5,
+            outlier_grace=5,
+        )
+
+        start = time.perf_counter()
+        self.assertEqual(await source.get_price(), Decimal("100.5"))
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    async def test_fails_without_quorum(self) -> None:
+        source = AggregatedDataSource(
+            {"a": FixedDataSource("100"), "b": FixedDataSource("101", delay=None)},
+            source_timeout=0.05,
+        )
+
+        with self.assertRaises(ValueError):
+            await source.get_price()
+
+    async def test_cached_price_needs_only_quorum(self) -> None:
+        source = AggregatedDataSource({
+            "a": FixedDataSource("1", cached="100"),
+            "b": FixedDataSource("1", cached="102"),
+            "c": FixedDataSource("1", cached=None),
+        })
+        self.assertEqual(source.get_cached_price(), Decimal("101"))
+
+        source = AggregatedDataSource({
+            "a": FixedDataSource("1", cached="100"),
+            "b": FixedDataSource("1", cached=None),
+            "c": FixedDataSource("1", cached=None),
+        })
+        self.assertIsNone(source.get_cached_price())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from typing import Any
+
+from platforms.starknet.batched_reader import BatchedStarknetReader
+
+
+class CountingClient:
+    '''
+    Stand-in for a client whose view calls return the block they read and the call number.
+    '''
+    def __init__(self) -> None:
+        self.calls: list[int | None] = []
+
+    async def call_contract(self, call: Any, block_number: int | None = None) -> list[int]:
+        self.calls.append(block_number)
+        await asyncio.sleep(0.01)
+        return [block_number or 0, len(self.calls)]
+
+
+def prepared(selector: int = 1) -> Any:
+    return SimpleNamespace(to_addr=10, selector=selector, calldata=[1, 2])
+
+
+class BatchedReaderSnapshotTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.client = CountingClient()
+        self.reader = BatchedStarknetReader(self.client, batch_window=0)  # type: ignore[arg-type]
+
+    async def test_concurrent_snapshots_read_their_own_blocks(self) -> None:
+        async def fetch(block_number: int) -> tuple[int | None, list[int]]:
+            with self.reader.snapshot(block_number=block_number):
+                await asyncio.sleep(0.01)
+                return self.reader.block_number, await self.reader.call_raw(prepared())
+
+        (first_block, first), (second_block, second) = await asyncio.gather(fetch(5), fetch(7))
+
+        self.assertEqual((first_block, first[0]), (5, 5))
+        self.assertEqual((second_block, second[0]), (7, 7))
+        self.assertIsNone(self.reader.block_number)
+
+    async def test_results_are_shared_only_within_snapshot(self) -> None:
+        with self.reader.snapshot(block_number=3):
+            first = await self.reader.call_raw(prepared())
+            again = await self.reader.call_raw(prepared())
+
+            # Tasks created within the snapshot share it.
+            nested = await asyncio.create_task(self.reader.call_raw(prepared()))
+
+        self.assertEqual(first, again)
+        self.assertEqual(first, nested)
+        self.assertEqual(self.client.calls, [3])
+
+        with self.reader.snapshot(block_number=3):
+            fresh = await self.reader.call_raw(prepared())
+        self.assertNotEqual(first, fresh)
+
+    async def test_overlapping_snapshots_dont_keep_results(self) -> None:
+        entered = asyncio.Event()
+        release = asyncio.Event()
+
+        async def long_fetch() -> None:
+            with self.reader.snapshot():
+                entered.set()
+                await release.wait()
+
+        task = asyncio.create_task(long_fetch())
+        await entered.wait()
+
+        with self.reader.snapshot():
+            first = await self.reader.call_raw(prepared())
+        with self.reader.snapshot():
+            second = await self.reader.call_raw(prepared())
+
+        release.set()
+        await task
+        self.assertNotEqual(first, second)
+
+    async def test_concurrent_identical_calls_share_request(self) -> None:
+        results = await asyncio.gather(*(self.reader.call_raw(prepared()) for _ in range(3)))
+
+        self.assertEqual(len(self.client.calls), 1)
+        self.assertEqual(len(set(map(tuple, results))), 1)
+
+    async def test_nested_snapshot_pinned_to_other_block(self) -> None:
+        with self.reader.snapshot():
+            with self.reader.snapshot(block_number=9):
+                self.assertEqual(self.reader.block_number, 9)
+                pinned = await self.reader.call_raw(prepared())
+            self.assertIsNone(self.reader.block_number)
+
+        self.assertEqual(pinned[0], 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import random
+import unittest
+from types import SimpleNamespace
+from typing import Any
+
+from starknet_py.net.client_models import Call
+
+from tx_builders.call_cost_model import CallCostModel, pack_calls
+
+SUBMIT = Call(to_addr=1, selector=10, calldata=[])
+DELETE = Call(to_addr=1, selector=11, calldata=[])
+
+
+def receipt(l2_gas: int) -> Any:
+    return SimpleNamespace(execution_resources=SimpleNamespace(l2_gas=l2_gas))
+
+
+class CallCostModelTest(unittest.TestCase):
+    def test_single_shape_predicts_observed_gas(self) -> None:
+        model = CallCostModel()
+        for _ in range(50):
+            model.observe([SUBMIT, SUBMIT], receipt(12_000_000))
+
+        self.assertAlmostEqual(model.transaction_cost([SUBMIT, SUBMIT]), 12_000_000, delta=10_000)
+
+    def test_mixed_shapes_converge_to_costs_of_entry_points(self) -> None:
+        rng = random.Random(1)
+        gas = {SUBMIT.selector: 5_000_000, DELETE.selector: 15_000_000}
+        model = CallCostModel()
+
+        for _ in range(30):
+            calls = [rng.choice([SUBMIT, DELETE]) for _ in range(rng.randint(1, 6))]
+            noise = rng.gauss(0, 100_000)
+            model.observe(calls, receipt(int(2_000_000 + sum(gas[c.selector] for c in calls) + noise)))
+
+        self.assertAlmostEqual(model.call_cost(SUBMIT), 5_000_000, delta=150_000)
+        self.assertAlmostEqual(model.call_cost(DELETE), 15_000_000, delta=150_000)
+        self.assertAlmostEqual(model.transaction_cost([]), 2_000_000, delta=300_000)
+
+    def test_unknown_entry_point_costs_default(self) -> None:
+        model = CallCostModel(default_call_gas=7, tx_overhead=3)
+
+        self.assertEqual(model.transaction_cost([SUBMIT, DELETE]), 17)
+
+    def test_pack_calls_fits_under_limit(self) -> None:
+        model = CallCostModel(default_call_gas=10, tx_overhead=5)
+        groups = [[SUBMIT], [DELETE, SUBMIT], [DELETE], [SUBMIT]]
+
+        # At most 3 calls per transaction fit under 40.
+        self.assertEqual(pack_calls(groups, model, 40), [[SUBMIT, DELETE, SUBMIT], [DELETE, SUBMIT]])
+
+
+if __name__ == "__main__":
+    unittest.main()
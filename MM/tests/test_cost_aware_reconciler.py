@@ -0,0 +1,93 @@
+import unittest
+from decimal import Decimal
+
+# The markets go first, the reconcilers import them back through the state.
+import markets  # noqa: F401
+from marketmaking.order import AllOrders, BasicOrder, DesiredOrders, FutureOrder, OpenOrders, TerminalOrders
+from marketmaking.reconciling.cost_aware_reconciler import CostAwareOrderReconciler
+from marketmaking.reconciling.order_reconciler import ReconciledOrders
+from state.account_state import AccountState, PositionInfo
+from state.state import State
+
+TOLERANCE = Decimal("0.01")
+
+
+def resting(price: str, amount: str = "10") -> BasicOrder:
+    return BasicOrder(
+        price=Decimal(price),
+        amount=Decimal(amount),
+        amount_remaining=Decimal(amount),
+        order_id=1,
+        market_id=1,
+        order_side="Bid",
+        entry_time=0,
+        venue="Remus",
+    )
+
+
+def desired(price: str, amount: str = "10") -> FutureOrder:
+    return FutureOrder(order_side="bid", amount=Decimal(amount), price=Decimal(price), platform="Starknet", venue="Remus")
+
+
+def reconcile(
+    reconciler: CostAwareOrderReconciler, existing: BasicOrder, wanted: FutureOrder, call_fee: Decimal | None = None
+) -> ReconciledOrders:
+    open_orders = OpenOrders(bids=[existing], asks=[])
+    state = State(
+        account=AccountState(
+            position=PositionInfo.empty(),
+            orders=AllOrders(active=open_orders, terminal=TerminalOrders(bids=[], asks=[])),
+        ),
+        _fair_price=Decimal(1),
+        call_fee=call_fee,
+    )
+    return reconciler.reconcile(state, open_orders, DesiredOrders(bids=[wanted], asks=[]))
+
+
+class CostAwareReconcilerTest(unittest.TestCase):
+    # Update of 10 units by 0.002 is worth 0.02, two calls cost 0.02 * (1 + hysteresis).
+    def test_skips_update_below_cost(self) -> None:
+        reconciler = CostAwareOrderReconciler(TOLERANCE, TOLERANCE, call_fee=Decimal("0.01"))
+
+        reconciled = reconcile(reconciler, resting("1.000"), desired("0.998"))
+
+        self.assertEqual(len(reconciled.to_keep), 1)
+        self.assertEqual(reconciled.to_place, [])
+        self.assertEqual(reconciled.to_cancel, [])
+
+    def test_emits_update_above_cost(self) -> None:
+        reconciler = CostAwareOrderReconciler(TOLERANCE, TOLERANCE, call_fee=Decimal("0.009"))
+
+        reconciled = reconcile(reconciler, resting("1.000"), desired("0.998"))
+
+        self.assertEqual(reconciled.to_keep, [])
+        self.assertEqual([o.price for o in reconciled.to_place], [Decimal("0.998")])
+        self.assertEqual(len(reconciled.to_cancel), 1)
+
+    def test_hysteresis_raises_threshold(self) -> None:
+        reconciler = CostAwareOrderReconciler(
+            TOLERANCE, TOLERANCE, call_fee=Decimal("0.009"), hysteresis=Decimal("0.5")
+        )
+
+        # 0.02 is below 2 * 0.009 * 1.5 = 0.027, 0.03 above it.
+        self.assertEqual(len(reconcile(reconciler, resting("1.000"), desired("0.998")).to_keep), 1)
+        self.assertEqual(len(reconcile(reconciler, resting("1.000"), desired("0.997")).to_place), 1)
+
+    def test_state_fee_overrides_configured_fee(self) -> None:
+        reconciler = CostAwareOrderReconciler(TOLERANCE, TOLERANCE, call_fee=Decimal("0.01"))
+
+        reconciled = reconcile(reconciler, resting("1.000"), desired("0.998"), call_fee=Decimal("0.001"))
+
+        self.assertEqual(len(reconciled.to_place), 1)
+
+    def test_replaces_orders_outside_tolerance_regardless_of_fee(self) -> None:
+        reconciler = CostAwareOrderReconciler(TOLERANCE, TOLERANCE, call_fee=Decimal(1000))
+
+        reconciled = reconcile(reconciler, resting("1.000"), desired("0.98"))
+
+        self.assertEqual(len(reconciled.to_place), 1)
+        self.assertEqual(len(reconciled.to_cancel), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
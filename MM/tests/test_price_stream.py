@@ -0,0 +1,158 @@
+import asyncio
+import unittest
+from decimal import Decimal
+from typing import Callable
+
+from aiohttp import web
+
+from networking.http_session import close_http_sessions
+from oracles.data_sources.data_source import DataSource
+from oracles.data_sources.price_stream import (
+    PriceStream, StreamingDataSource, parse_book_ticker_mid, single_price
+)
+
+
+class LocalWebsocketServer:
+    '''
+    Stand-in for an exchange websocket: every connection gets the `updates` (book tickers)
+    and is then either closed or kept open silently.
+    '''
+    def __init__(self, updates: list[dict[str, str]], close: bool) -> None:
+        self.updates = updates
+        self.close = close
+        self.connected_at: list[float] = []
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/ws", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"ws://127.0.0.1:{port}/ws"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        self.connected_at.append(asyncio.get_running_loop().time())
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        for update in self.updates:
+            await ws.send_json(update)
+
+        if not self.close:
+            async for _ in ws:
+                pass
+        await ws.close()
+        return ws
+
+
+class FixedDataSource(DataSource):
+    def __init__(self, price: Decimal) -> None:
+        self.price = price
+        self.calls = 0
+
+    async def get_price(self) -> Decimal:
+        self.calls += 1
+        return self.price
+
+    async def get_volume(self) -> Decimal | None:
+        return None
+
+
+class PriceStreamTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        # Cleanups run in reverse, so the shared session is closed after the streams stop.
+        self.addAsyncCleanup(close_http_sessions)
+
+    async def _start(self, server: LocalWebsocketServer, **kwargs: float) -> PriceStream:
+        await server.start()
+        self.addAsyncCleanup(server.stop)
+
+        stream = PriceStream(name="local", url=server.url, parse=parse_book_ticker_mid, **kwargs)
+        await stream.start()
+        self.addAsyncCleanup(stream.stop)
+        return stream
+
+    async def _wait_for(self, condition: Callable[[], object], timeout: float = 5) -> None:
+        async def wait() -> None:
+            while not condition():
+                await asyncio.sleep(0.01)
+        await asyncio.wait_for(wait(), timeout)
+
+    async def test_streams_mid_price(self) -> None:
+        server = LocalWebsocketServer([{"b": "99", "a": "101"}], close=False)
+        stream = await self._start(server)
+
+        await self._wait_for(lambda: stream.price is not None)
+        self.assertEqual(stream.price, Decimal(100))
+
+    async def test_reconnects_with_exponential_backoff(self) -> None:
+        # The server drops every connection without any update, so the backoff keeps doubling.
+        server = LocalWebsocketServer([], close=True)
+        await self._start(server, min_reconnect_backoff=0.05, max_reconnect_backoff=0.2)
+
+        await self._wait_for(lambda: len(server.connected_at) >= 5)
+        gaps = [b - a for a, b in zip(server.connected_at, server.connected_at[1:])]
+
+        for gap, backoff in zip(gaps, (0.05, 0.1, 0.2, 0.2)):
+            self.assertGreaterEqual(gap, backoff)
+        self.assertGreater(gaps[2], gaps[0] * 2)
+
+    async def test_backoff_resets_after_healthy_connection(self) -> None:
+        server = LocalWebsocketServer([{"b": "1", "a": "3"}], close=True)
+        stream = await self._start(server, min_reconnect_backoff=0.05, max_reconnect_backoff=10)
+
+        await self._wait_for(lambda: len(server.connected_at) >= 4)
+        gaps = [b - a for a, b in zip(server.connected_at, server.connected_at[1:])]
+
+        # Every connection delivered an update, so none of them backed off further.
+        self.assertLess(max(gaps), 0.5)
+        self.assertEqual(stream.price, Decimal(2))
+
+    async def test_price_is_none_once_stale(self) -> None:
+        server = LocalWebsocketServer([{"b": "1", "a": "3"}], close=False)
+        stream = await self._start(server, max_staleness=0.2)
+
+        await self._wait_for(lambda: stream.price is not None)
+        self.assertEqual(stream.price, Decimal(2))
+
+        await asyncio.sleep(0.3)
+        self.assertIsNone(stream.price)
+        self.assertGreater(stream.age or 0, 0.2)
+
+    async def test_falls_back_to_rest_without_fresh_price(self) -> None:
+        server = LocalWebsocketServer([], close=False)
+        stream = await self._start(server)
+        fallback = FixedDataSource(Decimal(42))
+        source = StreamingDataSource([stream], single_price, fallback)
+
+        await self._wait_for(lambda: server.connected_at)
+        self.assertEqual(await source.get_price(), Decimal(42))
+        self.assertEqual(fallback.calls, 1)
+
+    async def test_uses_stream_while_fresh(self) -> None:
+        server = LocalWebsocketServer([{"b": "9", "a": "11"}], close=False)
+        stream = await self._start(server, max_staleness=0.2)
+        fallback = FixedDataSource(Decimal(42))
+        source = StreamingDataSource([stream], single_price, fallback)
+
+        await self._wait_for(lambda: stream.price is not None)
+        self.assertEqual(await source.get_price(), Decimal(10))
+        self.assertEqual(source.get_cached_price(), Decimal(10))
+        self.assertEqual(fallback.calls, 0)
+
+        await asyncio.sleep(0.3)
+        self.assertIsNone(source.get_cached_price())
+        self.assertEqual(await source.get_price(), Decimal(42))
+        self.assertEqual(fallback.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import itertools
+import random
+import unittest
+from decimal import Decimal
+
+# The markets go first, the reconcilers import them back through the state.
+import markets  # noqa: F401
+from marketmaking.order import AllOrders, BasicOrder, DesiredOrders, FutureOrder, OpenOrders, TerminalOrders
+from marketmaking.reconciling.assignment import min_cost_assignment
+from marketmaking.reconciling.cost_aware_reconciler import CostAwareOrderReconciler
+from marketmaking.reconciling.matching_reconciler import MatchingOrderReconciler
+from marketmaking.reconciling.order_reconciler import OrderReconciler
+from marketmaking.reconciling.tolerance_reconciler import ToleranceOrderReconciler
+from state.account_state import AccountState, PositionInfo
+from state.state import State
+
+
+def resting(order_id: int, side: str, price: str, amount: str) -> BasicOrder:
+    return BasicOrder(
+        price=Decimal(price),
+        amount=Decimal(amount),
+        amount_remaining=Decimal(amount),
+        order_id=order_id,
+        market_id=1,
+        order_side=side,
+        entry_time=0,
+        venue="Remus",
+    )
+
+
+def desired(side: str, price: str, amount: str) -> FutureOrder:
+    return FutureOrder(
+        order_side=side, amount=Decimal(amount), price=Decimal(price), platform="Starknet", venue="Remus"
+    )
+
+
+class MixedCaseSidesTest(unittest.TestCase):
+    '''
+    Venues name the sides of resting orders "Bid" and "Ask", the order chain "bid" and "ask".
+    '''
+    def reconcilers(self) -> list[OrderReconciler]:
+        tolerance = Decimal("0.01")
+        return [
+            ToleranceOrderReconciler(tolerance, tolerance),
+            MatchingOrderReconciler(tolerance, tolerance),
+            CostAwareOrderReconciler(tolerance, tolerance, call_fee=Decimal("0.001")),
+        ]
+
+    def test_keeps_orders_within_tolerance(self) -> None:
+        existing = OpenOrders.from_list([
+            resting(1, "Bid", "0.99", "10"),
+            resting(2, "Ask", "1.01", "10"),
+            resting(3, "Ask", "1.50", "10"),
+        ])
+        orders = DesiredOrders(
+            bids=[desired("bid", "0.9901", "10")],
+            asks=[desired("ask", "1.0099", "10"), desired("ask", "1.2", "10")],
+        )
+        state = State(
+            account=AccountState(
+                position=PositionInfo.empty(),
+                orders=AllOrders(active=existing, terminal=TerminalOrders(bids=[], asks=[])),
+            ),
+            _fair_price=Decimal(1),
+        )
+
+        for reconciler in self.reconcilers():
+            with self.subTest(reconciler=type(reconciler).__name__):
+                reconciled = reconciler.reconcile(state, existing, orders)
+
+                self.assertEqual(sorted(o.order_id for o in reconciled.to_keep), [1, 2])
+                self.assertEqual([o.order_id for o in reconciled.to_cancel], [3])
+                self.assertEqual([o.price for o in reconciled.to_place], [Decimal("1.2")])
+
+    def test_other_side_is_not_within_tolerance(self) -> None:
+        ask = resting(1, "Ask", "1", "10")
+
+        for reconciler in (
+            ToleranceOrderReconciler(Decimal("0.01"), Decimal("0.01")),
+            MatchingOrderReconciler(Decimal("0.01"), Decimal("0.01")),
+        ):
+            with self.subTest(reconciler=type(reconciler).__name__):
+                self.assertTrue(reconciler.is_within_tolerance(existing=ask, desired=desired("ask", "1", "10")))
+                self.assertFalse(reconciler.is_within_tolerance(existing=ask, desired=desired("bid", "1", "10")))
+
+
+class MinCostAssignmentTest(unittest.TestCase):
+    def brute_force(self, cost: list[list[float]]) -> float:
+        return min(
+            sum(cost[i][j] for i, j in enumerate(columns))
+            for columns in itertools.permutations(range(len(cost[0])), len(cost))
+        )
+
+    def test_matches_brute_force(self) -> None:
+        rng = random.Random(7)
+        for rows, columns in [(1, 1), (2, 2), (3, 3), (4, 4), (5, 5), (1, 4), (2, 5), (3, 6), (4, 6)]:
+            for _ in range(20):
+                cost = [[rng.choice([rng.uniform(-5, 5), float(rng.randint(0, 3))]) for _ in range(columns)]
+                        for _ in range(rows)]
+                with self.subTest(cost=cost):
+                    assignment = min_cost_assignment(cost)
+
+                    self.assertEqual(len(set(assignment)), rows)
+                    self.assertAlmostEqual(sum(cost[i][j] for i, j in enumerate(assignment)), self.brute_force(cost))
+
+    def test_more_rows_than_columns(self) -> None:
+        with self.assertRaises(ValueError):
+            min_cost_assignment([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]])
+
+    def test_empty(self) -> None:
+        self.assertEqual(min_cost_assignment([]), [])
+
+
+class MatchingReconcilerTest(unittest.TestCase):
+    TOLERANCE = Decimal("0.01")
+
+    def brute_force(
+        self, reconciler: MatchingOrderReconciler, existing: list[BasicOrder], desired: list[FutureOrder]
+    ) -> int:
+        '''
+        Size of the maximum matching by trying every existing order (or none) for every desired one.
+        '''
+        def best(i: int, used: frozenset[int]) -> int:
+            if i == len(desired):
+                return 0
+            result = best(i + 1, used)
+            for j, order in enumerate(existing):
+                if j not in used and reconciler.is_within_tolerance(existing=order, desired=desired[i]):
+                    result = max(result, 1 + best(i + 1, used | {j}))
+            return result
+
+        return best(0, frozenset())
+
+    def test_keeps_maximum_matching(self) -> None:
+        reconciler = MatchingOrderReconciler(self.TOLERANCE, self.TOLERANCE)
+        rng = random.Random(11)
+        # Levels closer than the tolerance, so the windows of the desired orders overlap.
+        prices = [Decimal(1) + Decimal("0.004") * k for k in range(8)]
+        amounts = [Decimal(10), Decimal("10.05"), Decimal("10.2")]
+
+        for _ in range(300):
+            existing = [
+                resting(j, "Bid", str(rng.choice(prices)), str(rng.choice(amounts))) for j in range(rng.randint(0, 6))
+            ]
+            desired_orders = [
+                desired("bid", str(rng.choice(prices) + Decimal("0.002") * rng.randint(-1, 1)), str(rng.choice(amounts)))
+                for _ in range(rng.randint(0, 6))
+            ]
+            with self.subTest(existing=existing, desired=desired_orders):
+                matches = reconciler.match_side(existing, desired_orders)
+
+                self.assertEqual(len(set(matches.values())), len(matches))
+                for i, j in matches.items():
+                    self.assertTrue(reconciler.is_within_tolerance(existing=existing[j], desired=desired_orders[i]))
+                self.assertEqual(len(matches), self.brute_force(reconciler, existing, desired_orders))
+
+    def test_keeps_more_than_first_fit(self) -> None:
+        # The first acceptable order of the lower desired one is the only acceptable one of the higher.
+        existing = OpenOrders.from_list([resting(1, "Bid", "1.01", "10"), resting(2, "Bid", "1.00", "10")])
+        orders = DesiredOrders(bids=[desired("bid", "1.005", "10"), desired("bid", "1.015", "10")], asks=[])
+        state = State(
+            account=AccountState(
+                position=PositionInfo.empty(),
+                orders=AllOrders(active=existing, terminal=TerminalOrders(bids=[], asks=[])),
+            ),
+            _fair_price=Decimal(1),
+        )
+
+        first_fit = ToleranceOrderReconciler(self.TOLERANCE, self.TOLERANCE).reconcile(state, existing, orders)
+        matching = MatchingOrderReconciler(self.TOLERANCE, self.TOLERANCE).reconcile(state, existing, orders)
+
+        self.assertEqual(len(first_fit.to_keep), 1)
+        self.assertEqual(sorted(o.order_id for o in matching.to_keep), [1, 2])
+        self.assertEqual(matching.to_place, [])
+        self.assertEqual(matching.to_cancel, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
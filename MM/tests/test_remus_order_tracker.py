@@ -0,0 +1,165 @@
+import asyncio
+import unittest
+from decimal import Decimal
+from types import SimpleNamespace
+
+from starknet_py.abi.v2.parser import AbiParser
+from starknet_py.net.full_node_client import FullNodeClient
+
+# The markets go first, the venues import them back through the market configs.
+import markets  # noqa: F401
+from benchmarks.mock_starknet import MockStarknetNode, deploy_venues
+from benchmarks.mock_starknet.abis import REMUS_ABI
+from benchmarks.mock_starknet.contracts import MAX_UINT
+from platforms.starknet.abi_cache import AbiCache
+from platforms.starknet.batched_reader import BatchedStarknetReader
+from venues.remus.remus import RemusDexView
+from venues.remus.remus_events import ORDER_FILLED, RemusEventDecoder
+from venues.remus.remus_market_configs import get_preloaded_remus_market_config
+from venues.remus.remus_order_tracker import RemusOrderTracker
+
+USER = 0xB0B
+OTHER = 0xA11CE
+MARKET_ID = 1
+PRICE = 3000 * 10**18
+SIZE = 10**16
+
+# The ABI of every node is the same, parsing it is slow.
+ABI_CACHE = AbiCache()
+
+
+class RemusOrderTrackerTest(unittest.IsolatedAsyncioTestCase):
+    '''
+    Blocks are produced by the test only, the events of each step appear with the next one.
+    '''
+    async def asyncSetUp(self) -> None:
+        market_cfg = get_preloaded_remus_market_config(MARKET_ID)
+        assert market_cfg is not None
+        self.base = market_cfg.base_token.address
+
+        self.node = MockStarknetNode(block_time=3600)
+        self.remus, _ = deploy_venues(self.node, USER, balances={self.base: 10 * SIZE})
+        self.remus._tokens[self.base].mint(OTHER, 10 * SIZE)
+        for owner in (USER, OTHER):
+            self.remus._tokens[self.base].allowances[(owner, self.remus.address)] = MAX_UINT
+        await self.node.start()
+
+        client = FullNodeClient(node_url=self.node.url)
+        reader = BatchedStarknetReader(client=client)
+        view = await RemusDexView.from_provider(client, reader=reader, abi_cache=ABI_CACHE)
+        self.tracker = RemusOrderTracker(view=view, client=client, reader=reader, user_address=USER)
+
+    async def asyncTearDown(self) -> None:
+        await self.node.stop()
+
+    def submit(self, owner: int) -> int:
+        self.remus.submit_maker_order(
+            owner,
+            market_id=MARKET_ID,
+            target_token_address=self.base,
+            order_price=PRICE,
+            order_size=SIZE,
+            order_side=SimpleNamespace(variant="Ask"),
+            order_type=SimpleNamespace(variant="Basic"),
+            time_limit=SimpleNamespace(variant="GTC"),
+        )
+        return max(self.remus.orders)
+
+    async def orders(self) -> dict[int, Decimal]:
+        self.node._new_block()
+        orders = await self.tracker.get_orders(MARKET_ID)
+        return {o.order_id: o.amount_remaining for o in orders.active.all_orders}
+
+    def full_reads(self) -> int:
+        return self.node.stats.calls["get_all_user_orders"]
+
+    async def test_own_submit_and_cancel_dont_resync(self) -> None:
+        self.assertEqual(await self.orders(), {})
+        self.assertEqual(self.full_reads(), 1)
+
+        order_id = self.submit(USER)
+        self.assertEqual(await self.orders(), {order_id: Decimal("0.01")})
+
+        self.remus.delete_maker_order(USER, order_id)
+        self.assertEqual(await self.orders(), {})
+
+        self.assertEqual(self.full_reads(), 1)
+
+    async def test_fills_reduce_and_remove_orders(self) -> None:
+        order_id = self.submit(USER)
+        await self.orders()
+
+        self.remus.fill(order_id, SIZE // 4)
+        self.assertEqual(await self.orders(), {order_id: Decimal("0.0075")})
+
+        self.remus.fill(order_id, SIZE)
+        self.assertEqual(await self.orders(), {})
+
+        self.assertEqual(self.full_reads(), 1)
+
+    async def test_other_users_orders_are_ignored(self) -> None:
+        await self.orders()
+
+        other_id = self.submit(OTHER)
+        self.remus.fill(other_id, SIZE // 2)
+        self.remus.delete_maker_order(OTHER, other_id)
+
+        self.assertEqual(await self.orders(), {})
+        self.assertEqual(self.full_reads(), 1)
+
+    async def test_concurrent_calls_share_sync(self) -> None:
+        await self.orders()
+        self.submit(USER)
+        self.node._new_block()
+        self.node.stats.reset()
+
+        first, second = await asyncio.gather(
+            self.tracker.get_orders(MARKET_ID), self.tracker.get_orders(MARKET_ID)
+        )
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(first.active.all_orders), 1)
+        self.assertEqual(self.node.stats.methods["starknet_blockNumber"], 1)
+        self.assertEqual(self.node.stats.methods["starknet_getEvents"], 1)
+
+    async def test_unknown_order_resyncs(self) -> None:
+        order_id = self.submit(USER)
+        await self.orders()
+        # Lost from the index, eg. by a bug, so its deletion doesn't apply.
+        del self.tracker._orders[MARKET_ID][order_id]
+
+        self.remus.delete_maker_order(USER, order_id)
+
+        self.assertEqual(await self.orders(), {})
+        self.assertEqual(self.full_reads(), 2)
+
+    async def test_poll_fills_matches_own_orders(self) -> None:
+        order_id = self.submit(USER)
+        other_id = self.submit(OTHER)
+        await self.orders()
+        self.assertFalse(await self.tracker.poll_fills(MARKET_ID))
+
+        self.remus.fill(other_id, SIZE // 2)
+        self.node._new_block()
+        self.assertFalse(await self.tracker.poll_fills(MARKET_ID))
+
+        self.remus.fill(order_id, SIZE // 2)
+        self.node._new_block()
+        self.assertTrue(await self.tracker.poll_fills(MARKET_ID))
+
+
+class RemusEventDecoderTest(unittest.TestCase):
+    def test_missing_events_are_logged(self) -> None:
+        abi = [entry for entry in REMUS_ABI if not entry["name"].endswith(("::OrderFilled", "::Event"))]
+
+        with self.assertLogs("RemusEventDecoder", level="ERROR") as logs:
+            decoder = RemusEventDecoder(AbiParser(abi).parse())
+
+        self.assertIn("OrderFilled", logs.output[0])
+        self.assertFalse(decoder.can_decode(ORDER_FILLED))
+        with self.assertRaises(ValueError):
+            decoder.decode(SimpleNamespace(keys=[decoder.selectors[ORDER_FILLED]], data=[1, 1, USER, 1, 0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,13 +3,32 @@ from markets.market import StarknetMarketABC
 
 from .bundling_tx_builder import BundlingTransactionBuilder
 from .sequential_tx_builder import SequentialTransactionBuilder
+from .pipelined_tx_builder import PipelinedTransactionBuilder
+from .inflight_tracker import InFlightTracker
 from .tx_builder import TxBuilder
 
 
-def get_tx_builder(name: str, market: StarknetMarketABC) -> TxBuilder:
+def get_tx_builder(
+    name: str, market: StarknetMarketABC, args: dict[str, int | bool] | None = None
+) -> TxBuilder:
+    args = args if args is not None else {}
+
     if name == 'bundling_tx_builder':
-        return BundlingTransactionBuilder(market=market)
+        return BundlingTransactionBuilder(
+            market=market,
+            max_tx_l2_gas=int(args.get("max_tx_l2_gas", 500_000_000)),
+        )
     if name == 'sequential_tx_builder':
-        return SequentialTransactionBuilder(market=market)
+        return SequentialTransactionBuilder(
+            market=market,
+            concurrent=bool(args.get("concurrent", False)),
+            window=int(args.get("window", 8)),
+            max_replacements=int(args.get("max_replacements", 2)),
+        )
+    if name == 'pipelined_tx_builder':
+        return PipelinedTransactionBuilder(
+            market=market,
+            max_in_flight=int(args.get("max_in_flight", 2)),
+        )
 
     raise ValueError(f"Unknown tx builder provided: `{name}`")
\ No newline at end of file
@@ -1,4 +1,5 @@
 
+import asyncio
 import logging
 from typing import final
 
@@ -8,7 +9,8 @@ from starknet_py.net.client_models import Calls, Call
 from platforms.starknet.starknet_account import WAccount
 from marketmaking.reconciling.order_reconciler import ReconciledOrders
 from markets.market import StarknetMarketABC
-from monitoring import metrics
+from monitoring import metrics, tracing
+from .call_cost_model import CallCostModel, pack_calls
 from .tx_builder import TxBuilder
 
 
@@ -19,17 +21,27 @@ class BundlingTransactionBuilder(TxBuilder):
     transactions into a single transaction. It is used to cancel and place orders
     in a single transaction to reduce the number of transactions sent to the network.
 
-    Note that currently it bundles all cancel and place orders together without
-    accounting for the steps the big transaction will take.
+    So that the transaction doesn't exceed the Starknet resource limits, the calls are split
+    into the fewest transactions whose L2 gas predicted by the CallCostModel (learned from
+    the receipts) fits under `max_tx_l2_gas`. The calls keep their order, prologue first,
+    then cancels and places, so that the cancels free the liquidity for the places.
+    All the transactions are sent back to back and awaited together.
     '''
     def __init__(
         self,
         market: StarknetMarketABC,
+        max_tx_l2_gas: int = 500_000_000,
+        cost_model: CallCostModel | None = None,
     ) -> None:
         self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
         self._logger.info("Initializing TransactionBuilder")
 
+        if max_tx_l2_gas <= 0:
+            raise ValueError(f"Invalid {max_tx_l2_gas=}")
+
         self.market = market
+        self._max_tx_l2_gas = max_tx_l2_gas
+        self._cost_model = cost_model if cost_model is not None else CallCostModel()
 
 
     async def build_and_execute_transactions(
@@ -39,7 +51,7 @@ class BundlingTransactionBuilder(TxBuilder):
         prologue: list[Calls],
     ) -> None:
         '''
-        Build and execute one big transaction that cancels and places all 
+        Build and execute as few transactions as possible that cancel and place all 
         the reconciled orders.
         '''
         n_cancels = len(reconciled_orders.to_cancel)
@@ -55,42 +67,48 @@ class BundlingTransactionBuilder(TxBuilder):
         self._logger.info(f"Placing orders: {reconciled_orders.to_place}")
         
         # Prepare the calls
-        cancel_calls = [
-            self.market.get_close_order_call(o) 
-            for o in reconciled_orders.to_cancel
-        ]
-
-        place_calls = [
-            self.market.get_submit_order_call(o) 
-            for o in reconciled_orders.to_place
-        ]
-
-        single_cancel_call = _get_single_call_list(cancel_calls)
-        single_place_call = _get_single_call_list(place_calls)
-
-        bundled_call = single_cancel_call + single_place_call
-        
-        # Bundle the call with prologue
-        complete_tx = _get_single_call_list(prologue) + bundled_call
-
-        # Execute the tx
-        nonce = await wrapped_account.get_nonce()
-
-        self._logger.info("Executing bundled transaction.")
-        sent = await wrapped_account.account.execute_v3(
-            calls=complete_tx,
-            auto_estimate=True,
-            nonce = nonce
+        with tracing.span("calldata_build", calls=n_cancels + n_places + n_prologues):
+            cancel_calls = [
+                self.market.get_close_order_call(o) 
+                for o in reconciled_orders.to_cancel
+            ]
+
+            place_calls = [
+                self.market.get_submit_order_call(o) 
+                for o in reconciled_orders.to_place
+            ]
+
+            # Calls of a single prologue op or order are never split.
+            groups = [
+                _get_single_call_list(c)
+                for c in [*prologue, *cancel_calls, *place_calls]
+            ]
+            chunks = pack_calls(groups, self._cost_model, self._max_tx_l2_gas)
+
+        # Execute the txs, the nonces keep them in order.
+        self._logger.info("Executing %s bundled transaction(s).", len(chunks))
+        sent = []
+        for chunk in chunks:
+            tx = await wrapped_account.execute_v3(calls=chunk)
+            self._logger.info(
+                f"Bundled transaction `{hex(tx.transaction_hash)}` with {len(chunk)} calls sent."
+            )
+            sent.append(tx)
+
+        receipts = await asyncio.gather(
+            *(
+                wrapped_account.wait_for_tx(tx_hash=tx.transaction_hash, check_interval = 0.5)
+                for tx in sent
+            ),
+            return_exceptions=True,
         )
-        self._logger.info(f"Bundled transaction `{hex(sent.transaction_hash)}` sent.")
 
-        await wrapped_account.increment_nonce()
-        await wrapped_account.account.client.wait_for_tx(
-            tx_hash=sent.transaction_hash,
-            check_interval = 0.5
-        )
+        for chunk, receipt in zip(chunks, receipts):
+            if isinstance(receipt, BaseException):
+                raise receipt
+            self._cost_model.observe(chunk, receipt)
 
-        self._logger.info(f"Executed transaction {hex(sent.transaction_hash)} successfully")
+        self._logger.info(f"Executed {len(sent)} transaction(s) successfully")
 
         metrics.track_orders_canceled(n_cancels)
         metrics.track_orders_sent(n_places)
@@ -0,0 +1,132 @@
+import logging
+
+from starknet_py.net.client_models import Call, TransactionReceipt
+
+# Identifies the entry point of a call: contract address and selector.
+EntryPoint = tuple[int, int]
+
+
+# Variance of the costs of entry points not seen yet (and of the overhead) relative to the noise
+# of the observed gas. Large, so that the first observations override the defaults.
+INITIAL_VARIANCE = 1_000.0
+
+
+class CallCostModel:
+    '''
+    Predicts the L2 gas (which covers the Cairo steps and builtins) a multicall transaction
+    consumes, so that calls can be packed into transactions that fit the resource limits.
+
+    The cost of a transaction is modeled as `tx_overhead` (account validation and execution)
+    plus the cost of each call, keyed by its entry point. Entry points not seen yet cost
+    `default_call_gas`. The costs are learned from the `execution_resources` of the receipts
+    by recursive least squares: every receipt is an observation of the gas of the overhead plus
+    the numbers of calls of each entry point, so transactions with different mixes of calls tell
+    the costs of the entry points apart. Older observations are discounted by `forgetting`
+    per observation, so that the costs follow changes of the contracts.
+    '''
+    def __init__(
+        self,
+        default_call_gas: int = 20_000_000,
+        tx_overhead: int = 2_000_000,
+        forgetting: float = 0.99,
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        if default_call_gas <= 0 or tx_overhead < 0 or not (0 < forgetting <= 1):
+            raise ValueError(f"Invalid params: {default_call_gas=} {tx_overhead=} {forgetting=}")
+
+        self._default_call_gas = default_call_gas
+        self._forgetting = forgetting
+
+        # Parameter 0 is the overhead, the others are the costs of the entry points in `_index`.
+        self._index: dict[EntryPoint, int] = {}
+        self._theta: list[float] = [float(tx_overhead)]
+        self._covariance: list[list[float]] = [[INITIAL_VARIANCE]]
+
+    def call_cost(self, call: Call) -> int:
+        return max(int(self._fitted_cost(call)), 0)
+
+    def transaction_cost(self, calls: list[Call]) -> int:
+        # Only the total is clamped. If all the transactions have the same calls, the fit can't
+        # split their gas between the overhead and the calls (eg. the overhead comes out negative),
+        # but the sum still predicts the observed transactions.
+        return max(int(self._theta[0] + sum(self._fitted_cost(c) for c in calls)), 0)
+
+    def observe(self, calls: list[Call], receipt: TransactionReceipt) -> None:
+        '''
+        Updates the costs by the gas the transaction with given calls actually consumed.
+        '''
+        actual = receipt.execution_resources.l2_gas if receipt.execution_resources else None
+        if not actual or not calls:
+            return
+
+        predicted = self.transaction_cost(calls)
+
+        # Numbers of calls of the entry points, the overhead is paid once.
+        indices = [self._add(_entry_point(call)) for call in calls]
+        x = [0.0] * len(self._theta)
+        x[0] = 1.0
+        for i in indices:
+            x[i] += 1.0
+
+        n = len(x)
+        p = self._covariance
+        px = [sum(p[i][j] * x[j] for j in range(n)) for i in range(n)]
+        gain = [v / (self._forgetting + sum(xi * v for xi, v in zip(x, px))) for v in px]
+
+        error = actual - sum(t * xi for t, xi in zip(self._theta, x))
+        self._theta = [t + g * error for t, g in zip(self._theta, gain)]
+
+        # Without forgetting for directions no transaction excites, the covariance would grow
+        # without bounds, so it is discounted only while bounded by the initial variance.
+        forgetting = self._forgetting if max(p[i][i] for i in range(n)) < INITIAL_VARIANCE else 1.0
+        self._covariance = [
+            [(p[i][j] - gain[i] * px[j]) / forgetting for j in range(n)]
+            for i in range(n)
+        ]
+
+        self._logger.debug("Observed %s L2 gas for %s calls, predicted %s.", actual, len(calls), predicted)
+
+    def _fitted_cost(self, call: Call) -> float:
+        i = self._index.get(_entry_point(call))
+        return float(self._default_call_gas) if i is None else self._theta[i]
+
+    def _add(self, entry_point: EntryPoint) -> int:
+        '''
+        Returns the index of the entry point's cost, adding it with the default cost if unknown.
+        '''
+        i = self._index.get(entry_point)
+        if i is None:
+            i = len(self._theta)
+            self._index[entry_point] = i
+            self._theta.append(float(self._default_call_gas))
+            for row in self._covariance:
+                row.append(0.0)
+            self._covariance.append([0.0] * i + [INITIAL_VARIANCE])
+        return i
+
+
+def _entry_point(call: Call) -> EntryPoint:
+    return call.to_addr, call.selector
+
+
+def pack_calls(groups: list[list[Call]], cost_model: CallCostModel, max_gas: int) -> list[list[Call]]:
+    '''
+    Packs the groups of calls (eg. calls of one order, which must not be split) into the fewest
+    transactions whose predicted cost fits under `max_gas`, keeping the order of the groups.
+    A group that doesn't fit alone gets a transaction of its own.
+    '''
+    chunks: list[list[Call]] = []
+    chunk: list[Call] = []
+
+    for group in groups:
+        # Greedily filling each transaction is optimal when the order of the groups is kept.
+        if chunk and cost_model.transaction_cost(chunk + group) > max_gas:
+            chunks.append(chunk)
+            chunk = []
+        chunk.extend(group)
+
+    if chunk:
+        chunks.append(chunk)
+
+    return chunks
@@ -0,0 +1,205 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from starknet_py.net.client import Client
+
+from marketmaking.order import AllOrders, BasicOrder, FutureOrder, OpenOrders
+from marketmaking.reconciling.order_reconciler import ReconciledOrders
+from monitoring import metrics, tracing
+
+# Order id of orders that were sent to the chain, but their transaction is not confirmed yet.
+PENDING_ORDER_ID = -1
+
+
+@dataclass
+class InFlightTransaction:
+    '''
+    Transaction that was sent to the chain together with the orders it cancels and places.
+    `settled_at` is set (in event loop time) once the transaction is included in a block
+    (`block_number`) or failed.
+    '''
+    tx_hash: int
+    to_cancel: list[BasicOrder]
+    to_place: list[FutureOrder]
+    sent_at: float
+    settled_at: float | None = None
+    block_number: int | None = None
+    failed: bool = False
+
+
+class InFlightTracker:
+    '''
+    Tracks transactions that were sent but not confirmed yet, so that the next pulse
+    can be computed while the previous one is still being confirmed.
+
+    The orders the in-flight transactions cancel and place are overlaid over freshly
+    fetched orders, so that the reconciler sees the predicted post-transaction order book.
+    Placed orders have no order id yet, so they are represented with `PENDING_ORDER_ID`.
+
+    If the orders were fetched at a known block, transactions are overlaid exactly when they were
+    not included in that block. Otherwise it is decided by the time of the fetch and the settlement.
+    '''
+    def __init__(self, market_id: int, check_interval: float = 0.5) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        self._market_id = market_id
+        self._check_interval = check_interval
+
+        self._transactions: list[InFlightTransaction] = []
+        self._tasks: dict[int, asyncio.Task[None]] = {}
+        self._failures: list[Exception] = []
+
+    @property
+    def pending(self) -> list[InFlightTransaction]:
+        return [t for t in self._transactions if t.settled_at is None]
+
+    def track(self, client: Client, tx_hash: int, reconciled_orders: ReconciledOrders) -> None:
+        '''
+        Starts tracking of sent transaction. Confirmation is awaited in background.
+        '''
+        tx = InFlightTransaction(
+            tx_hash=tx_hash,
+            to_cancel=list(reconciled_orders.to_cancel),
+            to_place=list(reconciled_orders.to_place),
+            sent_at=asyncio.get_running_loop().time(),
+        )
+        self._transactions.append(tx)
+
+        task = asyncio.create_task(self._confirm(client, tx))
+        self._tasks[tx_hash] = task
+        task.add_done_callback(lambda _: self._tasks.pop(tx_hash, None))
+
+    async def wait_all(self) -> None:
+        '''
+        Waits until all in-flight transactions are settled.
+        '''
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def wait_oldest(self) -> None:
+        '''
+        Waits until the oldest in-flight transaction is settled.
+        '''
+        pending = self.pending
+        if not pending:
+            return
+
+        task = self._tasks.get(pending[0].tx_hash)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    def raise_failures(self) -> None:
+        '''
+        Re-raises the first error of failed in-flight transactions (if any) so
+        it can be handled by the main loop.
+        '''
+        if self._failures:
+            failure = self._failures[0]
+            self._failures = []
+            raise failure
+
+    def settled_since(self, since: float) -> bool:
+        '''
+        Returns whether any transaction settled at or after `since` (in event loop time).
+        Data fetched since then may or may not contain the effects of such transaction.
+        '''
+        return any(
+            t.settled_at is not None and t.settled_at >= since
+            for t in self._transactions
+        )
+
+    def prune(self, before: float) -> None:
+        '''
+        Forgets transactions that settled before `before` (in event loop time).
+        '''
+        self._transactions = [
+            t for t in self._transactions
+            if t.settled_at is None or t.settled_at >= before
+        ]
+
+    def prune_at_block(self, block_number: int) -> None:
+        '''
+        Forgets failed transactions and transactions included in block `block_number` or earlier.
+        '''
+        self._transactions = [
+            t for t in self._transactions
+            if t.settled_at is None or (not t.failed and _after(t.block_number, block_number))
+        ]
+
+    def overlay(self, orders: AllOrders, fetched_since: float) -> AllOrders:
+        '''
+        Applies the in-flight transactions to the orders fetched since `fetched_since`.
+        Transactions that successfully settled during the fetch are applied too, since the
+        fetched orders may not contain their effects yet (applying cancels twice is harmless
+        and a duplicate placeholder only makes the next pulse wait for confirmation).
+        '''
+        return self._apply([
+            t for t in self._transactions
+            if t.settled_at is None or (t.settled_at >= fetched_since and not t.failed)
+        ], orders)
+
+    def overlay_at_block(self, orders: AllOrders, block_number: int) -> AllOrders:
+        '''
+        Applies the transactions that were not included in block `block_number`
+        to the orders fetched at that block.
+        '''
+        return self._apply([
+            t for t in self._transactions
+            if t.settled_at is None or (not t.failed and _after(t.block_number, block_number))
+        ], orders)
+
+    def _apply(self, relevant: list[InFlightTransaction], orders: AllOrders) -> AllOrders:
+        if not relevant:
+            return orders
+
+        canceled_ids = {o.order_id for t in relevant for o in t.to_cancel}
+
+        active = [o for o in orders.active.all_orders if o.order_id not in canceled_ids]
+        for tx in relevant:
+            active.extend(self._to_placeholder(o) for o in tx.to_place)
+
+        return AllOrders(
+            active=OpenOrders.from_list(active),
+            terminal=orders.terminal
+        )
+
+    def _to_placeholder(self, order: FutureOrder) -> BasicOrder:
+        return BasicOrder(
+            price=order.price,
+            amount=order.amount,
+            amount_remaining=order.amount,
+            order_id=PENDING_ORDER_ID,
+            market_id=self._market_id,
+            order_side=order.order_side,
+            entry_time=0,
+            venue=order.venue,
+            price_ticks=order.price_ticks,
+            amount_lots=order.amount_lots,
+        )
+
+    async def _confirm(self, client: Client, tx: InFlightTransaction) -> None:
+        try:
+            with tracing.span("tx_confirmation"):
+                receipt = await client.wait_for_tx(tx_hash=tx.tx_hash, check_interval=self._check_interval)
+
+            # Receipt from the pending block has no block number yet, the transaction is treated
+            # as in flight until it is included in a block.
+            while receipt.block_number is None:
+                await asyncio.sleep(self._check_interval)
+                receipt = await client.get_transaction_receipt(tx_hash=tx.tx_hash)
+
+            tx.block_number = receipt.block_number
+            self._logger.info(
+                f"Executed transaction {hex(tx.tx_hash)} successfully in block {tx.block_number}"
+            )
+        except Exception as e:
+            self._logger.error(f"In-flight transaction {hex(tx.tx_hash)} failed: {e}")
+            tx.failed = True
+            self._failures.append(e)
+        finally:
+            tx.settled_at = asyncio.get_running_loop().time()
+            metrics.track_tx_confirmation_time(tx.settled_at - tx.sent_at)
+
+
+def _after(tx_block: int | None, block_number: int) -> bool:
+    return tx_block is None or tx_block > block_number
@@ -0,0 +1,118 @@
+import logging
+from typing import final
+
+from starknet_py.net.client_models import Calls
+
+from platforms.starknet.starknet_account import WAccount
+from marketmaking.reconciling.order_reconciler import ReconciledOrders
+from markets.market import StarknetMarketABC
+from monitoring import metrics, tracing
+from .bundling_tx_builder import _get_single_call_list
+from .inflight_tracker import PENDING_ORDER_ID, InFlightTracker
+from .tx_builder import TxBuilder
+
+
+@final
+class PipelinedTransactionBuilder(TxBuilder):
+    '''
+    PipelinedTransactionBuilder bundles all the calls into a single transaction the same
+    way BundlingTransactionBuilder does, but it doesn't wait for the transaction to be
+    confirmed. The transaction is tracked by the InFlightTracker instead, which lets the
+    next pulse fetch the state and compute the orders while the confirmation is pending.
+
+    If the next pulse wants to cancel an order that is not confirmed yet (and thus has no
+    order id), the pulse waits for the in-flight transactions and is skipped.
+    At most `max_in_flight` transactions are pending at the same time.
+    '''
+    def __init__(
+        self,
+        market: StarknetMarketABC,
+        max_in_flight: int = 2,
+    ) -> None:
+        self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
+        self._logger.info("Initializing TransactionBuilder")
+
+        if max_in_flight < 1:
+            raise ValueError(f"Invalid {max_in_flight=}")
+
+        self.market = market
+        self._max_in_flight = max_in_flight
+        self._tracker = InFlightTracker(market_id=market.market_cfg.market_id)
+
+    @property
+    def inflight_tracker(self) -> InFlightTracker:
+        return self._tracker
+
+    async def build_and_execute_transactions(
+        self,
+        wrapped_account: WAccount,
+        reconciled_orders: ReconciledOrders,
+        prologue: list[Calls],
+    ) -> None:
+        '''
+        Send one big transaction that cancels and places all the reconciled
+        orders and return without waiting for its confirmation.
+        '''
+        self._tracker.raise_failures()
+
+        if any(o.order_id == PENDING_ORDER_ID for o in reconciled_orders.to_cancel):
+            self._logger.info(
+                "Pulse cancels not yet confirmed orders, waiting for in-flight transactions."
+            )
+            await self._tracker.wait_all()
+            self._tracker.raise_failures()
+            return
+
+        if self._tracker.pending and prologue:
+            # Prologue (eg. claims) is computed from the state that doesn't account
+            # for the in-flight transactions, so it is postponed until they settle.
+            self._logger.info("Postponing prologue until in-flight transactions settle.")
+            prologue = []
+
+        n_cancels = len(reconciled_orders.to_cancel)
+        n_places = len(reconciled_orders.to_place)
+        n_prologues = len(prologue)
+
+        self._logger.info(
+            f"Canceling {n_cancels} orders, "
+            f"placing {n_places} orders, "
+            f"executing {n_prologues} prologues."
+        )
+
+        with tracing.span("calldata_build", calls=n_cancels + n_places + n_prologues):
+            cancel_calls = [
+                self.market.get_close_order_call(o)
+                for o in reconciled_orders.to_cancel
+            ]
+
+            place_calls = [
+                self.market.get_submit_order_call(o)
+                for o in reconciled_orders.to_place
+            ]
+
+            complete_tx = (
+                _get_single_call_list(prologue)
+                + _get_single_call_list(cancel_calls)
+                + _get_single_call_list(place_calls)
+            )
+
+        if not complete_tx:
+            self._logger.info("Nothing to execute.")
+            return
+
+        while len(self._tracker.pending) >= self._max_in_flight:
+            await self._tracker.wait_oldest()
+            self._tracker.raise_failures()
+
+        self._logger.info("Executing bundled transaction.")
+        sent = await wrapped_account.execute_v3(calls=complete_tx)
+        self._logger.info(f"Bundled transaction `{hex(sent.transaction_hash)}` sent.")
+
+        self._tracker.track(
+            client=wrapped_account.account.client,
+            tx_hash=sent.transaction_hash,
+            reconciled_orders=reconciled_orders,
+        )
+
+        metrics.track_orders_canceled(n_cancels)
+        metrics.track_orders_sent(n_places)
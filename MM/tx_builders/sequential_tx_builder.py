@@ -6,9 +6,11 @@ from platforms.starknet.starknet_account import WAccount
 from marketmaking.reconciling.order_reconciler import ReconciledOrders
 from markets.market import StarknetMarketABC
 from marketmaking.order import BasicOrder, FutureOrder
-from monitoring import metrics
+from monitoring import metrics, tracing
 from .tx_builder import TxBuilder
+from starknet_py.net.client_errors import ClientError
 from starknet_py.net.client_models import Calls
+from starknet_py.transaction_errors import TransactionNotReceivedError, TransactionRejectedError
 
 @final
 class SequentialTransactionBuilder(TxBuilder):
@@ -17,16 +19,34 @@ class SequentialTransactionBuilder(TxBuilder):
     that will be sent to the blockchain for execution.
 
     This is a simple TxBuilder that executes all 
+
+    In the `concurrent` mode, the cancels are signed and sent concurrently and their receipts
+    are awaited concurrently, with at most `window` transactions in progress at once, and then
+    the places the same way. A transaction that doesn't consume its nonce (it is rejected or not
+    received) is replaced by the same call with a new nonce, at most `max_replacements` times.
+    The places get their nonces only once all the cancels settled, so that no place takes
+    the nonce a failed cancel left and gets executed before the cancel's replacement.
+    Unlike the default mode, which sends the cancels and the places back to back, but
+    doesn't replace anything, the places wait for the cancels.
     """
 
     def __init__(
         self,
         market: StarknetMarketABC,
+        concurrent: bool = False,
+        window: int = 8,
+        max_replacements: int = 2,
     ) -> None:
         self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
         self._logger.info("Initializing TransactionBuilder")
 
+        if window < 1 or max_replacements < 0:
+            raise ValueError(f"Invalid params: {window=} {max_replacements=}")
+
         self.market = market
+        self._concurrent = concurrent
+        self._window = window
+        self._max_replacements = max_replacements
 
     async def build_and_execute_transactions(
         self,
@@ -39,16 +59,37 @@ class SequentialTransactionBuilder(TxBuilder):
             wrapped_account = wrapped_account
         )       
 
-        await self.delete_quotes(
+        if self._concurrent:
+            await self.execute_concurrently(
+                wrapped_account=wrapped_account,
+                to_be_canceled=reconciled_orders.to_cancel,
+                to_be_created=reconciled_orders.to_place,
+            )
+            return
+
+        # Cancels and places are sent back to back without waiting for the receipts. The nonces
+        # order them, so the cancels are still executed (and free the liquidity) before the places.
+        cancels = await self.delete_quotes(
             to_be_canceled=reconciled_orders.to_cancel,
             wrapped_account=wrapped_account
         )
-        await asyncio.sleep(1)  # Give some time for the deletion to be processed
-        await self.create_quotes(
+        places = await self.create_quotes(
             to_be_created=reconciled_orders.to_place,
             wrapped_account=wrapped_account,
         )
 
+        cancel_results = await self._wait_for_all(wrapped_account, cancels)
+        place_results = await self._wait_for_all(wrapped_account, places)
+
+        metrics.track_orders_canceled(sum(1 for r in cancel_results if r is None))
+        metrics.track_orders_sent(sum(1 for r in place_results if r is None))
+
+        for error in cancel_results + place_results:
+            if error is not None:
+                raise error
+
+        self._logger.info("Quotes deleted and created")
+
     async def execute_prologue(
         self, 
         calls: list[Calls],
@@ -57,17 +98,9 @@ class SequentialTransactionBuilder(TxBuilder):
         self._logger.info(f"Executing prologue consisting of {len(calls)} calls")
 
         for call in calls:
+            sent = await wrapped_account.execute_v3(calls = call)
 
-            nonce = await wrapped_account.get_nonce()
-            await wrapped_account.increment_nonce()
-
-            sent = await wrapped_account.account.execute_v3(
-                calls = call,
-                auto_estimate=True,
-                nonce = nonce
-            )
-
-            await wrapped_account.account.client.wait_for_tx(
+            await wrapped_account.wait_for_tx(
                 tx_hash=sent.transaction_hash,
                 check_interval = 0.5
             )
@@ -78,53 +111,32 @@ class SequentialTransactionBuilder(TxBuilder):
         self,
         wrapped_account: WAccount,
         to_be_canceled: list[BasicOrder],
-    ) -> None:
-        """Delete quotes based on the market maker's strategy."""
+    ) -> list[int]:
+        """Send transactions deleting the quotes, return their hashes."""
         self._logger.info(f"Deleting {len(to_be_canceled)} quotes")
-        for order in to_be_canceled:
-            nonce = await wrapped_account.get_nonce()
-            await wrapped_account.increment_nonce()
-            # TODO: Use ResourceBound instead of auto_estimate when invoking
-
-            call = self.market.get_close_order_call(order=order)
-
-            sent = await wrapped_account.account.execute_v3(
-                calls=call,
-                auto_estimate=True,
-                nonce = nonce
-            )
-
-            await wrapped_account.account.client.wait_for_tx(
-                tx_hash=sent.transaction_hash,
-                check_interval = 0.5
-            )
 
+        tx_hashes = []
+        for order in to_be_canceled:
+            with tracing.span("calldata_build", calls=1):
+                call = self.market.get_close_order_call(order=order)
 
-            metrics.track_orders_canceled(1)
+            sent = await wrapped_account.execute_v3(calls=call)
+            tx_hashes.append(sent.transaction_hash)
 
-            self._logger.info("Canceling: %s, nonce: %s", order.order_id, nonce)
+            self._logger.info("Canceling: %s, tx: %s", order.order_id, hex(sent.transaction_hash))
 
-        self._logger.info("Quotes deleted")
+        return tx_hashes
 
     async def create_quotes(
         self,
         wrapped_account: WAccount,
         to_be_created: list[FutureOrder],
-    ) -> None:
-        """Create quotes based on the market maker's strategy."""
+    ) -> list[int]:
+        """Send transactions creating the quotes, return their hashes."""
         self._logger.info(f"Creating {len(to_be_created)} quotes")
-        for order in to_be_created:
-
-            nonce = await wrapped_account.get_nonce()
-            await wrapped_account.increment_nonce()
 
-            self._logger.info(
-                "Soon to submit order: q: %s, p: %s, s: %s, nonce: %s",
-                order.amount,
-                order.price,
-                order.order_side,
-                nonce,
-            )
+        tx_hashes = []
+        for order in to_be_created:
             self._logger.debug(
                 "Soon to submit order: %s",
                 dict(
@@ -134,31 +146,100 @@ class SequentialTransactionBuilder(TxBuilder):
                     order_side=(order.order_side, None),
                     order_type=("Basic", None),
                     time_limit=("GTC", None),
-                    nonce=nonce,
                 ),
             )
-            # TODO: Use ResourceBound instead of auto_estimate when invoking
-
-            call = self.market.get_submit_order_call(order=order)
 
-            sent = await wrapped_account.account.execute_v3(
-                calls=call,
-                auto_estimate=True,
-                nonce = nonce
-            )
-
-            await wrapped_account.account.client.wait_for_tx(
-                tx_hash=sent.transaction_hash,
-                check_interval = 0.5
-            )
+            with tracing.span("calldata_build", calls=1):
+                call = self.market.get_submit_order_call(order=order)
 
-            metrics.track_orders_sent(1)
+            sent = await wrapped_account.execute_v3(calls=call)
+            tx_hashes.append(sent.transaction_hash)
 
             self._logger.info(
-                "Submitting order: q: %s, p: %s, s: %s, nonce: %s",
+                "Submitting order: q: %s, p: %s, s: %s, tx: %s",
                 order.amount,
                 order.price,
                 order.order_side,
-                nonce,
+                hex(sent.transaction_hash),
             )
-        self._logger.info("Quotes created")
+
+        return tx_hashes
+
+    async def execute_concurrently(
+        self,
+        wrapped_account: WAccount,
+        to_be_canceled: list[BasicOrder],
+        to_be_created: list[FutureOrder],
+    ) -> None:
+        """Send the cancels concurrently, wait for them and then send the places the same way."""
+        self._logger.info(
+            f"Concurrently deleting {len(to_be_canceled)} and creating {len(to_be_created)} quotes"
+        )
+
+        with tracing.span("calldata_build", calls=len(to_be_canceled) + len(to_be_created)):
+            cancel_calls = [self.market.get_close_order_call(order=o) for o in to_be_canceled]
+            place_calls = [self.market.get_submit_order_call(order=o) for o in to_be_created]
+
+        cancel_results = await self._submit_all(wrapped_account, cancel_calls)
+        metrics.track_orders_canceled(sum(1 for r in cancel_results if r is None))
+        # Places would lack the liquidity of the orders that stay open.
+        for result in cancel_results:
+            if result is not None:
+                raise result
+
+        place_results = await self._submit_all(wrapped_account, place_calls)
+        metrics.track_orders_sent(sum(1 for r in place_results if r is None))
+        for result in place_results:
+            if result is not None:
+                raise result
+
+        self._logger.info("Quotes deleted and created")
+
+    async def _submit_all(self, wrapped_account: WAccount, calls: list[Calls]) -> list[BaseException | None]:
+        """Submit the calls concurrently, return their errors (None for the accepted ones)."""
+        window = asyncio.Semaphore(self._window)
+        tasks: list[asyncio.Task[None]] = []
+
+        for call in calls:
+            await window.acquire()
+            nonce = await wrapped_account.nonces.allocate()
+
+            task = asyncio.create_task(self._submit(wrapped_account, call, nonce))
+            task.add_done_callback(lambda _: window.release())
+            tasks.append(task)
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return [r if isinstance(r, BaseException) else None for r in results]
+
+    async def _submit(self, wrapped_account: WAccount, call: Calls, nonce: int) -> None:
+        """Send the call with the allocated nonce and wait for it, replace it if it is rejected."""
+        for replacement in range(self._max_replacements + 1):
+            try:
+                sent = await wrapped_account.execute_v3(calls=call, nonce=nonce)
+                await wrapped_account.wait_for_tx(tx_hash=sent.transaction_hash, check_interval=0.5)
+                return
+            except (ClientError, TransactionRejectedError, TransactionNotReceivedError, TimeoutError) as e:
+                if replacement == self._max_replacements:
+                    raise
+
+                self._logger.warning("Transaction with nonce %s failed (%s), replacing it.", nonce, str(e))
+                if isinstance(e, ClientError) and "nonce" in e.message.lower():
+                    await wrapped_account.reset_nonce()
+
+                # The failed nonce was given back, so it is filled first by the replacement.
+                nonce = await wrapped_account.nonces.allocate()
+
+    async def _wait_for_all(
+        self,
+        wrapped_account: WAccount,
+        tx_hashes: list[int],
+    ) -> list[BaseException | None]:
+        """Wait for all the transactions, return their errors (None for the accepted ones)."""
+        results = await asyncio.gather(
+            *(
+                wrapped_account.wait_for_tx(tx_hash=tx_hash, check_interval=0.5)
+                for tx_hash in tx_hashes
+            ),
+            return_exceptions=True,
+        )
+        return [r if isinstance(r, BaseException) else None for r in results]
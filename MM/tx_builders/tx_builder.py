@@ -1,11 +1,15 @@
 
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
 
 from platforms.starknet.starknet_account import WAccount
 from markets.market import StarknetMarketABC
 from marketmaking.reconciling.order_reconciler import ReconciledOrders
 from starknet_py.net.client_models import Calls
 
+if TYPE_CHECKING:
+    from .inflight_tracker import InFlightTracker
+
 # TODO: Not only builds the txs but also executes them
 #       so consider some other name 
 
@@ -35,7 +39,14 @@ class TxBuilder(ABC):
         #       once needed it will just take in the calls directly
         raise NotImplementedError
 
+    @property
+    def inflight_tracker(self) -> "InFlightTracker | None":
+        '''
+        Tracker of transactions that were sent but not confirmed yet.
+        None for builders that wait for the confirmation of every transaction.
+        '''
+        return None
+
 
-    
 
 
@@ -1,6 +1,5 @@
 from dataclasses import dataclass
 import asyncio
-import httpx
 from starknet_py.contract import Contract
 from starknet_py.net.account.account import Account
 from starknet_py.net.full_node_client import FullNodeClient
@@ -10,6 +9,10 @@ from venues.ekubo.ekubo_math import get_nearest_usable_tick, price_to_tick
 from venues.ekubo.ekubo_utils import _get_basic_orders, _positions_to_basic_orders, get_order_key
 from marketmaking.order import AllOrders, BasicOrder, FutureOrder, OpenOrders, TerminalOrders
 from venues.ekubo.ekubo_market_configs import EkuboMarketConfig
+from networking.http_session import HttpSession, get_http_session
+from platforms.starknet.abi_cache import AbiCache
+from platforms.starknet.batched_reader import BatchedStarknetReader
+from platforms.starknet.calldata import CalldataTemplates
 
 EKUBO_POSITIONS_ADDRESS=0x02e0af29598b407c8716b17f6d2795eca1b471413fa03fb145a5e33722184067
 
@@ -22,14 +25,27 @@ class EkuboPositionMetadata:
     fee: int
 
 class EkuboView:
-    def __init__(self, ekubo_positions: Contract) -> None:
+    def __init__(
+        self,
+        ekubo_positions: Contract,
+        session: HttpSession | None = None,
+        reader: BatchedStarknetReader | None = None,
+    ) -> None:
         self._positions = ekubo_positions
+        self._session = session or get_http_session()
+        self._reader = reader or BatchedStarknetReader(client=ekubo_positions.client)
         self._position_metadata: dict[int, EkuboPositionMetadata] = {}
 
     @staticmethod
-    async def from_provider(provider: Account | FullNodeClient) -> "EkuboView":
-        positions = await Contract.from_address(address=EKUBO_POSITIONS_ADDRESS, provider=provider)
-        return EkuboView(ekubo_positions=positions)
+    async def from_provider(
+        provider: Account | FullNodeClient,
+        session: HttpSession | None = None,
+        reader: BatchedStarknetReader | None = None,
+        abi_cache: AbiCache | None = None,
+    ) -> "EkuboView":
+        abi_cache = abi_cache if abi_cache is not None else AbiCache()
+        positions = await abi_cache.get_contract(address=EKUBO_POSITIONS_ADDRESS, provider=provider)
+        return EkuboView(ekubo_positions=positions, session=session, reader=reader)
     
     async def get_all_limit_orders(
             self,
@@ -38,9 +54,7 @@ class EkuboView:
         ) -> AllOrders:
         url = f'https://starknet-mainnet-api.ekubo.org/limit-orders/orders/{hex(wallet)}?showClosed=false'
         
-        async with httpx.AsyncClient() as client:
-            orders_resp = await client.get(url)
-        
+        orders_resp = await self._session.get(url)
         orders_resp.raise_for_status()
         orders = orders_resp.json()['orders']
 
@@ -67,8 +81,10 @@ class EkuboView:
             for o in orders
         ]
 
-        onchain_orders = await self._positions.functions['get_limit_orders_info'].call(
-            params = onchain_calldata
+        onchain_orders = await self._reader.call(
+            self._positions.functions['get_limit_orders_info'].prepare_call(
+                params = onchain_calldata
+            )
         )
 
         if len(onchain_orders[0]) != len(orders):
@@ -104,9 +120,7 @@ class EkuboView:
 
         url = f'https://mainnet-api.ekubo.org/positions/{hex(wallet)}?showClosed=false'
 
-        async with httpx.AsyncClient() as client:
-            positions_resp = await client.get(url)
-
+        positions_resp = await self._session.get(url)
         positions_resp.raise_for_status()
         positions = positions_resp.json()['data']
         
@@ -134,12 +148,14 @@ class EkuboView:
                 }
             }
             tasks.append(
-                self._positions.functions['get_token_info'].call(
-                    id = onchain_p['id'],
-                    pool_key = {
-                        k: int(v, 0) for k, v in onchain_p['pool_key'].items()
-                    },
-                    bounds = bounds
+                self._reader.call(
+                    self._positions.functions['get_token_info'].prepare_call(
+                        id = onchain_p['id'],
+                        pool_key = {
+                            k: int(v, 0) for k, v in onchain_p['pool_key'].items()
+                        },
+                        bounds = bounds
+                    )
                 )
             )
 
@@ -180,14 +196,28 @@ class EkuboView:
         return liquidity
 
 class EkuboClient:
-    def __init__(self, ekubo_positions: Contract) -> None:
+    def __init__(
+        self,
+        ekubo_positions: Contract,
+        session: HttpSession | None = None,
+        reader: BatchedStarknetReader | None = None,
+    ) -> None:
         self._positions = ekubo_positions
-        self.view = EkuboView(ekubo_positions=self._positions)
+        self.view = EkuboView(ekubo_positions=self._positions, session=session, reader=reader)
+
+        # Calls are built from templates, so that the ABI serialization doesn't run on every pulse.
+        self._templates = CalldataTemplates()
 
     @staticmethod
-    async def from_account(account: Account) -> "EkuboClient":
-        positions = await Contract.from_address(address = EKUBO_POSITIONS_ADDRESS, provider = account)
-        return EkuboClient(ekubo_positions=positions)
+    async def from_account(
+        account: Account,
+        session: HttpSession | None = None,
+        reader: BatchedStarknetReader | None = None,
+        abi_cache: AbiCache | None = None,
+    ) -> "EkuboClient":
+        abi_cache = abi_cache if abi_cache is not None else AbiCache()
+        positions = await abi_cache.get_contract(address = EKUBO_POSITIONS_ADDRESS, provider = account)
+        return EkuboClient(ekubo_positions=positions, session=session, reader=reader)
     
 
     def prep_submit_maker_order_call(
@@ -207,21 +237,26 @@ class EkuboClient:
             clearing_token = market_cfg.quote_token.address
             transfer_token_contract = quote_token_contract
         
-        transfer_invoke = transfer_token_contract.functions['transfer'].prepare_invoke_v3(
-            amount = int(amount),
+        transfer_invoke = self._templates.get(
+            transfer_token_contract.functions['transfer'],
             recipient = self.view._positions.address
+        ).build(
+            amount = int(amount),
         )
 
-        swap_invoke = self._positions.functions['swap_to_limit_order_price_and_maybe_mint_and_place_limit_order'].prepare_invoke_v3(
+        swap_invoke = self._templates.get(
+            self._positions.functions['swap_to_limit_order_price_and_maybe_mint_and_place_limit_order']
+        ).build(
             order_key = order_key,
             amount = int(amount)
         )
 
-        clear_invoke = self._positions.functions['clear'].prepare_invoke_v3(
+        clear_invoke = self._templates.get(
+            self._positions.functions['clear'],
             token = {
                 'contract_address': clearing_token
             }
-        )
+        ).build()
 
         return [
             transfer_invoke,
@@ -246,8 +281,10 @@ class EkuboClient:
             transfer_token_contract = quote_token_contract
         
 
-        transfer_call = transfer_token_contract.functions['transfer'].prepare_invoke_v3(
-            recipient = self._positions.address,
+        transfer_call = self._templates.get(
+            transfer_token_contract.functions['transfer'],
+            recipient = self._positions.address
+        ).build(
             amount = int(amount)
         )
 
@@ -279,7 +316,10 @@ class EkuboClient:
                 }
             }
 
-        deposit_call = self._positions.functions['mint_and_deposit'].prepare_invoke_v3(
+        deposit_call = self._templates.get(
+            self._positions.functions['mint_and_deposit'],
+            min_liquidity = 0
+        ).build(
             pool_key = {
                 'token0': market_cfg.base_token.address,
                 'token1': market_cfg.quote_token.address,
@@ -288,14 +328,14 @@ class EkuboClient:
                 'extension': 0
             },
             bounds = bounds,
-            min_liquidity = 0
         )
 
-        clear_call = self._positions.functions['clear'].prepare_invoke_v3(
+        clear_call = self._templates.get(
+            self._positions.functions['clear'],
             token = {
                 'contract_address': clearing_token
             }
-        )
+        ).build()
 
         return [
             transfer_call,
@@ -363,20 +403,24 @@ class EkuboClient:
             }
         }
 
-        return self._positions.functions['withdraw'].prepare_invoke_v3(
+        return self._templates.get(
+            self._positions.functions['withdraw'],
+            min_token0 = 0,
+            min_token1 = 0,
+            collect_fees = True
+        ).build(
             id = order.order_id,
             pool_key = pool_key,
             bounds = bounds,
             liquidity = metadata.liquidity,
-            min_token0 = 0,
-            min_token1 = 0,
-            collect_fees = True
         )
 
     
     def prep_delete_maker_order_call(self, order: BasicOrder, cfg: EkuboMarketConfig) -> Call:
         order_key = get_order_key(order, cfg)
-        return self._positions.functions['close_limit_order'].prepare_invoke_v3(
+        return self._templates.get(
+            self._positions.functions['close_limit_order']
+        ).build(
             id = order.order_id,
             order_key = order_key
         )
\ No newline at end of file
@@ -8,6 +8,9 @@ from paradex_py.common.order import (
     Order as ParadexOrder,
 )
 
+from networking.http_session import HttpSession, get_http_session
+from signing import SigningService, get_signing_service
+
 class ParadexResponseOrder(TypedDict):
     id: str
     account: str
@@ -58,19 +61,28 @@ class ParadexResponsePosition(TypedDict):
 
 
 class ParadexClient:
-    def __init__(self, l1_address: str, l2_private_key: str):
+    def __init__(
+        self,
+        l1_address: str,
+        l2_private_key: str,
+        session: HttpSession | None = None,
+        signing_service: SigningService | None = None,
+    ):
         self.px = Paradex(
             env = 'prod',
             l1_address=l1_address,
             l2_private_key=l2_private_key
         )
 
-        self._client = httpx.AsyncClient()
+        self._session = session or get_http_session()
+        self._client = self._session.client
+
+        self._signing = signing_service or get_signing_service()
 
     async def get_all_open_orders(self) -> list[ParadexResponseOrder]:
         request =  self._get_authorized_request('orders', params = None)
 
-        res = await self._client.send(request)
+        res = await self._session.send(request)
         res.raise_for_status()
         
         raw_orders: list[ParadexResponseOrder] = res.json()['results']
@@ -79,7 +91,7 @@ class ParadexClient:
     async def get_all_open_orders_for_market(self, market: str) -> list[ParadexResponseOrder]:
         request = self._get_authorized_request('orders', {'market': market})
 
-        res = await self._client.send(request)
+        res = await self._session.send(request)
         res.raise_for_status()
 
         raw_orders: list[ParadexResponseOrder] = res.json()['results']
@@ -88,7 +100,7 @@ class ParadexClient:
     async def get_all_positions(self) -> list[ParadexResponsePosition]:
         request = self._get_authorized_request(path = 'positions', params = {})
 
-        res = await self._client.send(request)
+        res = await self._session.send(request)
         res.raise_for_status()
 
         positions: list[ParadexResponsePosition] = res.json()['results']
@@ -105,23 +117,45 @@ class ParadexClient:
 
     async def cancel_order(self, id: str) -> httpx.Response:
         request = self.get_cancel_order_request(id)
-        return await self._client.send(request)
+        return await self._session.send(request)
 
     async def cancel_all_orders(self) -> httpx.Response:
         request = self.get_cancel_all_orders_request()
-        return await self._client.send(request)
+        return await self._session.send(request)
 
     async def cancel_orders_batch(self, ids: list[str]) -> httpx.Response:
         request = self.get_cancel_orders_batch_request(ids)
-        return await self._client.send(request)   
+        return await self._session.send(request)   
 
     async def submit_single_order(self, order: ParadexOrder) -> httpx.Response:
-        request = self.get_submit_single_order_request(order)
-        return await self._client.send(request)
+        request = await self.build_submit_single_order_request(order)
+        return await self._session.send(request)
     
     async def submit_orders_batch(self, orders: list[ParadexOrder]) -> httpx.Response:
-        request = self.get_submit_orders_batch_request(orders)
-        return await self._client.send(request)
+        request = await self.build_submit_orders_batch_request(orders)
+        return await self._session.send(request)
+
+    # Methods that sign the orders in the signing pool and return a Request for sending them
+
+    async def sign_orders(self, orders: list[ParadexOrder]) -> None:
+        '''
+        Signs the orders in parallel in the signing pool, without blocking the event loop.
+        '''
+        if self.px.account is None:
+            raise ValueError("No account to sign order with")
+
+        signatures = await self._signing.sign_many("paradex_order", self.px.account.sign_order, orders)
+        for order, signature in zip(orders, signatures):
+            order.signature = signature
+
+    async def build_submit_single_order_request(self, order: ParadexOrder) -> httpx.Request:
+        await self.sign_orders([order])
+        return self._post_authorized_request(path="orders", payload=order.dump_to_dict())
+
+    async def build_submit_orders_batch_request(self, orders: list[ParadexOrder]) -> httpx.Request:
+        await self.sign_orders(orders)
+        order_payloads: list[dict[str, str]] = [order.dump_to_dict() for order in orders]
+        return self._post_authorized_request(path="orders/batch", payload=order_payloads)
 
     # Methods that return a Request for sending/canceling orders
     def get_cancel_order_request(self, id: str) -> httpx.Request:
@@ -1,9 +1,11 @@
 from decimal import Decimal
 import logging
+from typing import Any
 
 from starknet_py.net.account.account import Account
 from starknet_py.net.full_node_client import FullNodeClient
-from starknet_py.contract import Contract, PreparedFunctionInvokeV3
+from starknet_py.contract import Contract
+from starknet_py.net.client_models import Call
 
 
 from venues.remus.remus_market_configs import (
@@ -12,24 +14,69 @@ from venues.remus.remus_market_configs import (
 )
 from marketmaking.order import AllOrders, BasicOrder, FutureOrder, OpenOrders, TerminalOrders
 from instruments.starknet import StarknetToken
+from platforms.starknet.abi_cache import AbiCache
+from platforms.starknet.batched_reader import BatchedStarknetReader
+from platforms.starknet.calldata import CalldataTemplate
 
 REMUS_ADDRESS = "0x067e7555f9ff00f5c4e9b353ad1f400e2274964ea0942483fae97363fd5d7958"
 REMUS_IDENTIFIER = "REMUS"
 
 
+def order_from_maker_order(o: dict[str, Any]) -> BasicOrder | None:
+    """
+    Converts a MakerOrder of Remus to BasicOrder, None on markets without preloaded market configs.
+    """
+    market_id = int(o["market_id"])
+    market_cfg = get_preloaded_remus_market_config(market_id)
+    if market_cfg is None:
+        logging.error(
+            f"No market cfg for market id `{market_id}` found, skipping orders."
+        )
+        return None
+
+    # Resting orders are on the grid, so the conversions are exact.
+    grid = market_cfg.grid
+    price_ticks = int(o["price"]) // grid.tick_size
+    amount_lots = int(o["amount"]) // grid.lot_size
+
+    return BasicOrder(
+        price=grid.ticks_to_price(price_ticks),
+        amount=grid.lots_to_amount(amount_lots),
+        amount_remaining=Decimal(int(o["amount_remaining"])).scaleb(-grid.amount_decimals),
+        order_id=int(o["maker_order_id"]),
+        order_side=o["order_side"].variant,
+        entry_time=int(o["entry_time"]),
+        market_id=market_id,
+        venue=REMUS_IDENTIFIER,
+        price_ticks=price_ticks,
+        amount_lots=amount_lots,
+    )
+
+
 class RemusDexView:
     """
     Class representing RemusDex view functions for polling the dex state.
+    View calls are sent through the `reader`, so they are batched with other view calls.
     """
 
-    def __init__(self, contract: Contract):
+    def __init__(self, contract: Contract, reader: BatchedStarknetReader | None = None):
         self._contract = contract
+        self._reader = reader or BatchedStarknetReader(client=contract.client)
 
     @staticmethod
-    async def from_provider(provider: Account | FullNodeClient) -> "RemusDexView":
-        contract = await Contract.from_address(address=REMUS_ADDRESS, provider=provider)
+    async def from_provider(
+        provider: Account | FullNodeClient,
+        reader: BatchedStarknetReader | None = None,
+        abi_cache: AbiCache | None = None,
+    ) -> "RemusDexView":
+        abi_cache = abi_cache if abi_cache is not None else AbiCache()
+        contract = await abi_cache.get_contract(address=REMUS_ADDRESS, provider=provider)
 
-        return RemusDexView(contract=contract)
+        return RemusDexView(contract=contract, reader=reader)
+
+    @property
+    def contract(self) -> Contract:
+        return self._contract
 
     async def get_market_config(self, market_id: int) -> RemusMarketConfig | None:
         """
@@ -60,41 +107,16 @@ class RemusDexView:
         """
         Returns all user orders, but only those on markets that have preloaded market configs.
         """
-        orders = await self._contract.functions["get_all_user_orders"].call(
-            user=address
+        orders = await self._reader.call(
+            self._contract.functions["get_all_user_orders"].prepare_call(user=address)
         )
 
         normalized_orders: list[BasicOrder] = []
 
         for o in orders[0]:
-            market_id = int(o["market_id"])
-            market_cfg = get_preloaded_remus_market_config(market_id)
-            if market_cfg is None:
-                logging.error(
-                    f"No market cfg for market id `{market_id}` found, skipping orders."
-                )
-                continue
-
-            base_token = market_cfg.base_token
-            price = Decimal(o["price"]) / 10**18
-
-            amount = Decimal(o["amount"]) / 10**base_token.decimals
-            amount_remaining = Decimal(o["amount_remaining"]) / 10**base_token.decimals
-            order_id = int(o["maker_order_id"])
-            order_side = o["order_side"].variant
-            entry_time = int(o["entry_time"])
-
-            new_o = BasicOrder(
-                price=price,
-                amount=amount,
-                amount_remaining=amount_remaining,
-                order_id=order_id,
-                order_side=order_side,
-                entry_time=entry_time,
-                market_id=market_id,
-                venue=REMUS_IDENTIFIER,
-            )
-            normalized_orders.append(new_o)
+            new_o = order_from_maker_order(o)
+            if new_o is not None:
+                normalized_orders.append(new_o)
 
         return normalized_orders
 
@@ -116,8 +138,10 @@ class RemusDexView:
         )
 
     async def get_claimable(self, token: StarknetToken, user_address: int) -> int:
-        claimable = await self._contract.functions["get_claimable"].call(
-            token_address=token.address, user_address=user_address
+        claimable = await self._reader.call(
+            self._contract.functions["get_claimable"].prepare_call(
+                token_address=token.address, user_address=user_address
+            )
         )
         return int(claimable[0])
 
@@ -131,20 +155,38 @@ class RemusDexClient:
     MultiClient will be implemented in the future.
     """
 
-    def __init__(self, contract: Contract):
+    def __init__(self, contract: Contract, reader: BatchedStarknetReader | None = None):
         self._contract = contract
-        self.view = RemusDexView(contract=self._contract)
+        self.view = RemusDexView(contract=self._contract, reader=reader)
+
+        # Calls are built from templates, so that the ABI serialization doesn't run on every pulse.
+        self._submit_templates = {
+            side: CalldataTemplate(
+                self._contract.functions["submit_maker_order"],
+                order_side=(side, None),
+                order_type=("Basic", None),
+                time_limit=("GTC", None),
+            )
+            for side in ("Ask", "Bid")
+        }
+        self._delete_template = CalldataTemplate(self._contract.functions["delete_maker_order"])
+        self._claim_template = CalldataTemplate(self._contract.functions["claim"])
 
     @staticmethod
-    async def from_account(account: Account) -> "RemusDexClient":
-        contract = await Contract.from_address(address=REMUS_ADDRESS, provider=account)
+    async def from_account(
+        account: Account,
+        reader: BatchedStarknetReader | None = None,
+        abi_cache: AbiCache | None = None,
+    ) -> "RemusDexClient":
+        abi_cache = abi_cache if abi_cache is not None else AbiCache()
+        contract = await abi_cache.get_contract(address=REMUS_ADDRESS, provider=account)
 
-        return RemusDexClient(contract=contract)
+        return RemusDexClient(contract=contract, reader=reader)
 
     def prep_claim_call(
         self, token_address: int, amount: int
-    ) -> PreparedFunctionInvokeV3:
-        return self._contract.functions["claim"].prepare_invoke_v3(
+    ) -> Call:
+        return self._claim_template.build(
             token_address=token_address,
             amount=amount,
         )
@@ -153,21 +195,22 @@ class RemusDexClient:
         self,
         order: FutureOrder,
         market_cfg: RemusMarketConfig,
-    ) -> PreparedFunctionInvokeV3:
+    ) -> Call:
         """
         Prepares submit_maker_order Invoke from FutureOrder.
+        Orders not snapped to the market's grid yet are rounded to it here.
         """
-        base_token_decimals = market_cfg.base_token.decimals
+        grid = market_cfg.grid
 
-        amount_raw = int(order.amount * 10**base_token_decimals)
-        amount_raw = amount_raw // market_cfg.lot_size
-        amount_raw = amount_raw * market_cfg.lot_size
+        price_ticks = order.price_ticks
+        if price_ticks is None:
+            price_ticks = grid.price_to_ticks(order.price, round_up=not order.is_bid())
+        amount_lots = order.amount_lots
+        if amount_lots is None:
+            amount_lots = grid.amount_to_lots(order.amount)
 
-        price_raw = int(order.price * 10**18)
-        price_raw = price_raw // market_cfg.tick_size
-        price_raw = price_raw * market_cfg.tick_size
-        if order.order_side.lower() == "ask":
-            price_raw = price_raw + market_cfg.tick_size
+        amount_raw = grid.raw_amount(amount_lots)
+        price_raw = grid.raw_price(price_ticks)
 
         if order.order_side.lower() == "ask":
             target_token_address = market_cfg.base_token.address
@@ -176,20 +219,17 @@ class RemusDexClient:
             target_token_address = market_cfg.quote_token.address
             order_side = "Bid"
 
-        return self._contract.functions["submit_maker_order"].prepare_invoke_v3(
+        return self._submit_templates[order_side].build(
             market_id=market_cfg.market_id,
             target_token_address=target_token_address,
             order_price=price_raw,
             order_size=amount_raw,
-            order_side=(order_side, None),
-            order_type=("Basic", None),
-            time_limit=("GTC", None),
         )
 
     def prep_delete_maker_order_call(
         self,
         order: BasicOrder,
-    ) -> PreparedFunctionInvokeV3:
-        return self._contract.functions["delete_maker_order"].prepare_invoke_v3(
+    ) -> Call:
+        return self._delete_template.build(
             maker_order_id=order.order_id
         )
@@ -0,0 +1,90 @@
+import logging
+from collections import OrderedDict
+from typing import Any
+
+from starknet_py.abi.v0.model import Abi as AbiV0
+from starknet_py.abi.v1.model import Abi as AbiV1
+from starknet_py.abi.v2.model import Abi as AbiV2
+from starknet_py.cairo.data_types import EventType
+from starknet_py.hash.selector import get_selector_from_name
+from starknet_py.net.client_models import Event
+from starknet_py.serialization.data_serializers.payload_serializer import PayloadSerializer
+from starknet_py.serialization.factory import serializer_for_event, serializer_for_payload
+
+ORDER_PLACED = "OrderPlaced"
+ORDER_FILLED = "OrderFilled"
+ORDER_DELETED = "OrderDeleted"
+
+# Members of the order events the order index is kept by.
+ORDER_EVENT_MEMBERS = {
+    ORDER_PLACED: ("maker_order_id", "market_id", "owner", "order_side", "price", "amount", "entry_time"),
+    ORDER_FILLED: ("maker_order_id", "market_id", "owner", "amount"),
+    ORDER_DELETED: ("maker_order_id", "market_id", "owner"),
+}
+
+
+class RemusEventDecoder:
+    '''
+    Decodes the order events of Remus by the ABI of the contract, as the node returns them
+    (the selector and the `#[key]` members in the keys, the other members in the data).
+
+    Order events missing in the ABI, or lacking a member of `ORDER_EVENT_MEMBERS`, are logged
+    as errors when the decoder is created, their events then fail to decode.
+    '''
+    def __init__(self, parsed_abi: AbiV0 | AbiV1 | AbiV2) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        self.selectors = {name: get_selector_from_name(name) for name in ORDER_EVENT_MEMBERS}
+        self._names = {selector: name for name, selector in self.selectors.items()}
+        self._serializers: dict[int, tuple[PayloadSerializer, PayloadSerializer]] = {}
+
+        # Cairo 1 ABIs name the events by their path, the selector is of the name only.
+        events = {name.rsplit("::", 1)[-1]: event for name, event in parsed_abi.events.items()}
+        for name, selector in self.selectors.items():
+            event = events.get(name)
+            if event is None:
+                self._logger.error("Event `%s` not found in the ABI of Remus.", name)
+                continue
+
+            keys, data = _serializers(event)
+            missing = set(ORDER_EVENT_MEMBERS[name]) - keys.serializers.keys() - data.serializers.keys()
+            if missing:
+                self._logger.error("Event `%s` of Remus lacks members %s.", name, sorted(missing))
+                continue
+
+            self._serializers[selector] = (keys, data)
+
+    def can_decode(self, name: str) -> bool:
+        return self.selectors[name] in self._serializers
+
+    def decode(self, event: Event) -> tuple[str, dict[str, Any]] | None:
+        '''
+        Returns the name and the members of an order event, None for the other events.
+        Raises ValueError if the order event can't be decoded.
+        '''
+        name = self._names.get(event.keys[0]) if event.keys else None
+        if name is None:
+            return None
+
+        serializers = self._serializers.get(event.keys[0])
+        if serializers is None:
+            raise ValueError(f"Event `{name}` is not decodable by the ABI of Remus")
+
+        keys, data = serializers
+        try:
+            return name, {**keys.deserialize(event.keys[1:]).as_dict(), **data.deserialize(event.data).as_dict()}
+        except Exception as e:
+            raise ValueError(f"Unable to decode event `{name}`: {e}") from e
+
+
+def _serializers(event: AbiV0.Event | AbiV1.Event | EventType) -> tuple[PayloadSerializer, PayloadSerializer]:
+    '''
+    Serializers of the members in the keys (after the selector) and in the data of the event.
+    '''
+    if not isinstance(event, EventType):
+        return serializer_for_payload(OrderedDict()), serializer_for_event(event)
+
+    return (
+        serializer_for_payload(OrderedDict((n, t) for n, t in event.types.items() if n in event.keys)),
+        serializer_for_payload(OrderedDict((n, t) for n, t in event.types.items() if n not in event.keys)),
+    )
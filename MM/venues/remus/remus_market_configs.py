@@ -1,8 +1,10 @@
 from dataclasses import dataclass
+from functools import cached_property
 import logging
 from typing import Any
 
 from markets.market import MarketConfig
+from marketmaking.order import OrderGrid
 from instruments.starknet import (
     SN_ETH,
     SN_STRK,
@@ -14,6 +16,10 @@ from instruments.starknet import (
 )
 
 
+# Remus prices are quote per base with 18 decimals.
+REMUS_PRICE_DECIMALS = 18
+
+
 @dataclass
 class RemusFeesConfig:
     taker_fee_bps: int
@@ -36,6 +42,15 @@ class RemusMarketConfig(MarketConfig):
     trading_enabled: bool
     fees: RemusFeesConfig
 
+    @cached_property
+    def grid(self) -> OrderGrid:
+        return OrderGrid(
+            price_decimals=REMUS_PRICE_DECIMALS,
+            tick_size=self.tick_size,
+            amount_decimals=self.base_token.decimals,
+            lot_size=self.lot_size,
+        )
+
     @staticmethod
     def from_dict(cfg: dict[str, Any], market_id: int) -> "RemusMarketConfig | None":
         base_token = get_sn_token_from_address(cfg["base_token"])
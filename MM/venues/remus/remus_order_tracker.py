@@ -0,0 +1,256 @@
+import asyncio
+import dataclasses
+import logging
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any
+
+from starknet_py.net.client_models import Event
+from starknet_py.net.full_node_client import FullNodeClient
+
+from marketmaking.order import AllOrders, BasicOrder, OpenOrders, TerminalOrders
+from monitoring import metrics, tracing
+from platforms.starknet.batched_reader import BatchedStarknetReader
+from venues.remus.remus import REMUS_ADDRESS, RemusDexView, order_from_maker_order
+from venues.remus.remus_events import ORDER_DELETED, ORDER_FILLED, ORDER_PLACED, RemusEventDecoder
+from venues.remus.remus_market_configs import get_preloaded_remus_market_config
+
+
+class RemusOrderTracker:
+    '''
+    Keeps an in-memory index of the user's Remus orders per market, so that the orders
+    don't have to be downloaded on every pulse.
+
+    On every sync the order events Remus emitted since the last synced block are decoded by
+    the ABI of the contract (see `RemusEventDecoder`) and those of the user's orders are applied
+    to the index: placed orders are added, fills reduce the remaining amount (and remove
+    the filled orders) and deleted orders are removed. A sync thus costs one events request and
+    work proportional to the changes, including those of the user's own transactions.
+
+    The orders are read again (a full resync) on the first use, when more than `max_event_chunks`
+    chunks of events are pending (a gap), when the chain goes back (a reorg), when an order event
+    can't be decoded or concerns an order missing in the index, and every `max_resync_interval`
+    seconds as a safety net for changes the events don't reveal.
+
+    If the reader is pinned to a block (see `BatchedStarknetReader.snapshot`), the index is
+    synced to that block, otherwise to the latest one. Unpinned calls waiting for a sync in
+    progress (eg. by the orders and the position of one fetch) share it.
+
+    Between pulses, `poll_fills` tells whether any of the user's orders was filled since
+    the previous call, so that the pulse scheduler can react to fills.
+    '''
+    def __init__(
+        self,
+        view: RemusDexView,
+        client: FullNodeClient,
+        reader: BatchedStarknetReader,
+        user_address: int,
+        max_resync_interval: float = 60,
+        event_chunk_size: int = 500,
+        max_event_chunks: int = 4,
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        self._view = view
+        self._client = client
+        self._reader = reader
+        self._user_address = user_address
+
+        self._max_resync_interval = max_resync_interval
+        self._event_chunk_size = event_chunk_size
+        self._max_event_chunks = max_event_chunks
+
+        self._decoder = RemusEventDecoder(view.contract.data.parsed_abi)
+
+        # Orders by id per market.
+        self._orders: dict[int, dict[int, BasicOrder]] = {}
+        self._block_number: int | None = None
+        self._syncs = 0
+        self._resynced_at: float | None = None
+        self._lock = asyncio.Lock()
+
+        # Last block whose fill events were polled.
+        self._fills_block_number: int | None = None
+
+    @property
+    def block_number(self) -> int | None:
+        '''
+        Block the order index is synced to.
+        '''
+        return self._block_number
+
+    async def get_orders(self, market_id: int) -> AllOrders:
+        syncs = self._syncs
+        async with self._lock:
+            if self._syncs == syncs or self._reader.block_number is not None:
+                await self._sync()
+
+        # In remus there are currently no "terminal" orders
+        return AllOrders(
+            active = OpenOrders.from_list(list(self._orders.get(market_id, {}).values())),
+            terminal = TerminalOrders(bids=[], asks=[])
+        )
+
+    async def poll_fills(self, market_id: int) -> bool:
+        '''
+        Returns whether an `OrderFilled` event of any indexed order of the market was emitted
+        since the previous call. The first call only starts watching from the latest block.
+        The index itself is not touched, the next `get_orders` applies the event.
+        Always False if the ABI of Remus has no decodable `OrderFilled` event.
+        '''
+        if not self._decoder.can_decode(ORDER_FILLED):
+            return False
+
+        to_block = await self._client.get_block_number()
+        from_block = self._fills_block_number
+        if from_block is None or to_block <= from_block:
+            self._fills_block_number = to_block
+            return False
+
+        order_ids = set(self._orders.get(market_id, {}))
+        token: str | None = None
+        filled = False
+
+        for _ in range(self._max_event_chunks):
+            chunk = await self._client.get_events(
+                address=REMUS_ADDRESS,
+                keys=[[self._decoder.selectors[ORDER_FILLED]]],
+                from_block_number=from_block + 1,
+                to_block_number=to_block,
+                continuation_token=token,
+                chunk_size=self._event_chunk_size,
+            )
+            if any(self._is_fill_of(event, order_ids) for event in chunk.events):
+                filled = True
+                break
+
+            token = chunk.continuation_token
+            if token is None:
+                break
+        else:
+            # Too many fills to check, some of them likely concern the user.
+            filled = True
+
+        self._fills_block_number = to_block
+        return filled
+
+    def _is_fill_of(self, event: Event, order_ids: set[int]) -> bool:
+        try:
+            decoded = self._decoder.decode(event)
+        except ValueError as e:
+            # Better an extra pulse than a missed fill.
+            self._logger.warning("Treating undecodable event as a fill: %s", str(e))
+            return True
+        return decoded is not None and int(decoded[1]["maker_order_id"]) in order_ids
+
+    async def _sync(self) -> None:
+        now = asyncio.get_running_loop().time()
+        pinned = self._reader.block_number
+        target = pinned if pinned is not None else await self._client.get_block_number()
+
+        if self._block_number is None or self._resynced_at is None:
+            await self._resync(target, "initial")
+        elif now - self._resynced_at >= self._max_resync_interval:
+            await self._resync(target, "periodic")
+        elif target < self._block_number:
+            await self._resync(target, "reorg")
+        elif target > self._block_number:
+            with tracing.span("order_events_poll"):
+                reason = await self._apply_events(self._block_number + 1, target)
+            if reason is not None:
+                await self._resync(target, reason)
+            else:
+                self._block_number = target
+
+        self._syncs += 1
+
+    async def _apply_events(self, from_block: int, to_block: int) -> str | None:
+        '''
+        Applies the events of the user's orders in the block range to the index. Returns why
+        the orders have to be read again instead, if they do, leaving the index untouched.
+        '''
+        events: list[tuple[str, dict[str, Any]]] = []
+        token: str | None = None
+
+        for _ in range(self._max_event_chunks):
+            chunk = await self._client.get_events(
+                address=REMUS_ADDRESS,
+                keys=[list(self._decoder.selectors.values())],
+                from_block_number=from_block,
+                to_block_number=to_block,
+                continuation_token=token,
+                chunk_size=self._event_chunk_size,
+            )
+
+            for event in chunk.events:
+                try:
+                    decoded = self._decoder.decode(event)
+                except ValueError as e:
+                    self._logger.warning("%s", str(e))
+                    return "undecodable"
+                if decoded is not None and int(decoded[1]["owner"]) == self._user_address:
+                    events.append(decoded)
+
+            token = chunk.continuation_token
+            if token is None:
+                break
+        else:
+            return "gap"
+
+        # Changed markets are copied, so that the index is replaced only if all the events apply.
+        changed: dict[int, dict[int, BasicOrder]] = {}
+        for name, members in events:
+            market_id = int(members["market_id"])
+            if get_preloaded_remus_market_config(market_id) is None:
+                continue
+
+            orders = changed.get(market_id)
+            if orders is None:
+                orders = changed[market_id] = dict(self._orders.get(market_id, {}))
+            if not _apply_event(orders, name, members):
+                return "unknown order"
+
+        self._orders.update(changed)
+        return None
+
+    async def _resync(self, block_number: int, reason: str) -> None:
+        self._logger.info("Resyncing Remus orders at block %s (%s).", block_number, reason)
+        metrics.track_order_tracker_resync(reason)
+
+        with self._reader.snapshot(block_number=block_number):
+            orders = await self._view.get_all_user_orders(self._user_address)
+
+        by_market: dict[int, dict[int, BasicOrder]] = defaultdict(dict)
+        for order in orders:
+            by_market[order.market_id][order.order_id] = order
+
+        self._orders = dict(by_market)
+        self._block_number = block_number
+        self._resynced_at = asyncio.get_running_loop().time()
+
+
+def _apply_event(orders: dict[int, BasicOrder], name: str, members: dict[str, Any]) -> bool:
+    '''
+    Applies an order event to the orders of its market, returns False if its order isn't there.
+    '''
+    order_id = int(members["maker_order_id"])
+
+    if name == ORDER_PLACED:
+        order = order_from_maker_order({**members, "amount_remaining": members["amount"]})
+        if order is not None:
+            orders[order_id] = order
+        return True
+
+    existing = orders.pop(order_id, None)
+    if existing is None:
+        return False
+
+    if name == ORDER_FILLED:
+        market_cfg = get_preloaded_remus_market_config(existing.market_id)
+        assert market_cfg is not None
+        filled = Decimal(int(members["amount"])).scaleb(-market_cfg.grid.amount_decimals)
+        if existing.amount_remaining > filled:
+            orders[order_id] = dataclasses.replace(existing, amount_remaining=existing.amount_remaining - filled)
+    elif name != ORDER_DELETED:
+        raise ValueError(f"Unknown order event `{name}`")
+    return True